@@ -1,9 +1,18 @@
 import streamlit as st
 import os
-from src import trainer, tester, eda
-from src.constants import MODEL_DIR, PREDICTIONS_DIR, PLOTS_DIR, CLASSIFICATION_MODELS
+from src import trainer, tester, eda, cache, jobs, utils, instrumentation, metrics, registry, resources, writer
+from src.constants import (
+    MODEL_DIR, PREDICTIONS_DIR, PLOTS_DIR, CLASSIFICATION_MODELS, DEFAULT_CHUNK_SIZE,
+    ALLOWED_FILE_EXTENSIONS, EDA_SAMPLE_ROWS, JOB_POLL_INTERVAL_S, METRICS_CONFIDENCE_LEVEL, MODEL_ENGINES,
+    PREDICTION_COLUMN_MODES, PREDICTION_FORMATS, PROGRESSIVE_FRACTIONS, PROGRESSIVE_MIN_GAIN, RUNS_QUOTA_BYTES, SCALABLE_MODEL_MIN_ROWS, TUNING_TIME_BUDGET_S,
+)
+from src.encoders import ENCODING_STRATEGIES
+from src.imputation import IMPUTATION_STRATEGIES
+from src.selection import PROJECTIONS, SELECTION_FILTERS
 import tempfile
+import uuid
 import pandas as pd
+from contextlib import contextmanager, nullcontext
 
 st.set_page_config(page_title="AutoML CSV Trainer", layout="wide")
 st.title("🤖 AutoML CSV Trainer & Tester")
@@ -13,8 +22,343 @@ st.markdown("Upload a CSV file, select target column and models, train automatic
 for directory in [MODEL_DIR, PREDICTIONS_DIR, PLOTS_DIR]:
     os.makedirs(directory, exist_ok=True)
 
-# Sidebar for navigation
-mode = st.sidebar.radio("Select Mode", ["Train Model", "Test Model"])
+# File types accepted by the uploaders (without the leading dot)
+UPLOAD_TYPES = [ext.lstrip(".") for ext in ALLOWED_FILE_EXTENSIONS]
+
+
+# =============================
+# 🚦 SHARED RESOURCES
+# =============================
+@contextmanager
+def governed_run(message=None):
+    """Show a spinner and the queue position of a heavy run (via the yielded progress callback); explain rejections."""
+    status = st.empty()
+    try:
+        with st.spinner(message) if message else nullcontext():
+            yield lambda progress, text: status.caption(f"⏳ {text}")
+    except resources.ResourceLimitError as e:
+        st.error(f"🚦 {e}")
+        st.stop()
+    status.empty()
+
+
+# =============================
+# 📺 RESULT VIEWS
+# =============================
+def show_timings(output):
+    timings = output.get("timings")
+    if not timings:
+        return
+
+    st.subheader("⏱ Stage Timings")
+    st.caption(f"Total: {instrumentation.total_time(timings):.2f} s (nested stages are indented)")
+    table = pd.DataFrame(timings)
+    table["stage"] = ["\u2003" * depth + name for name, depth in zip(table["stage"], table["depth"])]
+    st.dataframe(table.drop(columns=["depth"]), hide_index=True)
+
+    # Export for dashboards
+    labels = {"run": os.path.basename(output.get("model_path") or output.get("predictions_path") or "run")}
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        "Download timings (JSON lines)", instrumentation.to_json_lines(timings, labels),
+        file_name="timings.jsonl", mime="application/x-ndjson"
+    )
+    col2.download_button(
+        "Download timings (Prometheus)", instrumentation.to_prometheus(timings, labels),
+        file_name="timings.prom", mime="text/plain"
+    )
+
+
+def show_metrics(scores):
+    st.json(metrics.scalar_metrics(scores))
+
+    intervals = scores.get("confidence_intervals")
+    if intervals:
+        st.caption(f"{METRICS_CONFIDENCE_LEVEL:.0%} bootstrap confidence intervals: " + ", ".join(
+            f"{name} [{low:.4f}, {high:.4f}]" for name, (low, high) in intervals.items()
+        ))
+    if scores.get("per_class"):
+        with st.expander("Per-class metrics"):
+            st.dataframe(pd.DataFrame(scores["per_class"]).T)
+
+
+def show_training_output(output):
+    if output.get("cached"):
+        st.info(f"♻️ Reused run `{output['run_key']}` trained earlier with the same data and settings.")
+
+    # Show metrics
+    st.subheader("📈 Evaluation Metrics")
+    show_metrics(output["metrics"])
+
+    if output.get("tuning"):
+        st.subheader("🎛 Hyperparameter Search")
+        st.json(output["tuning"])
+
+    if output.get("selection"):
+        show_selection_report(output["selection"])
+
+    show_timings(output)
+
+    # Show plots
+    st.subheader("🧾 Confusion Matrix")
+    if output["confusion_plot"]:
+        st.image(output["confusion_plot"])
+
+    if output["feature_plot"]:
+        st.subheader("🌟 Feature Importance")
+        st.image(output["feature_plot"])
+
+    # Download model
+    st.subheader("💾 Download Trained Model")
+    with open(output["model_path"], "rb") as f:
+        st.download_button(
+            label="Download Model (.pkl)",
+            data=f,
+            file_name=os.path.basename(output["model_path"]),
+            mime="application/octet-stream"
+        )
+
+
+def show_selection_report(report):
+    st.subheader("✂️ Feature Selection")
+    st.caption(
+        f"{report['n_features_in']} → {report['n_features_out']} features"
+        + (f" ({report['projection'].upper()} keeps {report['explained_variance']:.1%} of the variance)"
+           if report["projection"] else "")
+        + f", selected in {report['fit_time_s']:.2f} s on a sample of the training split"
+    )
+    if report["skipped"]:
+        st.caption(f"Skipped on these features: {', '.join(report['skipped'])}")
+    dropped = {name: columns for name, columns in report["dropped"].items() if columns}
+    if dropped:
+        st.json(dropped)
+
+
+def show_selection_comparison(comparison):
+    st.subheader("⚖️ All Features vs Selected Features")
+    cols = st.columns(4)
+    cols[0].metric("Features", comparison["n_features_after"],
+                   comparison["n_features_after"] - comparison["n_features_before"], delta_color="off")
+    cols[1].metric("Fit speedup", f"{comparison['fit_speedup']:.2f}×")
+    cols[2].metric("Predict speedup", f"{comparison['predict_speedup']:.2f}×")
+    cols[3].metric("Accuracy change", f"{comparison['accuracy_change']:+.2%}")
+    st.dataframe(pd.DataFrame([comparison]))
+
+
+def show_leaderboard_output(output):
+    leaderboard = pd.DataFrame(output["leaderboard"])
+
+    # Show leaderboard
+    st.subheader("🏆 Model Leaderboard")
+    if "cached" in leaderboard and leaderboard["cached"].any():
+        st.caption(f"♻️ {int(leaderboard['cached'].sum())} model(s) reused from earlier identical runs")
+    st.dataframe(leaderboard)
+    show_timings(output)
+
+    # Download best model
+    best_model = leaderboard.iloc[0]["model"]
+    best_path = output["model_paths"][best_model]
+    st.subheader(f"💾 Download Best Model ({best_model})")
+    with open(best_path, "rb") as f:
+        st.download_button(
+            label="Download Model (.pkl)",
+            data=f,
+            file_name=os.path.basename(best_path),
+            mime="application/octet-stream"
+        )
+
+
+def show_testing_output(result):
+    # Download predictions
+    st.subheader("📥 Download Predictions")
+    pred_path = result["predictions_path"]
+    extension = os.path.splitext(pred_path)[1]
+    # The file handle goes to the button as is: the predictions are never parsed again
+    with open(pred_path, "rb") as f:
+        st.download_button(
+            label=f"Download Predictions ({extension})",
+            data=f,
+            file_name=os.path.basename(pred_path),
+            mime=writer.mime_type(pred_path)
+        )
+
+    # Show metrics
+    if result["metrics"]:
+        st.subheader("📊 Evaluation Metrics")
+        show_metrics(result["metrics"])
+
+    show_timings(result)
+
+    # Show confusion plot
+    if result["confusion_plot"]:
+        st.subheader("📌 Confusion Matrix")
+        st.image(result["confusion_plot"])
+
+
+def job_owner():
+    """Return the id that owns this browser's background jobs; kept in the URL so a reload keeps it."""
+    if "job_owner" not in st.session_state:
+        st.session_state["job_owner"] = st.query_params.get("owner") or uuid.uuid4().hex[:12]
+    st.query_params["owner"] = st.session_state["job_owner"]
+    return st.session_state["job_owner"]
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL_S)
+def poll_job(job_id):
+    """Refresh the status of a running job until it finishes."""
+    manager = jobs.get_manager()
+    job = manager.get(job_id)
+    if job["status"] in jobs.FINISHED_STATES:
+        st.rerun()
+
+    st.progress(job["progress"] or 0.0, text=f"{job['status'].title()}: {job['message']}")
+    position = manager.queue_position(job_id)
+    if position:
+        st.caption(f"⏳ {position} job(s) ahead in the queue")
+    if job["cancel_requested"]:
+        st.caption("🛑 Cancellation requested, stopping at the next stage...")
+    elif job["owner"] == job_owner() and st.button("🛑 Cancel Job", key=f"cancel_{job_id}"):
+        manager.cancel(job_id, owner=job_owner())
+
+
+def show_job(job_id):
+    job = jobs.get_manager().get(job_id)
+    if job is None:
+        st.warning(f"Job {job_id} not found.")
+        return
+
+    st.write(f"**Job `{job_id}`** ({job['kind']}) created {job['created_at']}")
+    if job["status"] not in jobs.FINISHED_STATES:
+        poll_job(job_id)
+    elif job["status"] == jobs.FAILED:
+        st.error(f"❌ Job failed: {job['error']}")
+    elif job["status"] == jobs.CANCELLED:
+        st.warning("🛑 Job was cancelled.")
+    elif job["kind"] == "test":
+        show_testing_output(job["result"])
+    elif "leaderboard" in job["result"]:
+        show_leaderboard_output(job["result"])
+    else:
+        show_training_output(job["result"])
+
+
+def show_out_of_core_training(train_file):
+    # Only a small preview is read; training streams the file in chunks
+    path = cache.persist_upload(train_file)
+    preview = next(utils.iter_chunks(path, 1000))
+    st.write("### Preview of Uploaded File")
+    st.dataframe(preview.head())
+
+    target_column = st.selectbox("🎯 Select Target Column", preview.columns)
+    model_name = st.selectbox("🧠 Select Incremental Model", list(trainer.INCREMENTAL_MODELS))
+    encoding = st.selectbox("🔤 Categorical Encoding", [s for s in ENCODING_STRATEGIES if s != "target"])
+    sparse = st.checkbox(
+        "🧮 Sparse mode (keeps high-dimensional one-hot features in CSR format)",
+        value=(encoding == "onehot"),
+        disabled=model_name not in trainer.SPARSE_INCREMENTAL_MODELS
+    ) and model_name in trainer.SPARSE_INCREMENTAL_MODELS
+    chunk_size = int(st.number_input("Rows per chunk", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=10_000))
+    n_epochs = int(st.number_input("Passes over the data (epochs)", min_value=1, max_value=20, value=1))
+    reuse = st.checkbox("♻️ Reuse an identical previous run", value=True)
+    run_in_background = st.checkbox("📨 Run in background (survives page reloads)")
+
+    if st.button("🚀 Train Out of Core"):
+        params = {
+            "csv_file": path,
+            "target_column": target_column,
+            "model_name": model_name,
+            "encoding": encoding,
+            "sparse": sparse,
+            "chunk_size": chunk_size,
+            "n_epochs": n_epochs,
+            "reuse": reuse,
+        }
+        if run_in_background:
+            submit_job("train", {"incremental": True, **params})
+        else:
+            with governed_run("Streaming and training in chunks...") as progress:
+                output = trainer.train_incremental_from_csv(**params, progress_callback=progress)
+
+            st.success("🎉 Model trained successfully!")
+            show_training_output(output)
+
+
+def show_learning_curve(steps):
+    st.subheader("📶 Learning Curve")
+    table = pd.DataFrame([{
+        "sample": f"{step['fraction']:.0%}",
+        "rows": step["n_rows"],
+        "accuracy": step["metrics"]["accuracy"],
+        "f1_score": step["metrics"]["f1_score"],
+        "macro_f1": step["metrics"]["macro_f1"],
+        "f1_interval": step["metrics"]["confidence_intervals"].get("f1_score"),
+        "f1_gain": step["gain"],
+        "fit_time_s": step["fit_time_s"],
+        "engine": step["engine"],
+    } for step in steps])
+    if len(table) > 1:
+        st.line_chart(table.set_index("rows")[["accuracy", "f1_score", "macro_f1"]])
+    st.dataframe(table, hide_index=True)
+
+
+def progressive_training(params):
+    fractions = " → ".join(f"{f:.0%}" for f in PROGRESSIVE_FRACTIONS)
+    auto_stop = st.checkbox("Stop automatically once the learning curve flattens", value=True)
+    min_gain = PROGRESSIVE_MIN_GAIN
+    if auto_stop:
+        min_gain = st.number_input(
+            "Minimum weighted-F1 gain per step", min_value=0.0, max_value=1.0, value=PROGRESSIVE_MIN_GAIN,
+            step=0.001, format="%.3f"
+        )
+
+    # Steps are kept in the session: pressing Stop reruns the script, which ends the loop
+    run_id = (cache.dataset_key(params["csv_file"]), params["model_name"])
+    state = st.session_state.get("progressive")
+    if not st.button(f"🚀 Train Progressively ({fractions})"):
+        if state and state["run_id"] == run_id and state["steps"]:
+            show_learning_curve(state["steps"])
+            if not state["done"]:
+                st.info(f"⏹ Stopped after the {state['steps'][-1]['fraction']:.0%} sample.")
+        return
+
+    state = st.session_state["progressive"] = {"run_id": run_id, "steps": [], "done": False}
+    st.button("⏹ Stop", help="Stops after the step that is currently training")
+    curve = st.empty()
+    with governed_run("Training on growing samples..."):
+        for step in trainer.iter_progressive_training(**params):
+            state["steps"].append(step)
+            with curve.container():
+                show_learning_curve(state["steps"])
+            if "output" in step:
+                state["done"] = True
+                st.success("🎉 Model trained on the full data!")
+                show_training_output(step["output"])
+            elif auto_stop and trainer.curve_flattened(state["steps"], min_gain):
+                st.info(
+                    f"📉 The F1 score improved by less than {min_gain:.3f} at the {step['fraction']:.0%} sample; "
+                    "stopped before training on more data."
+                )
+                break
+
+
+def submit_job(kind, params):
+    job_id = jobs.get_manager().submit(kind, params, owner=job_owner())
+    # Keep the job id in the URL so a browser reload reattaches to it
+    st.query_params["job"] = job_id
+    st.success(f"📨 Job `{job_id}` queued. Follow it here or on the Jobs page.")
+    show_job(job_id)
+
+
+# Sidebar for navigation (open the Jobs page when the URL points to a job)
+modes = ["Train Model", "Test Model", "Jobs", "Runs"]
+mode = st.sidebar.radio("Select Mode", modes, index=2 if "job" in st.query_params else 0)
+
+# Heavy runs of all sessions share this server: show how busy it is
+load = resources.get_manager().status()
+st.sidebar.caption(
+    f"🚦 Server load: {load['running']}/{load['max_concurrent_jobs']} heavy runs, {load['waiting']} waiting "
+    f"({load['threads_per_job']} thread(s) per run)"
+)
 
 # =============================
 # 🔧 TRAINING MODE
@@ -22,18 +366,25 @@ mode = st.sidebar.radio("Select Mode", ["Train Model", "Test Model"])
 if mode == "Train Model":
     st.header("📥 Upload CSV for Training")
 
-    train_file = st.file_uploader("Upload CSV File", type=["csv"], key="train_csv")
+    train_file = st.file_uploader("Upload CSV / Parquet / Feather File", type=UPLOAD_TYPES, key="train_csv")
 
     if train_file is not None:
-        st.success("✅ CSV File Uploaded Successfully")
+        st.success("✅ File Uploaded Successfully")
+
+        # Optionally convert the upload to Parquet once and load from it afterwards
+        if st.checkbox("⚡ Convert to Parquet for faster reloads"):
+            train_file = cache.parquet_copy(train_file)
 
-        df = pd.read_csv(train_file)
+        # Stream files that do not fit in memory instead of loading them whole
+        if st.checkbox("🌊 Out-of-core training (stream the file in chunks, bounded memory)"):
+            show_out_of_core_training(train_file)
+            st.stop()
+
+        # Parsed once per file content; reruns reuse the cached DataFrame
+        df = cache.load_dataframe(train_file)
         st.write("### Preview of Uploaded CSV")
         st.dataframe(df.head())
 
-        # 🔁 Reset file stream before reuse
-        train_file.seek(0)
-
         # Select target column
         target_column = st.selectbox("🎯 Select Target Column", df.columns)
 
@@ -46,87 +397,335 @@ if mode == "Train Model":
         if not selected_models:
             st.warning("⚠️ Please select at least one model to train.")
 
-        # Add EDA toggle
+        # Categorical encoding strategy
+        encoding = st.selectbox("🔤 Categorical Encoding", ENCODING_STRATEGIES)
+        sparse = st.checkbox(
+            "🧮 Sparse mode (keeps high-dimensional one-hot features in CSR format)",
+            value=(encoding == "onehot")
+        )
+
+        # Missing values: drop incomplete rows or impute with statistics saved in the model
+        imputation = st.selectbox("🩹 Missing Values", IMPUTATION_STRATEGIES, help=(
+            "drop removes incomplete rows; the other strategies keep them and fill features "
+            "with statistics fitted on the training split (knn / iterative fit on a sample)"
+        ))
+        missing_indicators = imputation != "drop" and st.checkbox("Add missing-value indicator columns")
+
+        # SVM and KNN switch to linear-time variants on large tables
+        engine = st.selectbox("⚙️ SVM / KNN Engine", MODEL_ENGINES, help=(
+            f"auto uses the scalable variants (kernel-approximation SVM, KNN on a bounded indexed "
+            f"reference set) from {SCALABLE_MODEL_MIN_ROWS:,} training rows on; exact always uses SVC / "
+            f"KNeighborsClassifier"
+        ))
+
+        # Drop uninformative features (and optionally project the rest) before the model; saved with it
+        feature_selection = st.multiselect("✂️ Feature Selection", SELECTION_FILTERS, help=(
+            "variance drops constant and near-constant columns, identifiers drops unique integer IDs, "
+            "correlation drops near-duplicate columns, mutual_info and importance drop columns that "
+            "barely inform the target (all fitted on a sample of the training split)"
+        ))
+        projection = st.selectbox(
+            "📐 Projection", [None, *PROJECTIONS], format_func=lambda p: p or "none",
+            help="pca keeps the components explaining 95% of the variance (dense only); svd works on sparse data"
+        )
+
+        # Train every supported model in parallel and compare them
+        train_all = st.checkbox("🏁 Train all models and show leaderboard")
+        n_workers = None
+        compress_model = False
+        progressive = False
+        compare_selection = False
+        if train_all:
+            n_workers = int(st.number_input(
+                "Parallel workers", min_value=1, max_value=os.cpu_count() or 1,
+                value=min(len(trainer.SUPPORTED_MODELS), os.cpu_count() or 1)
+            ))
+        else:
+            compress_model = st.checkbox("🗜 Compress model file (smaller download, slower to load)")
+            compare_selection = (feature_selection or projection) and st.checkbox(
+                "⚖️ Compare with all features (also trains the model without selection)"
+            )
+            # Preview on small stratified samples before paying for the full run
+            progressive = st.checkbox(
+                "📶 Progressive training (" + " → ".join(f"{f:.0%}" for f in PROGRESSIVE_FRACTIONS)
+                + " stratified samples, stop once the learning curve flattens)"
+            )
+
+        # Hyperparameter search bounded by wall-clock time instead of a trial count
+        tune = not progressive and st.checkbox("🎛 Tune hyperparameters (successive halving)")
+        time_budget = TUNING_TIME_BUDGET_S
+        if tune:
+            time_budget = st.slider(
+                "Tuning time budget (seconds)" + (", shared by all models" if train_all else ""),
+                min_value=10, max_value=1800, value=TUNING_TIME_BUDGET_S, step=10
+            )
+
+        # Identical data and settings return the registered run instead of retraining
+        reuse = st.checkbox("♻️ Reuse identical previous runs", value=True)
+
+        # Add EDA toggle: instant summary on full data, optional sampled deep profile
         if st.checkbox("Run Exploratory Data Analysis"):
-            eda.run_eda(df)
-
-        if st.button("🚀 Train Model Automatically") and selected_models:
-            with st.spinner("Training in progress..."):
-                output = trainer.train_model_from_csv(
-                    csv_file=train_file,
-                    target_column=target_column,
-                    model_name=selected_models
+            deep_eda = st.checkbox("Include deep profile (ydata-profiling on a stratified sample)")
+            eda_rows = EDA_SAMPLE_ROWS
+            eda_correlations = False
+            if deep_eda:
+                eda_rows = int(st.number_input("Max rows for deep profile", min_value=1000, value=EDA_SAMPLE_ROWS, step=10_000))
+                eda_correlations = st.checkbox("Compute correlations (slow on large data)")
+            with governed_run():
+                eda.run_eda(
+                    df,
+                    dataset_key=cache.dataset_key(train_file),
+                    deep=deep_eda,
+                    max_rows=eda_rows,
+                    correlations=eda_correlations,
+                    target_column=target_column
                 )
 
-            st.success("🎉 Model trained successfully!")
+        if progressive:
+            progressive_training({
+                "csv_file": train_file,
+                "target_column": target_column,
+                "model_name": selected_models,
+                "encoding": encoding,
+                "sparse": sparse,
+                "imputation": imputation,
+                "missing_indicators": missing_indicators,
+                "engine": engine,
+                "compress": compress_model,
+                "feature_selection": feature_selection,
+                "projection": projection,
+            })
+            st.stop()
 
-            # Show metrics
-            st.subheader("📈 Evaluation Metrics")
-            st.json(output["metrics"])
-
-            # Show plots
-            st.subheader("🧾 Confusion Matrix")
-            if output["confusion_plot"]:
-                st.image(output["confusion_plot"])
-
-            if output["feature_plot"]:
-                st.subheader("🌟 Feature Importance")
-                st.image(output["feature_plot"])
-
-            # Download model
-            st.subheader("💾 Download Trained Model")
-            with open(output["model_path"], "rb") as f:
-                st.download_button(
-                    label="Download Model (.pkl)",
-                    data=f,
-                    file_name=os.path.basename(output["model_path"]),
-                    mime="application/octet-stream"
-                )
+        # Run heavy training in the background job queue instead of this session
+        run_in_background = st.checkbox("📨 Run in background (survives page reloads)")
+
+        if train_all and st.button("🚀 Train All Models"):
+            if run_in_background:
+                submit_job("train", {
+                    "train_all": True,
+                    "csv_file": cache.persist_upload(train_file),
+                    "target_column": target_column,
+                    "n_workers": n_workers,
+                    "encoding": encoding,
+                    "sparse": sparse,
+                    "tune": tune,
+                    "time_budget": time_budget,
+                    "imputation": imputation,
+                    "missing_indicators": missing_indicators,
+                    "engine": engine,
+                    "reuse": reuse,
+                    "feature_selection": feature_selection,
+                    "projection": projection,
+                })
+            else:
+                with governed_run("Training all models in parallel...") as progress:
+                    output = trainer.train_all_models(
+                        csv_file=train_file,
+                        target_column=target_column,
+                        n_workers=n_workers,
+                        encoding=encoding,
+                        sparse=sparse,
+                        tune=tune,
+                        time_budget=time_budget,
+                        imputation=imputation,
+                        missing_indicators=missing_indicators,
+                        engine=engine,
+                        reuse=reuse,
+                        feature_selection=feature_selection,
+                        projection=projection,
+                        progress_callback=progress
+                    )
+
+                st.success("🎉 All models trained successfully!")
+                show_leaderboard_output(output)
+
+        elif not train_all and st.button("🚀 Train Model Automatically") and selected_models:
+            if run_in_background:
+                submit_job("train", {
+                    "csv_file": cache.persist_upload(train_file),
+                    "target_column": target_column,
+                    "model_name": selected_models,
+                    "encoding": encoding,
+                    "sparse": sparse,
+                    "compress": compress_model,
+                    "tune": tune,
+                    "time_budget": time_budget,
+                    "imputation": imputation,
+                    "missing_indicators": missing_indicators,
+                    "engine": engine,
+                    "reuse": reuse,
+                    "feature_selection": feature_selection,
+                    "projection": projection,
+                })
+            elif compare_selection:
+                with governed_run("Training with all features and with the selected features...") as progress:
+                    comparison = trainer.compare_feature_selection(
+                        csv_file=train_file,
+                        target_column=target_column,
+                        model_name=selected_models,
+                        feature_selection=feature_selection,
+                        projection=projection,
+                        encoding=encoding,
+                        sparse=sparse,
+                        compress=compress_model,
+                        tune=tune,
+                        time_budget=time_budget,
+                        imputation=imputation,
+                        missing_indicators=missing_indicators,
+                        engine=engine,
+                        reuse=reuse,
+                        progress_callback=progress
+                    )
+
+                st.success("🎉 Model trained successfully!")
+                show_selection_comparison(comparison["comparison"])
+                show_training_output(comparison["selected"] | {"timings": comparison["timings"]})
+            else:
+                with governed_run("Training in progress...") as progress:
+                    output = trainer.train_model_from_csv(
+                        csv_file=train_file,
+                        target_column=target_column,
+                        model_name=selected_models,
+                        encoding=encoding,
+                        sparse=sparse,
+                        compress=compress_model,
+                        tune=tune,
+                        time_budget=time_budget,
+                        imputation=imputation,
+                        missing_indicators=missing_indicators,
+                        engine=engine,
+                        reuse=reuse,
+                        feature_selection=feature_selection,
+                        projection=projection,
+                        progress_callback=progress
+                    )
+
+                st.success("🎉 Model trained successfully!")
+                show_training_output(output)
 
 # =============================
 # ✅ TESTING MODE
 # =============================
 elif mode == "Test Model":
     st.header("🧪 Upload CSV for Testing")
-    test_file = st.file_uploader("Upload CSV File", type=["csv"], key="test_csv")
+    test_file = st.file_uploader("Upload CSV / Parquet / Feather File", type=UPLOAD_TYPES, key="test_csv")
 
     st.subheader("📁 Upload Trained Model (.pkl)")
     model_file = st.file_uploader("Upload Trained Model", type=["pkl"], key="model_pkl")
 
     target_col = st.text_input("Optional: Enter target column name (if available in test CSV)", "")
 
+    # Stream large CSVs in chunks instead of loading them fully into memory
+    stream_file = st.checkbox("Process large CSV in chunks (streaming)")
+    chunk_size = None
+    if stream_file:
+        chunk_size = int(st.number_input("Rows per chunk", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=10_000))
+
+    # Prediction output: compact formats and key-only columns keep wide inputs fast to write
+    col1, col2 = st.columns(2)
+    output_format = col1.selectbox(
+        "💾 Predictions format", list(PREDICTION_FORMATS),
+        format_func=lambda name: {"csv": "CSV", "parquet": "Parquet", "arrow": "Arrow IPC"}[name]
+    )
+    output_columns = col2.radio(
+        "Columns", PREDICTION_COLUMN_MODES, horizontal=True,
+        format_func=lambda mode: {"all": "Input + predictions", "key": "Key + predictions"}[mode]
+    )
+    key_column = None
+    if output_columns == "key":
+        key_column = st.text_input("Key column (empty for the row number)", "").strip() or None
+    probabilities = st.checkbox("Include class probabilities")
+
+    run_in_background = st.checkbox("📨 Run in background (survives page reloads)")
+
     if test_file and model_file:
         if st.button("🔍 Run Prediction & Evaluate"):
-            with st.spinner("Testing model on new data..."):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pkl") as tmp_model_file:
-                    tmp_model_file.write(model_file.read())
-                    model_path = tmp_model_file.name
-
-                result = tester.test_model_on_csv(
-                    csv_file=test_file,
-                    model_path=model_path,
-                    target_column=target_col.strip() if target_col else None
-                )
-                os.unlink(model_path)
-
-            st.success("✅ Testing Completed")
-
-            # Download predictions
-            st.subheader("📥 Download Predictions")
-            with open(result["predictions_csv"], "rb") as f:
-                st.download_button(
-                    label="Download Predictions (.csv)",
-                    data=f,
-                    file_name=os.path.basename(result["predictions_csv"]),
-                    mime="text/csv"
-                )
+            if run_in_background:
+                submit_job("test", {
+                    "csv_file": cache.persist_upload(test_file),
+                    "model_path": cache.persist_upload(model_file),
+                    "target_column": target_col.strip() if target_col else None,
+                    "chunk_size": chunk_size,
+                    "output_format": output_format,
+                    "output_columns": output_columns,
+                    "key_column": key_column,
+                    "probabilities": probabilities,
+                })
+            else:
+                with governed_run("Testing model on new data...") as progress:
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pkl") as tmp_model_file:
+                        tmp_model_file.write(model_file.read())
+                        model_path = tmp_model_file.name
+
+                    try:
+                        result = tester.test_model_on_csv(
+                            csv_file=test_file,
+                            model_path=model_path,
+                            target_column=target_col.strip() if target_col else None,
+                            chunk_size=chunk_size,
+                            output_format=output_format,
+                            output_columns=output_columns,
+                            key_column=key_column,
+                            probabilities=probabilities,
+                            progress_callback=progress
+                        )
+                    finally:
+                        os.unlink(model_path)
+
+                st.success("✅ Testing Completed")
+                if probabilities and not result["probabilities"]:
+                    st.warning("This model does not estimate class probabilities; only predictions were written.")
+                show_testing_output(result)
+
+# =============================
+# 🗂 JOBS
+# =============================
+elif mode == "Jobs":
+    st.header("🗂 Background Jobs")
+    job_list = jobs.get_manager().list(owner=job_owner())
+
+    if not job_list:
+        st.info("No background jobs yet. Tick 'Run in background' when training or testing.")
+    else:
+        columns = ["id", "kind", "status", "progress", "message", "created_at"]
+        st.dataframe(pd.DataFrame(job_list)[columns])
+
+        job_ids = [job["id"] for job in job_list]
+        requested = st.query_params.get("job")
+        job_id = st.selectbox(
+            "Select a job", job_ids, index=job_ids.index(requested) if requested in job_ids else 0
+        )
+        st.query_params["job"] = job_id
+        show_job(job_id)
+
+# =============================
+# ♻️ RUN REGISTRY
+# =============================
+elif mode == "Runs":
+    st.header("♻️ Registered Runs")
+    runs = registry.get_registry()
+    table = runs.compare()
+
+    if table.empty:
+        st.info("No runs yet. Every trained model is registered here and reused when trained again.")
+    else:
+        st.caption(f"{len(table)} run(s) using {runs.total_size() / 1024 ** 2:.1f} MiB")
+        selected = st.multiselect("Compare runs", list(table["key"]), format_func=lambda key: (
+            f"{key[:12]} ({table.set_index('key').loc[key, 'model']})"
+        ))
+        st.dataframe(table[table["key"].isin(selected)] if selected else table, hide_index=True)
 
-            # Show metrics
-            if result["metrics"]:
-                st.subheader("📊 Evaluation Metrics")
-                st.json(result["metrics"])
+        if selected and st.button("🗑 Delete selected runs"):
+            for key in selected:
+                runs.delete(key)
+            st.rerun()
 
-            # Show confusion plot
-            if result["confusion_plot"]:
-                st.subheader("📌 Confusion Matrix")
-                st.image(result["confusion_plot"])
+        st.subheader("🧹 Garbage Collection")
+        quota_mib = st.number_input(
+            "Disk quota (MiB); least recently used runs beyond it are deleted",
+            min_value=0, value=RUNS_QUOTA_BYTES // 1024 ** 2, step=100,
+        )
+        if st.button("Collect garbage"):
+            deleted = runs.gc(quota_bytes=int(quota_mib) * 1024 ** 2)
+            st.success(f"Deleted {len(deleted)} run(s).")
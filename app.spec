@@ -1,12 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
 
+sys.path.insert(0, SPECPATH)
+from src.constants import SCALABLE_MODEL_MAPPING, SKLEARN_MODEL_MAPPING
+
+# Estimators are imported by dotted path at runtime (see trainer.SUPPORTED_MODELS
+# and trainer.SCALABLE_MODELS), which PyInstaller's import scan cannot see, so
+# their modules are listed here.
+model_paths = [*SKLEARN_MODEL_MAPPING.values(), *SCALABLE_MODEL_MAPPING.values()]
+model_modules = sorted({path.rpartition('.')[0] for path in model_paths})
 
 a = Analysis(
     ['app.py'],
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['sklearn'],
+    hiddenimports=['sklearn', 'sklearn.naive_bayes', *model_modules],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
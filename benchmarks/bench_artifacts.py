@@ -0,0 +1,148 @@
+# benchmarks/bench_artifacts.py
+"""
+Benchmark model artifact size, load time and per-process memory.
+
+Every supported model is trained on a synthetic dataset and saved both
+uncompressed and compressed. Each artifact is then loaded in a fresh process
+with a full load, a memory-mapped load (mmap_mode="r") and, for the
+compressed file, a decompressing load.
+
+Usage:
+    python -m benchmarks.bench_artifacts --rows 20000 --output artifact_bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.datasets import make_dataset
+
+
+# ================================
+# Memory Measurement
+# ================================
+def memory_snapshot():
+    """
+    Return resident and private memory of the current process in bytes.
+
+    Private memory excludes page-cache pages shared with other processes,
+    which is what memory-mapped arrays save. Uses /proc/self/smaps_rollup on
+    Linux and falls back to peak RSS elsewhere.
+    """
+    try:
+        values = {}
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    values[parts[0].rstrip(":")] = int(parts[1]) * 1024
+        return {
+            "rss": values.get("Rss", 0),
+            "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+        }
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {"rss": peak, "private": peak}
+
+
+def _measure_load(path, mmap_mode, sample_path):
+    # Runs in a fresh process: import everything first so only the load is measured
+    import pandas as pd
+    from src import utils
+
+    sample = pd.read_pickle(sample_path)
+    before = memory_snapshot()
+
+    start = time.perf_counter()
+    artifact = utils.load_artifact(path, mmap_mode=mmap_mode)
+    load_time = time.perf_counter() - start
+
+    artifact["model"].predict(artifact["pipeline"].transform(sample))
+    after = memory_snapshot()
+
+    return {
+        "load_time_s": round(load_time, 4),
+        "rss_delta_mb": round((after["rss"] - before["rss"]) / 1024 ** 2, 2),
+        "private_delta_mb": round((after["private"] - before["private"]) / 1024 ** 2, 2),
+    }
+
+
+def measure_load(path, mmap_mode, sample_path):
+    """
+    Load an artifact in a freshly spawned process and return its timings and memory use.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_measure_load, path, mmap_mode, sample_path).result()
+
+
+# ================================
+# Benchmark Runner
+# ================================
+def run(n_rows=20_000, model_names=None):
+    from src import trainer, utils
+    from src.constants import ARTIFACT_COMPRESSION
+    from src.pipeline import PreprocessingPipeline
+
+    df = make_dataset(n_rows=n_rows, n_numeric=20, n_categorical=3, cardinality=50)
+    pipeline = PreprocessingPipeline("target")
+    X, y = pipeline.fit_transform(df)
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        sample_path = os.path.join(folder, "sample.pkl")
+        df.drop(columns=["target"]).head(100).to_pickle(sample_path)
+
+        for name in model_names or trainer.SUPPORTED_MODELS:
+            model = trainer.SUPPORTED_MODELS[name]()
+            start = time.perf_counter()
+            model.fit(X, y)
+            fit_time = time.perf_counter() - start
+
+            filename = name.replace(" ", "_")
+            plain = utils.save_artifact(model, pipeline, f"{filename}.pkl", folder=folder)
+            packed = utils.save_artifact(
+                model, pipeline, f"{filename}_compressed.pkl", folder=folder, compress=ARTIFACT_COMPRESSION
+            )
+
+            for variant, path, mmap_mode in (
+                ("full", plain, None),
+                ("mmap", plain, "r"),
+                ("compressed", packed, None),
+            ):
+                row = {
+                    "model": name,
+                    "variant": variant,
+                    "size_mb": round(os.path.getsize(path) / 1024 ** 2, 3),
+                    "fit_time_s": round(fit_time, 4),
+                }
+                row.update(measure_load(path, mmap_mode, sample_path))
+                results.append(row)
+                print(
+                    f"{name:<24} {variant:<11} size={row['size_mb']:>8.3f} MB  "
+                    f"load={row['load_time_s']:>7.4f} s  rss=+{row['rss_delta_mb']:>7.2f} MB  "
+                    f"private=+{row['private_delta_mb']:>7.2f} MB"
+                )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model artifact load time and memory.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Training rows of the synthetic dataset")
+    parser.add_argument("--models", nargs="*", help="Models to benchmark (default: all supported)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.models)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_scalable.py
+"""
+Compare the exact SVM / KNN with their scalable variants.
+
+For every row count a synthetic dataset is preprocessed once and split; each
+model with a scalable variant (trainer.SCALABLE_MODELS) is then fitted and
+evaluated with engine="exact" and engine="scalable". The report shows fit and
+predict time, accuracy and weighted F1 of both, plus the speedup and the
+accuracy lost. Exact models are skipped above their row cap, since a kernel
+SVC on a few hundred thousand rows does not finish in reasonable time.
+
+Usage:
+    python -m benchmarks.bench_scalable --rows 20000 100000 --output scalable_bench.json
+"""
+
+import argparse
+import json
+
+from benchmarks.datasets import make_dataset
+from benchmarks.run_benchmarks import MODEL_MAX_ROWS
+
+
+# ================================
+# Measurement
+# ================================
+def _split(n_rows, n_numeric, n_classes):
+    from sklearn.model_selection import train_test_split
+    from src.constants import DEFAULT_RANDOM_STATE, DEFAULT_TEST_SIZE
+    from src.pipeline import PreprocessingPipeline
+
+    df = make_dataset(n_rows=n_rows, n_numeric=n_numeric, n_categorical=2, n_classes=n_classes)
+    train_df, test_df = train_test_split(df, test_size=DEFAULT_TEST_SIZE, random_state=DEFAULT_RANDOM_STATE)
+    pipeline = PreprocessingPipeline("target")
+    X_train, y_train = pipeline.fit_transform(train_df)
+    X_test, y_test = pipeline.split_target(test_df)
+    return X_train, y_train, pipeline.transform(X_test), y_test
+
+
+def run_case(n_rows, n_numeric=20, n_classes=3, max_exact_rows=None):
+    """
+    Fit every model with a scalable variant both ways on one dataset.
+
+    Returns:
+        dict: {model: {engine: {fit_s, predict_s, accuracy, f1_score} or None if skipped}}
+    """
+    from src import trainer
+
+    max_exact_rows = max_exact_rows or MODEL_MAX_ROWS
+    X_train, y_train, X_test, y_test = _split(n_rows, n_numeric, n_classes)
+
+    results = {}
+    for name in trainer.SCALABLE_MODELS:
+        results[name] = {}
+        for engine in ("exact", "scalable"):
+            if engine == "exact" and n_rows > max_exact_rows.get(name, float("inf")):
+                results[name][engine] = None
+                continue
+            result = trainer.fit_and_evaluate(name, X_train, y_train, X_test, y_test, engine=engine)
+            results[name][engine] = {
+                "fit_s": round(result["fit_time"], 4),
+                "predict_s": round(result["predict_time"], 4),
+                "accuracy": result["metrics"]["accuracy"],
+                "f1_score": result["metrics"]["f1_score"],
+            }
+    return results
+
+
+def trade_off(exact, scalable):
+    """
+    Return the speedups and the accuracy / F1 change of the scalable variant, or None without an exact run.
+    """
+    if exact is None:
+        return None
+    return {
+        "fit_speedup": round(exact["fit_s"] / max(scalable["fit_s"], 1e-9), 2),
+        "predict_speedup": round(exact["predict_s"] / max(scalable["predict_s"], 1e-9), 2),
+        "accuracy_change": round(scalable["accuracy"] - exact["accuracy"], 4),
+        "f1_change": round(scalable["f1_score"] - exact["f1_score"], 4),
+    }
+
+
+# ================================
+# Report
+# ================================
+def run(rows, n_numeric=20, n_classes=3):
+    report = {}
+    for n_rows in rows:
+        case = run_case(n_rows, n_numeric, n_classes)
+        for name, engines in case.items():
+            engines["trade_off"] = trade_off(engines["exact"], engines["scalable"])
+        report[str(n_rows)] = case
+    return report
+
+
+def print_report(report):
+    for n_rows, case in report.items():
+        print(f"== rows={n_rows}")
+        for name, engines in case.items():
+            for engine in ("exact", "scalable"):
+                result = engines[engine]
+                if result is None:
+                    print(f"   {name:<24} {engine:<9} skipped (too many rows)")
+                    continue
+                print(
+                    f"   {name:<24} {engine:<9} fit {result['fit_s']:>9.3f} s  predict {result['predict_s']:>8.3f} s"
+                    f"  accuracy {result['accuracy']:.4f}  f1 {result['f1_score']:.4f}"
+                )
+            if engines["trade_off"]:
+                t = engines["trade_off"]
+                print(
+                    f"   {'':<24} {'':<9} fit x{t['fit_speedup']}, predict x{t['predict_speedup']}, "
+                    f"accuracy {t['accuracy_change']:+.4f}, f1 {t['f1_change']:+.4f}"
+                )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare exact and scalable SVM / KNN.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 100_000], help="Dataset sizes")
+    parser.add_argument("--numeric", type=int, default=20, help="Numeric feature columns")
+    parser.add_argument("--classes", type=int, default=3, help="Target classes")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.numeric, args.classes)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+# benchmarks/bench_selection.py
+"""
+Compare models trained on all features with models trained after feature selection.
+
+A synthetic dataset is widened with the columns feature selection targets: a
+row ID, constant columns, near-duplicates of informative columns and pure
+noise. It is preprocessed once without selection and once per selection
+setting; every model is fitted and evaluated on each. The report shows fit and
+predict time, accuracy and weighted F1, the feature counts and the speedup
+and accuracy change against all features.
+
+Usage:
+    python -m benchmarks.bench_selection --rows 50000 --noise 100 --output selection_bench.json
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_scalable import trade_off
+from benchmarks.datasets import make_dataset
+
+MODELS = ["Random Forest", "Logistic Regression", "K-Nearest Neighbors"]
+
+SETTINGS = {
+    "all features": ((), None),
+    "filters": (("variance", "identifiers", "correlation"), None),
+    "filters + mutual_info": (("variance", "identifiers", "correlation", "mutual_info"), None),
+    "filters + importance": (("variance", "identifiers", "correlation", "importance"), None),
+    "filters + pca": (("variance", "identifiers", "correlation"), "pca"),
+}
+
+
+# ================================
+# Measurement
+# ================================
+def make_wide_dataset(n_rows, n_noise, seed=42):
+    """
+    Return a dataset with informative, ID, constant, duplicate and noise columns.
+    """
+    rng = np.random.default_rng(seed)
+    df = make_dataset(n_rows=n_rows, n_numeric=10, n_categorical=2, n_classes=3, seed=seed)
+    extra = {"id": np.arange(n_rows)}
+    for i in range(5):
+        extra[f"constant_{i}"] = np.ones(n_rows)
+        extra[f"duplicate_{i}"] = df[f"num_{i}"].to_numpy() * 2 + rng.normal(scale=0.01, size=n_rows)
+    for i in range(n_noise):
+        extra[f"noise_{i}"] = rng.normal(size=n_rows)
+    return pd.concat([pd.DataFrame(extra, index=df.index), df], axis=1)
+
+
+def run(n_rows, n_noise, models=None):
+    """
+    Fit every model on every selection setting of one dataset.
+
+    Returns:
+        dict: {setting: {"n_features", "selection_s", model: {fit_s, predict_s, accuracy, f1_score, trade_off}}}
+    """
+    from sklearn.model_selection import train_test_split
+    from src import trainer
+    from src.constants import DEFAULT_RANDOM_STATE, DEFAULT_TEST_SIZE
+    from src.pipeline import PreprocessingPipeline
+
+    df = make_wide_dataset(n_rows, n_noise)
+    train_df, test_df = train_test_split(df, test_size=DEFAULT_TEST_SIZE, random_state=DEFAULT_RANDOM_STATE)
+
+    report = {}
+    for setting, (feature_selection, projection) in SETTINGS.items():
+        pipeline = PreprocessingPipeline("target", feature_selection=feature_selection, projection=projection)
+        X_train, y_train = pipeline.fit_transform(train_df)
+        X_test, y_test = pipeline.split_target(test_df)
+        X_test = pipeline.transform(X_test)
+
+        case = {
+            "n_features": len(pipeline.output_columns),
+            "selection_s": pipeline.selector.report["fit_time_s"] if pipeline.selector else 0.0,
+        }
+        for name in models or MODELS:
+            result = trainer.fit_and_evaluate(name, X_train, y_train, X_test, y_test)
+            case[name] = {
+                "fit_s": round(result["fit_time"], 4),
+                "predict_s": round(result["predict_time"], 4),
+                "accuracy": result["metrics"]["accuracy"],
+                "f1_score": result["metrics"]["f1_score"],
+            }
+            baseline = report["all features"][name] if report else None
+            case[name]["trade_off"] = trade_off(baseline, case[name])
+        report[setting] = case
+    return report
+
+
+# ================================
+# Report
+# ================================
+def print_report(report):
+    for setting, case in report.items():
+        print(f"== {setting}: {case['n_features']} features, selected in {case['selection_s']:.3f} s")
+        for name, result in case.items():
+            if not isinstance(result, dict):
+                continue
+            line = (
+                f"   {name:<24} fit {result['fit_s']:>9.3f} s  predict {result['predict_s']:>8.3f} s"
+                f"  accuracy {result['accuracy']:.4f}  f1 {result['f1_score']:.4f}"
+            )
+            t = result["trade_off"]
+            if t:
+                line += f"  (fit x{t['fit_speedup']}, predict x{t['predict_speedup']}, f1 {t['f1_change']:+.4f})"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare models with and without feature selection.")
+    parser.add_argument("--rows", type=int, default=50_000, help="Dataset size")
+    parser.add_argument("--noise", type=int, default=100, help="Pure noise columns added to the data")
+    parser.add_argument("--models", nargs="+", help=f"Models to fit (default: {', '.join(MODELS)})")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.noise, args.models)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+# benchmarks/datasets.py
+
+import numpy as np
+import pandas as pd
+
+
+# ================================
+# Synthetic Dataset Generator
+# ================================
+def make_dataset(n_rows=10_000, n_numeric=10, n_categorical=2, cardinality=10,
+                 missing_rate=0.0, n_classes=2, seed=42):
+    """
+    Generate a reproducible classification DataFrame with a "target" column.
+
+    Args:
+        n_rows (int): Number of rows
+        n_numeric (int): Number of float feature columns
+        n_categorical (int): Number of string feature columns
+        cardinality (int): Distinct values per categorical column
+        missing_rate (float): Share of feature cells set to missing
+        n_classes (int): Number of target classes
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    numeric = rng.normal(size=(n_rows, n_numeric))
+    codes = rng.integers(0, cardinality, size=(n_rows, n_categorical))
+
+    # The target depends on a few numeric and categorical features
+    signal = numeric[:, : min(3, n_numeric)].sum(axis=1) if n_numeric else np.zeros(n_rows)
+    if n_categorical:
+        signal = signal + (codes[:, 0] % 3) - 1
+    target = np.digitize(signal, np.quantile(signal, np.linspace(0, 1, n_classes + 1)[1:-1]))
+
+    data = {f"num_{i}": numeric[:, i] for i in range(n_numeric)}
+    vocabulary = np.array([f"cat_{j}" for j in range(cardinality)], dtype=object)
+    for i in range(n_categorical):
+        data[f"str_{i}"] = vocabulary[codes[:, i]]
+    df = pd.DataFrame(data)
+
+    if missing_rate > 0:
+        mask = rng.random(df.shape) < missing_rate
+        df = df.mask(mask)
+
+    df["target"] = target
+    return df
@@ -0,0 +1,148 @@
+# benchmarks/import_time.py
+"""
+Report import time of the app's modules and the app's time to first render.
+
+Every measurement runs in a fresh interpreter, so nothing is already imported.
+Module imports are measured with `python -X importtime`, which also shows the
+heaviest packages pulled in; the first render runs app.py once with
+streamlit's AppTest (no browser or server needed).
+
+Usage:
+    python -m benchmarks.import_time                    # report
+    python -m benchmarks.import_time --max-seconds 1.0  # exit 1 if the first render is slower
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported by app.py at startup
+APP_MODULES = [
+    "src.trainer", "src.tester", "src.eda", "src.cache", "src.jobs", "src.utils", "src.instrumentation",
+]
+
+# Libraries that should only be imported when a feature needs them
+DEFERRED_LIBRARIES = ["sklearn", "matplotlib", "seaborn", "ydata_profiling", "scipy.stats"]
+
+FIRST_RENDER_SCRIPT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+print(time.perf_counter() - start)
+"""
+
+
+# ================================
+# Measurement
+# ================================
+def _python(args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        list[dict]: module, self_s, cumulative_s, depth (0 = imported directly)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_part, cumulative_us, name = line.split("|")
+        self_us = self_part.split(":")[1]
+        rows.append({
+            "module": name.strip(),
+            "self_s": int(self_us) / 1e6,
+            "cumulative_s": int(cumulative_us) / 1e6,
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        })
+    return rows
+
+
+def measure_import(module, top=10):
+    """
+    Import `module` in a fresh interpreter.
+
+    Returns:
+        dict: total_s, top (packages by own import time), deferred (heavy libraries that got imported)
+    """
+    check = f"import sys; print(','.join(m for m in {DEFERRED_LIBRARIES!r} if m in sys.modules))"
+    result = _python(["-X", "importtime", "-c", f"import {module}; {check}"])
+    rows = parse_importtime(result.stderr)
+
+    # Children are printed before their parent; interpreter start-up imports come before both
+    end = max(i for i, row in enumerate(rows) if row["module"] == module and row["depth"] == 0)
+    start = max((i + 1 for i, row in enumerate(rows[:end]) if row["depth"] == 0), default=0)
+    packages = {}
+    for row in rows[start:end]:
+        package = row["module"].split(".")[0]
+        if package != "src":
+            packages[package] = packages.get(package, 0.0) + row["self_s"]
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    own = rows[end]
+    return {
+        "total_s": round(own["cumulative_s"], 4),
+        "top": [{"package": name, "seconds": round(seconds, 4)} for name, seconds in heaviest],
+        "deferred": [name for name in result.stdout.strip().split(",") if name],
+    }
+
+
+def measure_first_render():
+    """
+    Run app.py once in a fresh interpreter and return the seconds until the script finished.
+    """
+    return round(float(_python(["-c", FIRST_RENDER_SCRIPT]).stdout.strip().splitlines()[-1]), 4)
+
+
+# ================================
+# Report
+# ================================
+def run(modules=APP_MODULES, top=10):
+    report = {"modules": {}, "first_render_s": measure_first_render()}
+    for module in modules:
+        report["modules"][module] = measure_import(module, top)
+    return report
+
+
+def print_report(report):
+    print(f"Time to first render: {report['first_render_s']:.3f} s\n")
+    for module, result in report["modules"].items():
+        deferred = f"  (imports {', '.join(result['deferred'])})" if result["deferred"] else ""
+        print(f"{module:<24} {result['total_s']:>8.3f} s{deferred}")
+        for row in result["top"][:5]:
+            print(f"    {row['package']:<20} {row['seconds']:>8.3f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report app import time and time to first render.")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages kept per module")
+    parser.add_argument("--max-seconds", type=float, help="Fail if the first render takes longer")
+    parser.add_argument("--output", help="Also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = run(top=args.top)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.max_seconds is not None and report["first_render_s"] > args.max_seconds:
+        print(f"\nFirst render took {report['first_render_s']:.3f} s (limit {args.max_seconds:.3f} s).")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmark the training and inference hot paths on synthetic datasets.
+
+Each dataset of a suite is written to CSV and pushed through loading,
+missing-value handling (dropping rows and every imputation strategy),
+encoding, scaling, fitting of every supported model, batch testing, metrics
+and plotting. Every operation is timed (median of several repeats) and its
+peak traced allocation (Python and NumPy buffers) is measured in a separate run.
+
+Results are compared with a baseline file; a slowdown or memory growth beyond
+the threshold makes the run exit with status 1.
+
+Usage:
+    python -m benchmarks.run_benchmarks --suite quick --update-baseline   # record a baseline
+    python -m benchmarks.run_benchmarks --suite quick                     # compare against it
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.datasets import make_dataset
+
+
+# ================================
+# Suites
+# ================================
+def _grid(rows, numeric, cardinality, missing_rates, n_categorical=3):
+    return [
+        {"n_rows": r, "n_numeric": n, "n_categorical": n_categorical, "cardinality": c, "missing_rate": m}
+        for r, n, c, m in itertools.product(rows, numeric, cardinality, missing_rates)
+    ]
+
+
+SUITES = {
+    "quick": _grid(rows=[5_000], numeric=[10], cardinality=[10, 1_000], missing_rates=[0.0, 0.05]),
+    "full": _grid(rows=[20_000, 200_000], numeric=[10, 50], cardinality=[10, 1_000], missing_rates=[0.0, 0.05]),
+}
+
+# Models with super-linear fit cost are skipped above these row counts
+MODEL_MAX_ROWS = {
+    "Support Vector Machine": 50_000,
+    "K-Nearest Neighbors": 200_000,
+}
+
+BASELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def case_name(params):
+    return (
+        f"rows={params['n_rows']},num={params['n_numeric']},cat={params['n_categorical']}"
+        f"x{params['cardinality']},missing={params['missing_rate']}"
+    )
+
+
+# ================================
+# Measurement
+# ================================
+def measure(func, setup=None, repeats=3):
+    """
+    Time `func(*setup())` and measure its peak traced allocation.
+
+    `setup` runs before every call and is not timed, so functions that modify
+    their input get a fresh copy each time.
+
+    Returns:
+        dict: time_s (median wall time), peak_mb (peak traced allocation)
+    """
+    setup = setup or (lambda: ())
+    times = []
+    for _ in range(repeats):
+        args = setup()
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    # Tracing slows allocations down, so memory is measured in its own run
+    args = setup()
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"time_s": round(statistics.median(times), 5), "peak_mb": round(peak / 1024 ** 2, 3)}
+
+
+def run_case(params, folder, repeats=3):
+    """
+    Run every benchmarked operation on one synthetic dataset.
+
+    Returns:
+        dict: {operation: {"time_s": ..., "peak_mb": ...}}
+    """
+    from src import metrics, tester, trainer, utils
+    from src.constants import PREDICTION_COLUMN_MODES, PREDICTION_FORMATS
+    from src.imputation import IMPUTATION_STRATEGIES, Imputer
+    from src.pipeline import PreprocessingPipeline
+    from src.visualizer import plot_confusion_matrix, plot_feature_importance
+    from src.writer import PredictionWriter
+
+    df = make_dataset(**params)
+    csv_path = os.path.join(folder, "data.csv")
+    df.to_csv(csv_path, index=False)
+
+    results = {}
+    results["load_csv"] = measure(lambda: utils.load_csv(csv_path), repeats=repeats)
+
+    loaded = utils.load_csv(csv_path)
+    results["handle_missing_values"] = measure(lambda: utils.handle_missing_values(loaded), repeats=repeats)
+    # Imputation keeps every row; compare fit + transform cost against dropping them
+    for strategy in IMPUTATION_STRATEGIES[1:]:
+        results[f"impute:{strategy}"] = measure(
+            lambda: Imputer(strategy, add_indicators=True).fit_transform(loaded), repeats=repeats
+        )
+
+    clean = utils.handle_missing_values(loaded)
+    X, y = utils.split_features_target(clean, "target")
+    results["encode_categorical_columns"] = measure(lambda: utils.encode_categorical_columns(X), repeats=repeats)
+
+    encoded, _ = utils.encode_categorical_columns(X)
+    results["scale_numeric_columns"] = measure(
+        utils.scale_numeric_columns, setup=lambda: (encoded.copy(),), repeats=repeats
+    )
+    scaled, _ = utils.scale_numeric_columns(encoded.copy())
+
+    for name, model_class in trainer.SUPPORTED_MODELS.items():
+        if params["n_rows"] > MODEL_MAX_ROWS.get(name, float("inf")):
+            continue
+        results[f"fit:{name}"] = measure(lambda: model_class().fit(scaled, y), repeats=repeats)
+
+    # Batch testing of a saved artifact (load, transform, predict, save, metrics, plot)
+    pipeline = PreprocessingPipeline("target")
+    X_train, y_train = pipeline.fit_transform(clean)
+    model = trainer.SUPPORTED_MODELS["Decision Tree"]().fit(X_train, y_train)
+    model_path = utils.save_artifact(model, pipeline, "model.pkl", folder=folder)
+    outputs = []
+
+    def run_test():
+        result = tester.test_model_on_csv(csv_path, model_path, "target")
+        outputs.append(result["predictions_path"])
+
+    results["test_model_on_csv"] = measure(run_test, repeats=repeats)
+    for path in outputs:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    # Prediction output: full input vs key column only, in every format
+    predictions = model.predict(pipeline.transform(clean))
+    for output_format, columns in itertools.product(PREDICTION_FORMATS, PREDICTION_COLUMN_MODES):
+        path = os.path.join(folder, f"predictions{PREDICTION_FORMATS[output_format][0]}")
+
+        def write_predictions():
+            with PredictionWriter(path, output_format, columns) as writer:
+                writer.write(clean, predictions)
+
+        results[f"write_predictions:{output_format}:{columns}"] = measure(write_predictions, repeats=repeats)
+
+    y_pred = model.predict(X_train)
+    results["classification_metrics"] = measure(
+        lambda: metrics.classification_metrics(y_train, y_pred), repeats=repeats
+    )
+    scores = metrics.classification_metrics(y_train, y_pred)
+    results["plot_confusion_matrix"] = measure(
+        lambda: plot_confusion_matrix(scores["confusion_matrix"], scores["labels"]), repeats=repeats
+    )
+    results["plot_feature_importance"] = measure(
+        lambda: plot_feature_importance(model, pipeline.output_columns), repeats=repeats
+    )
+    return results
+
+
+def run(suite="quick", repeats=3):
+    """
+    Run every case of a suite.
+
+    Returns:
+        dict: {"case/operation": {"time_s": ..., "peak_mb": ...}}
+    """
+    results = {}
+    for params in SUITES[suite]:
+        name = case_name(params)
+        print(f"== {name}")
+        with tempfile.TemporaryDirectory() as folder:
+            for operation, measurement in run_case(params, folder, repeats).items():
+                results[f"{name}/{operation}"] = measurement
+                print(f"   {operation:<32} {measurement['time_s']:>10.4f} s  {measurement['peak_mb']:>9.2f} MB")
+    return results
+
+
+# ================================
+# Baseline Comparison
+# ================================
+def environment():
+    import numpy
+    import pandas
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def compare(results, baseline, threshold=0.25, memory_threshold=0.25, min_delta_s=0.01):
+    """
+    Return the operations that got slower or use more memory than the baseline allows.
+
+    Slowdowns smaller than `min_delta_s` are treated as timer noise.
+
+    Returns:
+        list[str]: one message per regression
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        slower = current["time_s"] - previous["time_s"]
+        if current["time_s"] > previous["time_s"] * (1 + threshold) and slower > min_delta_s:
+            regressions.append(
+                f"{key}: time {previous['time_s']:.4f} s -> {current['time_s']:.4f} s "
+                f"(+{slower / previous['time_s']:.0%})"
+            )
+        if current["peak_mb"] > previous["peak_mb"] * (1 + memory_threshold) and current["peak_mb"] - previous["peak_mb"] > 1:
+            regressions.append(
+                f"{key}: peak memory {previous['peak_mb']:.2f} MB -> {current['peak_mb']:.2f} MB"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the training and inference hot paths.")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per operation (median is kept)")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baseline_<suite>.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative memory growth")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="Ignore slowdowns below this many seconds")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"baseline_{args.suite}.json")
+    report = {"suite": args.suite, "environment": environment(), "results": run(args.suite, args.repeats)}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one.")
+        return 0
+
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != report["environment"]:
+        print("Warning: baseline was recorded in a different environment; timings may not be comparable.")
+
+    regressions = compare(
+        report["results"], baseline["results"], args.threshold, args.memory_threshold, args.min_delta
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond the threshold:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions beyond the threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
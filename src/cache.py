@@ -0,0 +1,229 @@
+# src/cache.py
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src import utils
+from src.constants import CACHE_MAX_BYTES, CACHE_MAX_ENTRIES, PARQUET_DIR, UPLOADS_DIR
+
+
+# ================================
+# Size Estimation
+# ================================
+def estimate_size(value):
+    """
+    Estimate the in-memory size of a cached value in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if sp.issparse(value):
+        return int(value.data.nbytes + value.indices.nbytes + value.indptr.nbytes)
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+# ================================
+# LRU Cache
+# ================================
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and total estimated bytes.
+
+    Values larger than the byte budget are returned to the caller but not stored.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes=None):
+        nbytes = estimate_size(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Module-level caches survive Streamlit reruns because modules are imported once
+_cache = LRUCache()
+_hash_memo = LRUCache(max_entries=256, max_bytes=1024 * 1024)
+
+
+def get_cache():
+    """
+    Return the process-wide artifact cache.
+    """
+    return _cache
+
+
+# ================================
+# Content Hashing
+# ================================
+def hash_file(file, block_size=8 * 1024 * 1024):
+    """
+    Return a content hash of a file path or uploaded file.
+
+    The hash is memoized per upload id (or path, size and mtime) so a rerun
+    does not re-read the file.
+    """
+    memo_key = None
+    if isinstance(file, (str, os.PathLike)):
+        stat = os.stat(file)
+        memo_key = ("path", os.fspath(file), stat.st_size, stat.st_mtime_ns)
+    elif getattr(file, "file_id", None):
+        memo_key = ("upload", file.file_id, getattr(file, "size", None))
+
+    cached = _hash_memo.get(memo_key) if memo_key else None
+    if cached is not None:
+        return cached
+
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+    elif hasattr(file, "getbuffer"):
+        digest.update(file.getbuffer())
+    else:
+        position = file.tell()
+        file.seek(0)
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+        file.seek(position)
+
+    file_hash = digest.hexdigest()
+    if memo_key:
+        _hash_memo.put(memo_key, file_hash)
+    return file_hash
+
+
+def dataset_key(file):
+    """
+    Return a cache key for a dataset given as a path, an upload or a DataFrame.
+    """
+    if isinstance(file, pd.DataFrame):
+        return "df-" + hashlib.blake2b(
+            pd.util.hash_pandas_object(file, index=True).to_numpy().tobytes(), digest_size=16
+        ).hexdigest()
+    return hash_file(file)
+
+
+# ================================
+# Cached Loaders
+# ================================
+def load_dataframe(file):
+    """
+    Parse a dataset once per content hash and return the cached DataFrame.
+
+    The returned DataFrame is shared between reruns and must not be modified in place.
+    """
+    if isinstance(file, pd.DataFrame):
+        return file
+
+    def parse():
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return utils.load_data(file)
+
+    return _cache.get_or_compute(("dataframe", dataset_key(file)), parse)
+
+
+def parquet_copy(file, folder=PARQUET_DIR):
+    """
+    Return the path of a Parquet copy of the dataset, converting it only once per content hash.
+    """
+    if utils.get_file_extension(file) == ".parquet":
+        return file
+
+    path = os.path.join(folder, f"{hash_file(file)}.parquet")
+    if not os.path.exists(path):
+        if hasattr(file, "seek"):
+            file.seek(0)
+        utils.convert_to_parquet(file, path)
+    return path
+
+
+def persist_upload(file, folder=UPLOADS_DIR):
+    """
+    Write an uploaded file to disk once per content hash and return its path.
+
+    Background jobs run in other processes and need a path instead of the upload object.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return os.fspath(file)
+
+    extension = utils.get_file_extension(file)
+    path = os.path.join(folder, f"{hash_file(file)}{extension}")
+    if not os.path.exists(path):
+        os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(file.getbuffer())
+    return path
@@ -10,12 +10,26 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_DIR = os.path.join(BASE_DIR, "outputs", "models")
 PREDICTIONS_DIR = os.path.join(BASE_DIR, "outputs", "predictions")
 PLOTS_DIR = os.path.join(BASE_DIR, "outputs", "plots")
+PARQUET_DIR = os.path.join(BASE_DIR, "outputs", "parquet")
+UPLOADS_DIR = os.path.join(BASE_DIR, "outputs", "uploads")
+TIMINGS_DIR = os.path.join(BASE_DIR, "outputs", "timings")
+JOBS_DB_PATH = os.path.join(BASE_DIR, "outputs", "jobs.db")
+RUNS_DIR = os.path.join(BASE_DIR, "outputs", "runs")
 
 # ===============================
 # Default Values
 # ===============================
 DEFAULT_TEST_SIZE = 0.2
 DEFAULT_RANDOM_STATE = 42
+DEFAULT_CHUNK_SIZE = 100_000
+
+# ===============================
+# Model Artifacts
+# ===============================
+ARTIFACT_FORMAT = "automl-csv-artifact"
+ARTIFACT_VERSION = 1
+ARTIFACT_HEADER_SUFFIX = ".json"  # metadata header stored next to the artifact
+ARTIFACT_COMPRESSION = 3          # joblib compression level for compressed artifacts
 
 # ===============================
 # Supported Models
@@ -37,8 +51,142 @@ SKLEARN_MODEL_MAPPING = {
     "knn": "sklearn.neighbors.KNeighborsClassifier"
 }
 
+# Scalable variants used above SCALABLE_MODEL_MIN_ROWS training rows (see trainer.resolve_model_class)
+SCALABLE_MODEL_MAPPING = {
+    "svm": "src.scalable.ApproximateKernelSVC",
+    "knn": "src.scalable.IndexedKNeighborsClassifier",
+}
+
+# ===============================
+# Scalable Models
+# ===============================
+MODEL_ENGINES = ["auto", "exact", "scalable"]
+SCALABLE_MODEL_MIN_ROWS = 50_000  # exact SVC / KNN get too slow beyond this many training rows
+KERNEL_APPROX_COMPONENTS = 300    # Nystroem landmarks approximating the RBF kernel
+KNN_MAX_REFERENCE_ROWS = 50_000   # training rows kept as KNN neighbors (class-stratified sample)
+KNN_TREE_MAX_FEATURES = 15        # KNN uses a KD-tree index up to this many features, a scan beyond
+SCALABLE_PREDICT_BATCH_ROWS = 50_000  # rows per kernel-map batch (bounds the dense rows x components block)
+
+# ===============================
+# Progressive Training
+# ===============================
+PROGRESSIVE_FRACTIONS = [0.01, 0.1, 1.0]  # stratified training samples, smallest first
+PROGRESSIVE_MIN_ROWS = 200                # smallest sample size
+PROGRESSIVE_MIN_GAIN = 0.005              # weighted-F1 gain below which the learning curve counts as flat
+
+# ===============================
+# Hyperparameter Tuning
+# ===============================
+TUNING_TIME_BUDGET_S = 60     # default wall-clock budget for one model
+TUNING_CV_FOLDS = 3
+TUNING_HALVING_FACTOR = 3     # keep the best 1/factor configurations per rung
+TUNING_MAX_RUNGS = 4          # factor ** (rungs - 1) configurations per bracket
+TUNING_MIN_SAMPLES = 200      # smallest training subsample of the first rung
+
+# ===============================
+# In-Memory Cache
+# ===============================
+CACHE_MAX_ENTRIES = 16
+CACHE_MAX_BYTES = 4 * 1024 ** 3  # 4 GiB
+
+# ===============================
+# Background Jobs
+# ===============================
+JOB_MAX_WORKERS = 2         # worker processes; jobs also need a slot (RESOURCE_MAX_CONCURRENT_JOBS)
+JOB_POLL_INTERVAL_S = 2     # UI refresh interval while a job is running
+
+# ===============================
+# Resource Governance
+# ===============================
+RESOURCE_MAX_CONCURRENT_JOBS = 2   # heavy runs (training, testing, deep EDA) executing at once in one process
+RESOURCE_THREADS_PER_JOB = max(1, (os.cpu_count() or 1) // RESOURCE_MAX_CONCURRENT_JOBS)
+RESOURCE_SESSION_MEMORY_BYTES = 4 * 1024 ** 3  # 4 GiB of estimated working memory per browser session
+# Rough working memory of a run per byte of input file (Parquet is compressed, so it expands more)
+RESOURCE_MEMORY_PER_INPUT_BYTE = {".csv": 5, ".parquet": 15, ".feather": 5}
+RESOURCE_STREAMING_MEMORY_BYTES = 512 * 1024 ** 2  # reserved by chunked runs, whatever the file size
+RESOURCE_PROFILE_MEMORY_FACTOR = 10  # deep EDA working memory per byte of the profiled sample
+RESOURCE_QUEUE_TIMEOUT_S = 900     # waiting runs give up after this long
+RESOURCE_POLL_INTERVAL_S = 1.0     # how often a waiting run re-checks its queue position
+
+# ===============================
+# Run Registry
+# ===============================
+RUNS_QUOTA_BYTES = 5 * 1024 ** 3  # 5 GiB of registered runs (artifacts and plots) before old runs are evicted
+
+# ===============================
+# Missing Values
+# ===============================
+IMPUTATION_SAMPLE_ROWS = 10_000       # row cap for fitting KNN / iterative imputers
+IMPUTATION_BATCH_ROWS = 1_000         # rows per KNN / iterative transform call (bounds the distance matrix)
+MISSING_CATEGORY = "__missing__"      # fill value of categorical columns with the "constant" strategy
+MISSING_INDICATOR_SUFFIX = "__missing"
+
+# ===============================
+# Feature Selection
+# ===============================
+SELECTION_SAMPLE_ROWS = 10_000          # class-stratified training rows the filters and projections are fitted on
+SELECTION_QUASI_CONSTANT_SHARE = 0.99   # "variance" drops columns with one value in at least this share of rows
+SELECTION_CORRELATION_THRESHOLD = 0.95  # "correlation" drops the later column of pairs with a larger |r|
+SELECTION_DENSE_MAX_FEATURES = 2_000    # "correlation" and sparse "mutual_info" need dense columns; skipped beyond this
+SELECTION_MI_PROBES = 5                 # noise columns scored too; "mutual_info" drops columns scoring no higher
+SELECTION_IMPORTANCE_THRESHOLD = 1.0    # "importance" drops columns below this multiple of the mean importance
+SELECTION_IMPORTANCE_TREES = 50         # trees of the random forest scoring the columns
+SELECTION_PCA_VARIANCE = 0.95           # PCA keeps the components explaining this share of the variance
+SELECTION_SVD_COMPONENTS = 100          # TruncatedSVD components (at most n_features - 1)
+
+# ===============================
+# Prediction Output
+# ===============================
+# File extension and download MIME type of every prediction output format
+PREDICTION_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+}
+PREDICTION_COLUMN_MODES = ["all", "key"]  # full input + predictions, or key column + predictions
+PREDICTION_COLUMN = "Prediction"
+PROBABILITY_COLUMN_PREFIX = "proba_"      # one probability column per class: proba_<class>
+ROW_KEY_COLUMN = "row"                    # default key: 0-based row number in the input file
+PREDICTION_WRITE_BATCH_ROWS = 100_000     # rows converted to Arrow and written at a time
+
+# ===============================
+# Evaluation Metrics
+# ===============================
+METRICS_BOOTSTRAP_SAMPLES = 1000  # resamples for metric confidence intervals (0 disables them)
+METRICS_CONFIDENCE_LEVEL = 0.95
+
+# ===============================
+# Plots
+# ===============================
+CONFUSION_MATRIX_MAX_CLASSES = 20  # larger problems show the top classes plus an "Other" bucket
+FEATURE_IMPORTANCE_TOP_N = 20
+
+# ===============================
+# Exploratory Data Analysis
+# ===============================
+EDA_SAMPLE_ROWS = 50_000  # row cap for the deep ydata-profiling report
+
+# ===============================
+# Online Prediction Server
+# ===============================
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8000
+SERVER_MAX_MODELS = 8          # models kept warm in memory
+SERVER_MAX_BATCH_SIZE = 256    # rows per micro-batch
+SERVER_MAX_WAIT_MS = 0         # extra wait to fill a batch (0 = only batch already queued requests)
+SERVER_PREDICT_TIMEOUT_S = 30  # a request waiting longer for its batch fails with 503
+
 # ===============================
 # Other Constants
 # ===============================
 DATE_FORMAT = "%Y-%m-%d_%H-%M-%S"
-ALLOWED_FILE_EXTENSIONS = [".csv"]
+ALLOWED_FILE_EXTENSIONS = [".csv", ".parquet", ".feather"]
+
+# String columns with at most this share of distinct values are loaded as categoricals
+MAX_CATEGORY_RATIO = 0.5
+
+# Fields read as missing values, in every column type (the `pd.read_csv` defaults)
+CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
@@ -1,24 +1,95 @@
 # src/eda.py
 
 import streamlit as st
-from ydata_profiling import ProfileReport
+import numpy as np
 import pandas as pd
-import tempfile
-import os
+from src import cache, resources
+from src.constants import DEFAULT_RANDOM_STATE, EDA_SAMPLE_ROWS, RESOURCE_PROFILE_MEMORY_FACTOR
 
-def run_eda(df: pd.DataFrame):
-    """Generate and render the EDA report inline in Streamlit without streamlit-pandas-profiling."""
+# Correlation types computed by ydata-profiling (phik dominates profiling time)
+CORRELATION_TYPES = ["auto", "pearson", "spearman", "kendall", "phi_k", "cramers"]
+
+
+def quick_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a per-column summary (dtype, missingness, cardinality, quantiles) computed on the full data.
+
+    All statistics are vectorized pandas reductions, so this runs in seconds even on millions of rows.
+    """
+    summary = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "missing": df.isna().sum(),
+        "missing_pct": (df.isna().mean() * 100).round(2),
+        "unique": df.nunique(dropna=True),
+    })
+
+    numeric = df.select_dtypes(include=[np.number])
+    if not numeric.empty:
+        stats = numeric.quantile([0.0, 0.25, 0.5, 0.75, 1.0]).T
+        stats.columns = ["min", "25%", "50%", "75%", "max"]
+        stats["mean"] = numeric.mean()
+        stats["std"] = numeric.std()
+        summary = summary.join(stats)
+
+    return summary
+
+def stratified_sample(df: pd.DataFrame, max_rows: int, stratify_column=None,
+                      random_state=DEFAULT_RANDOM_STATE) -> pd.DataFrame:
+    """Return at most `max_rows` rows, keeping the class balance of `stratify_column` when given."""
+    if len(df) <= max_rows:
+        return df
+    if stratify_column is None or stratify_column not in df.columns:
+        return df.sample(n=max_rows, random_state=random_state)
+
+    fraction = max_rows / len(df)
+    return (
+        df.groupby(stratify_column, group_keys=False, observed=True)
+        .sample(frac=fraction, random_state=random_state)
+    )
+
+def build_profile_html(df: pd.DataFrame, correlations: bool = False, pool_size: int = 0) -> str:
+    """Build the ydata-profiling report with `pool_size` threads (0 = one per core) and render it to HTML."""
+    # Imported here: ydata-profiling takes seconds to import and only the deep report needs it
+    from ydata_profiling import ProfileReport
+
+    options = {}
+    if not correlations:
+        options["correlations"] = {name: {"calculate": False} for name in CORRELATION_TYPES}
+
+    profile = ProfileReport(df, title="EDA Report", explorative=True, pool_size=pool_size, **options)
+    return profile.to_html()
+
+def run_eda(df: pd.DataFrame, dataset_key=None, deep=False, max_rows=EDA_SAMPLE_ROWS,
+            correlations=False, target_column=None):
+    """Render a tiered EDA report inline in Streamlit.
+
+    The quick summary always runs on the full data. The deep ydata-profiling report is
+    optional and built on a stratified sample of at most `max_rows` rows, with correlations
+    opt-in. Both are cached by dataset hash, so reruns reuse them.
+    """
     st.subheader("Exploratory Data Analysis (EDA)")
-    
+
+    if dataset_key is None:
+        dataset_key = cache.dataset_key(df)
+    report_cache = cache.get_cache()
+
+    summary = report_cache.get_or_compute(("eda_summary", dataset_key), lambda: quick_summary(df))
+    st.write(f"**Rows:** {len(df):,} &nbsp; **Columns:** {df.shape[1]:,}")
+    st.dataframe(summary)
+
+    if not deep:
+        return
+
+    if len(df) > max_rows:
+        st.info(f"Deep profile built on a stratified sample of about {max_rows:,} of {len(df):,} rows.")
+
+    def build():
+        sample = stratified_sample(df, max_rows, stratify_column=target_column)
+        # The profile is one of the heaviest runs: it waits for a slot and uses the job's threads
+        memory = int(sample.memory_usage(deep=True).sum()) * RESOURCE_PROFILE_MEMORY_FACTOR
+        with resources.get_manager().acquire("eda", memory) as threads:
+            return build_profile_html(sample, correlations=correlations, pool_size=threads)
+
     with st.spinner("Generating EDA report..."):
-        profile = ProfileReport(df, title="EDA Report", explorative=True)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmp_file:
-            profile.to_file(tmp_file.name)
-            tmp_path = tmp_file.name
-        
-        with open(tmp_path, "r", encoding="utf-8") as f:
-            html_report = f.read()
-            st.components.v1.html(html_report, height=1000, scrolling=True)
-        
-        os.remove(tmp_path)  # Clean up temp file
+        key = ("eda_profile", dataset_key, max_rows, target_column, correlations)
+        html_report = report_cache.get_or_compute(key, build)
+        st.components.v1.html(html_report, height=1000, scrolling=True)
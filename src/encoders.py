@@ -0,0 +1,265 @@
+# src/encoders.py
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+ENCODING_STRATEGIES = ["ordinal", "onehot", "frequency", "target"]
+
+# Code assigned to categories that were not seen during fit (and to missing values)
+UNSEEN_CODE = -1
+
+
+# ================================
+# Category Dictionaries
+# ================================
+def factorize_column(series):
+    """
+    Build a category dictionary for one column in a single hash-based pass.
+
+    Categorical columns reuse their existing codes instead of hashing values.
+
+    Returns:
+        tuple: (codes ndarray with -1 for missing, categories ndarray)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        codes = series.cat.codes.to_numpy()
+        used = np.unique(codes[codes >= 0])
+        if len(used) < len(categories):
+            remap = np.full(len(categories), UNSEEN_CODE, dtype=np.int64)
+            remap[used] = np.arange(len(used))
+            codes = np.where(codes >= 0, remap[np.maximum(codes, 0)], UNSEEN_CODE)
+            categories = categories[used]
+        return codes.astype(np.int64), np.asarray(categories, dtype=object)
+
+    codes, categories = pd.factorize(series, use_na_sentinel=True)
+    return codes.astype(np.int64), np.asarray(categories, dtype=object)
+
+
+def lookup_codes(series, categories):
+    """
+    Map values to codes of a fitted category dictionary; unseen values get UNSEEN_CODE.
+    """
+    index = pd.Index(categories, dtype=object)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Hash only the distinct categories, then gather by the existing codes
+        lookup = index.get_indexer(series.cat.categories.astype(object))
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, lookup[np.maximum(codes, 0)], UNSEEN_CODE).astype(np.int64)
+    return index.get_indexer(series.to_numpy(dtype=object)).astype(np.int64)
+
+
+# ================================
+# Categorical Encoder
+# ================================
+class CategoricalEncoder:
+    """
+    Encode categorical columns with one of several strategies.
+
+    Strategies:
+        ordinal:   one integer code per category; unseen categories get -1
+        onehot:    sparse indicator columns plus one "unseen" column per feature
+        frequency: share of training rows holding the category; unseen -> 0
+        target:    smoothed per-category mean of each target class; unseen -> prior
+
+    Only category dictionaries and small float32 statistics are kept, so the
+    encoder pickles compactly alongside the model.
+
+    `partial_fit` grows the dictionaries chunk by chunk for out-of-core training
+    (all strategies except target).
+    """
+
+    def __init__(self, strategy="ordinal", smoothing=10.0):
+        if strategy not in ENCODING_STRATEGIES:
+            raise ValueError(f"Unsupported encoding strategy: {strategy}. Choose from {ENCODING_STRATEGIES}")
+        self.strategy = strategy
+        self.smoothing = smoothing
+        self.columns = []
+        self.categories = {}
+        self.statistics = {}
+        self.classes = None
+        self.prior = None
+        self.counts = {}
+        self.n_rows = 0
+
+    def fit(self, df, columns, y=None):
+        """
+        Build the category dictionaries (and statistics) for `columns` of `df`.
+
+        Args:
+            df (pd.DataFrame): Training data
+            columns (list): Categorical columns to encode
+            y (array-like): Target labels, required for the target strategy
+
+        Returns:
+            CategoricalEncoder: self
+        """
+        if self.strategy == "target":
+            if y is None:
+                raise ValueError("Target encoding requires the target labels.")
+            y_codes, self.classes = pd.factorize(pd.Series(y), sort=True)
+            n_classes = len(self.classes)
+            self.prior = (np.bincount(y_codes, minlength=n_classes) / len(y_codes)).astype(np.float32)
+
+        self.columns = list(columns)
+        for col in self.columns:
+            codes, categories = factorize_column(df[col])
+            self.categories[col] = categories
+
+            if self.strategy == "frequency":
+                counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+                self.statistics[col] = (counts / max(len(codes), 1)).astype(np.float32)
+
+            elif self.strategy == "target":
+                valid = codes >= 0
+                pairs = codes[valid] * n_classes + y_codes[valid]
+                counts = np.bincount(pairs, minlength=len(categories) * n_classes)
+                counts = counts.reshape(len(categories), n_classes).astype(np.float64)
+                totals = counts.sum(axis=1, keepdims=True)
+                smoothed = (counts + self.smoothing * self.prior) / (totals + self.smoothing)
+                self.statistics[col] = smoothed.astype(np.float32)
+
+        return self
+
+    def partial_fit(self, df, columns):
+        """
+        Extend the category dictionaries (and counts) with one chunk of data.
+
+        New categories are appended, so codes assigned by earlier chunks never change.
+
+        Args:
+            df (pd.DataFrame): One chunk of training data
+            columns (list): Categorical columns to encode (fixed by the first chunk)
+
+        Returns:
+            CategoricalEncoder: self
+        """
+        if self.strategy == "target":
+            raise ValueError("Target encoding cannot be fitted incrementally.")
+
+        if not self.columns:
+            self.columns = list(columns)
+        self.n_rows += len(df)
+
+        for col in self.columns:
+            series = df[col]
+            categories = self.categories.get(col, np.empty(0, dtype=object))
+            codes = lookup_codes(series, categories)
+
+            unseen = (codes == UNSEEN_CODE) & series.notna().to_numpy()
+            if unseen.any():
+                new_codes, new_categories = factorize_column(series[unseen])
+                codes[unseen] = new_codes + len(categories)
+                categories = np.concatenate([categories, new_categories])
+            self.categories[col] = categories
+
+            counts = self.counts.get(col, np.zeros(0, dtype=np.int64))
+            counts = np.pad(counts, (0, len(categories) - len(counts)))
+            counts += np.bincount(codes[codes >= 0], minlength=len(categories))
+            self.counts[col] = counts
+
+            if self.strategy == "frequency":
+                self.statistics[col] = (counts / self.n_rows).astype(np.float32)
+
+        return self
+
+    def output_moments(self):
+        """
+        Return the mean and variance of every output column over the rows seen by `partial_fit`.
+
+        They follow exactly from the category counts, so the scaler never needs
+        another pass over the encoded data.
+
+        Returns:
+            tuple: (means ndarray, variances ndarray) in transform order
+        """
+        n_rows = max(self.n_rows, 1)
+        means, variances = [], []
+        for col in self.columns:
+            counts = self.counts[col].astype(np.float64)
+            n_missing = n_rows - counts.sum()
+
+            if self.strategy == "onehot":
+                # Missing values fall into the extra "unseen" column
+                share = np.append(counts, n_missing) / n_rows
+                means.append(share)
+                variances.append(share * (1 - share))
+                continue
+
+            if self.strategy == "ordinal":
+                values, fill = np.arange(len(counts), dtype=np.float64), float(UNSEEN_CODE)
+            else:
+                values, fill = self.statistics[col].astype(np.float64), 0.0
+            mean = (counts @ values + n_missing * fill) / n_rows
+            variance = (counts @ values ** 2 + n_missing * fill ** 2) / n_rows - mean ** 2
+            means.append([mean])
+            variances.append([max(variance, 0.0)])
+
+        if not means:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(means), np.concatenate(variances)
+
+    def transform(self, df):
+        """
+        Encode the fitted columns of `df`.
+
+        Returns:
+            np.ndarray (float64) for dense strategies, scipy.sparse.csr_matrix for onehot
+        """
+        if self.strategy == "onehot":
+            return self._transform_onehot(df)
+
+        blocks = []
+        for col in self.columns:
+            codes = lookup_codes(df[col], self.categories[col])
+            if self.strategy == "ordinal":
+                blocks.append(codes.astype(np.float64)[:, None])
+            elif self.strategy == "frequency":
+                table = np.append(self.statistics[col], np.float32(0.0))
+                blocks.append(table[codes].astype(np.float64)[:, None])
+            else:
+                table = np.vstack([self.statistics[col], self.prior])
+                blocks.append(self._target_columns(table[codes]))
+
+        if not blocks:
+            return np.empty((len(df), 0), dtype=np.float64)
+        return np.hstack(blocks)
+
+    def _transform_onehot(self, df):
+        n_rows = len(df)
+        blocks = []
+        for col in self.columns:
+            n_categories = len(self.categories[col])
+            codes = lookup_codes(df[col], self.categories[col])
+            # Unseen values go to the extra last column of the block
+            codes = np.where(codes >= 0, codes, n_categories)
+            blocks.append(sp.csr_matrix(
+                (np.ones(n_rows, dtype=np.float64), codes, np.arange(n_rows + 1)),
+                shape=(n_rows, n_categories + 1),
+            ))
+        if not blocks:
+            return sp.csr_matrix((n_rows, 0), dtype=np.float64)
+        return sp.hstack(blocks, format="csr")
+
+    def _target_columns(self, values):
+        # Binary targets need only the probability of the positive class
+        if values.shape[1] == 2:
+            values = values[:, 1:]
+        return values.astype(np.float64)
+
+    def get_feature_names_out(self):
+        """
+        Return the names of the encoded output columns in transform order.
+        """
+        names = []
+        for col in self.columns:
+            if self.strategy == "onehot":
+                names.extend(f"{col}={category}" for category in self.categories[col])
+                names.append(f"{col}=__unseen__")
+            elif self.strategy == "target" and len(self.classes) > 2:
+                names.extend(f"{col}__target_{cls}" for cls in self.classes)
+            else:
+                names.append(col)
+        return names
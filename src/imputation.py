@@ -0,0 +1,150 @@
+# src/imputation.py
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (
+    DEFAULT_RANDOM_STATE, IMPUTATION_BATCH_ROWS, IMPUTATION_SAMPLE_ROWS, MISSING_CATEGORY,
+    MISSING_INDICATOR_SUFFIX,
+)
+
+
+# "drop" removes incomplete rows instead of fitting an Imputer
+IMPUTATION_STRATEGIES = ["drop", "median", "mean", "most_frequent", "constant", "knn", "iterative"]
+
+# Strategies that fit a model on a sample of the numeric columns
+MODEL_STRATEGIES = {"knn", "iterative"}
+
+
+# ================================
+# Fitted Imputer
+# ================================
+class Imputer:
+    """
+    Fill missing values with statistics fitted on the training data.
+
+    Numeric columns are filled with their median, mean, most frequent value or a
+    constant; "knn" and "iterative" fit sklearn's KNNImputer / IterativeImputer
+    on a sample of at most `sample_rows` rows. Categorical columns are filled
+    with their most frequent value, or with MISSING_CATEGORY for "constant".
+    With `add_indicators`, a 0/1 column is added for every column that had
+    missing values during fit.
+
+    `transform` only applies the fitted state, so inference never refits.
+    """
+
+    def __init__(self, strategy="median", fill_value=0, add_indicators=False,
+                 sample_rows=IMPUTATION_SAMPLE_ROWS, random_state=DEFAULT_RANDOM_STATE):
+        if strategy not in IMPUTATION_STRATEGIES or strategy == "drop":
+            raise ValueError(f"Unsupported imputation strategy: {strategy}")
+        self.strategy = strategy
+        self.fill_value = fill_value
+        self.add_indicators = add_indicators
+        self.sample_rows = sample_rows
+        self.random_state = random_state
+        self.statistics = {}
+        self.numeric_columns = []
+        self.indicator_columns = []
+        self.model = None
+        self.n_missing = {}
+
+    def fit(self, df):
+        """
+        Compute fill values for every column of `df`.
+
+        Args:
+            df (pd.DataFrame): Training features
+
+        Returns:
+            Imputer: self
+        """
+        missing = df.isna().sum()
+        self.n_missing = {col: int(count) for col, count in missing.items() if count}
+        self.numeric_columns = list(df.select_dtypes(include=[np.number]).columns)
+        categorical_columns = [col for col in df.columns if col not in self.numeric_columns]
+        numeric = df[self.numeric_columns]
+
+        # Column-wise reductions over the whole numeric block at once
+        if self.strategy == "mean":
+            numeric_fill = numeric.mean()
+        elif self.strategy in ("median", *MODEL_STRATEGIES):
+            # Model strategies fall back to the median for rows the model cannot fill
+            numeric_fill = numeric.median()
+        elif self.strategy == "most_frequent":
+            numeric_fill = numeric.mode().iloc[0] if len(numeric) else pd.Series(dtype=np.float64)
+        else:
+            numeric_fill = pd.Series(self.fill_value, index=self.numeric_columns)
+        # Columns without any observed value get the constant
+        numeric_fill = numeric_fill.reindex(self.numeric_columns).fillna(self.fill_value)
+        self.statistics = {col: value.item() if isinstance(value, np.generic) else value
+                           for col, value in numeric_fill.items()}
+
+        for col in categorical_columns:
+            counts = df[col].value_counts(dropna=True)
+            use_constant = self.strategy == "constant" or counts.empty
+            self.statistics[col] = MISSING_CATEGORY if use_constant else counts.index[0]
+
+        if self.strategy in MODEL_STRATEGIES and self.numeric_columns:
+            self.model = self._fit_model(numeric)
+
+        self.indicator_columns = list(self.n_missing) if self.add_indicators else []
+        return self
+
+    def _fit_model(self, numeric):
+        if self.strategy == "knn":
+            from sklearn.impute import KNNImputer
+
+            model = KNNImputer(keep_empty_features=True)
+        else:
+            from sklearn.experimental import enable_iterative_imputer  # noqa: F401
+            from sklearn.impute import IterativeImputer
+
+            model = IterativeImputer(random_state=self.random_state, keep_empty_features=True)
+
+        if len(numeric) > self.sample_rows:
+            numeric = numeric.sample(n=self.sample_rows, random_state=self.random_state)
+        return model.fit(numeric.to_numpy(dtype=np.float64))
+
+    def transform(self, df):
+        """
+        Fill missing values (and add indicator columns) using the fitted statistics.
+
+        Columns of `df` that were not seen during fit are left untouched.
+
+        Returns:
+            pd.DataFrame: imputed copy of `df`
+        """
+        indicators = {
+            f"{col}{MISSING_INDICATOR_SUFFIX}": df[col].isna().to_numpy(dtype=np.uint8)
+            for col in self.indicator_columns if col in df.columns
+        }
+
+        # Categorical columns need the fill value among their categories
+        additions = {
+            col: df[col].cat.add_categories([value])
+            for col, value in self.statistics.items()
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+            and value not in df[col].cat.categories
+        }
+        out = df.assign(**additions) if additions else df
+
+        if self.model is not None:
+            block = out[self.numeric_columns].to_numpy(dtype=np.float64)
+            rows = np.isnan(block).any(axis=1)
+            if rows.any():
+                # Only rows with a missing numeric value go through the model, in batches
+                # so KNN distance matrices stay at IMPUTATION_BATCH_ROWS x sample_rows
+                incomplete = np.flatnonzero(rows)
+                for start in range(0, len(incomplete), IMPUTATION_BATCH_ROWS):
+                    batch = incomplete[start:start + IMPUTATION_BATCH_ROWS]
+                    block[batch] = self.model.transform(block[batch])
+                out = out.assign(**dict(zip(self.numeric_columns, block.T)))
+
+        out = out.fillna({col: value for col, value in self.statistics.items() if col in out.columns})
+
+        for name, values in indicators.items():
+            out[name] = values
+        return out
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
@@ -0,0 +1,250 @@
+# src/instrumentation.py
+
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.constants import TIMINGS_DIR
+
+
+# ================================
+# Measurements
+# ================================
+def peak_rss_bytes():
+    """
+    Return the peak resident set size of this process in bytes (None where unsupported).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def shape_of(data):
+    """
+    Return {"rows": ..., "cols": ...} for a DataFrame, Series, array or sparse matrix.
+    """
+    shape = getattr(data, "shape", None)
+    if shape is None:
+        return {}
+    return {"rows": int(shape[0]), "cols": int(shape[1]) if len(shape) > 1 else 1}
+
+
+# ================================
+# Stage Timer
+# ================================
+_active_timer = ContextVar("active_stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Record wall time, CPU time, peak RSS growth and data shape of named stages.
+
+    Stages may be nested; `depth` marks nested stages so totals only add up
+    top-level stages. Code deep in the pipeline records into the timer that is
+    active in the current context (see `activate` and the module-level `stage`).
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._started = 0
+
+    @contextmanager
+    def activate(self):
+        token = _active_timer.set(self)
+        try:
+            yield self
+        finally:
+            _active_timer.reset(token)
+
+    @contextmanager
+    def stage(self, name, data=None):
+        """
+        Time the body of a `with` block as stage `name`.
+
+        Yields the record dict, so the body can add the shape of its output
+        with `record.update(shape_of(result))`.
+        """
+        record = {"stage": name, "depth": len(self._stack), "order": self._started, **shape_of(data)}
+        self._started += 1
+        self._stack.append(name)
+        record["path"] = tuple(self._stack)
+        peak_before = peak_rss_bytes()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            self._stack.pop()
+            record["wall_s"] = time.perf_counter() - wall_start
+            record["cpu_s"] = time.process_time() - cpu_start
+            # The peak only grows when this stage pushed memory above every earlier stage
+            record["peak_rss_delta_mb"] = (
+                (peak_rss_bytes() - peak_before) / 1024 ** 2 if peak_before is not None else None
+            )
+            self.records.append(record)
+
+    def summary(self):
+        """
+        Merge repeated runs of a stage under the same parent (e.g. one per streamed chunk), in first-seen order.
+
+        Returns:
+            list[dict]: stage, depth, calls, wall_s, cpu_s, peak_rss_delta_mb, rows, cols
+        """
+        merged = {}
+        # Nested stages finish before their parent, so restore start order first
+        for record in sorted(self.records, key=lambda record: record["order"]):
+            key = record["path"]
+            if key not in merged:
+                merged[key] = {"stage": record["stage"], "depth": record["depth"], "calls": 0,
+                               "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_delta_mb": None}
+            row = merged[key]
+            row["calls"] += 1
+            row["wall_s"] += record["wall_s"]
+            row["cpu_s"] += record["cpu_s"]
+            if record["peak_rss_delta_mb"] is not None:
+                row["peak_rss_delta_mb"] = (row["peak_rss_delta_mb"] or 0.0) + record["peak_rss_delta_mb"]
+            if "rows" in record:
+                row["rows"] = row.get("rows", 0) + record["rows"]
+                row["cols"] = record["cols"]
+
+        for row in merged.values():
+            for field in ("wall_s", "cpu_s", "peak_rss_delta_mb"):
+                if row[field] is not None:
+                    row[field] = round(row[field], 4)
+        return list(merged.values())
+
+
+@contextmanager
+def stage(name, data=None):
+    """
+    Record a stage into the active StageTimer, or do nothing if none is active.
+    """
+    timer = _active_timer.get()
+    if timer is None:
+        yield {}
+        return
+    with timer.stage(name, data) as record:
+        yield record
+
+
+def instrumented(kind):
+    """
+    Decorator for run functions that return a result dict.
+
+    The run is timed by a fresh StageTimer whose summary is added to the result
+    as "timings". The wrapped function accepts an extra `export_timings` keyword
+    ("jsonl" or "prometheus"). Runs called from inside another instrumented run
+    record into the outer timer instead.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, export_timings=None, **kwargs):
+            if _active_timer.get() is not None:
+                return func(*args, **kwargs)
+
+            timer = StageTimer()
+            with timer.activate():
+                result = func(*args, **kwargs)
+            result["timings"] = timer.summary()
+
+            if export_timings:
+                run_name = os.path.basename(result.get("model_path") or result.get("predictions_path") or kind)
+                export_run_timings(result["timings"], kind, run_name, export_timings)
+            return result
+        return wrapper
+    return decorator
+
+
+# ================================
+# Export
+# ================================
+def total_time(timings):
+    """
+    Return the wall time of all top-level stages in seconds.
+    """
+    return round(sum(row["wall_s"] for row in timings if row["depth"] == 0), 4)
+
+
+def to_json_lines(timings, labels=None):
+    """
+    Render stage timings as JSON lines, one object per stage.
+    """
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    return "".join(
+        json.dumps({"timestamp": timestamp, **(labels or {}), **row}) + "\n" for row in timings
+    )
+
+
+PROMETHEUS_METRICS = [
+    ("wall_s", "automl_stage_wall_seconds", "Wall-clock time of a pipeline stage"),
+    ("cpu_s", "automl_stage_cpu_seconds", "CPU time of a pipeline stage"),
+    ("peak_rss_delta_mb", "automl_stage_peak_rss_delta_megabytes", "Peak RSS growth during a pipeline stage"),
+    ("rows", "automl_stage_rows", "Rows processed by a pipeline stage"),
+    ("calls", "automl_stage_calls", "Number of times a pipeline stage ran"),
+]
+
+
+def to_prometheus(timings, labels=None):
+    """
+    Render stage timings in the Prometheus text exposition format.
+    """
+    lines = []
+    for field, metric, help_text in PROMETHEUS_METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for row in timings:
+            if row.get(field) is None:
+                continue
+            all_labels = {**(labels or {}), "stage": row["stage"], "depth": row["depth"]}
+            label_text = ",".join(f'{key}="{value}"' for key, value in all_labels.items())
+            lines.append(f"{metric}{{{label_text}}} {row[field]}")
+    return "\n".join(lines) + "\n"
+
+
+def export_timings(timings, path, fmt="jsonl", labels=None):
+    """
+    Write stage timings to `path`: JSON lines are appended, Prometheus text replaces the file.
+
+    Args:
+        timings (list): StageTimer.summary() rows
+        path (str): output file
+        fmt (str): "jsonl" or "prometheus"
+        labels (dict): extra labels such as the run name
+
+    Returns:
+        str: path
+    """
+    if fmt not in ("jsonl", "prometheus"):
+        raise ValueError(f"Unsupported timings format: {fmt}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if fmt == "jsonl":
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_json_lines(timings, labels))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(to_prometheus(timings, labels))
+    return path
+
+
+def export_run_timings(timings, kind, run_name, fmt, folder=TIMINGS_DIR):
+    """
+    Export the timings of one run.
+
+    JSON lines are appended to `timings.jsonl` as a run history; Prometheus text
+    replaces `<kind>.prom` with the latest run, ready for a textfile collector.
+    """
+    path = os.path.join(folder, "timings.jsonl" if fmt == "jsonl" else f"{kind}.prom")
+    return export_timings(timings, path, fmt, labels={"kind": kind, "run": run_name})
@@ -0,0 +1,373 @@
+# src/jobs.py
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from src import registry, resources
+from src.constants import JOBS_DB_PATH, JOB_MAX_WORKERS, PLOTS_DIR
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when cancellation of its job was requested."""
+
+
+# ================================
+# Persistent Job Store (SQLite)
+# ================================
+class JobStore:
+    """
+    SQLite-backed job table shared by the Streamlit process and the workers.
+
+    Every call opens its own short-lived connection, so the store can be used
+    from any thread or process.
+    """
+
+    def __init__(self, db_path=JOBS_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL,
+                    message TEXT,
+                    params TEXT,
+                    result TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at TEXT,
+                    updated_at TEXT
+                )
+                """
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, kind, params, owner=None):
+        job_id = uuid.uuid4().hex[:12]
+        now = datetime.now().isoformat(timespec="milliseconds")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, progress, message, params, owner, created_at, updated_at) "
+                "VALUES (?, ?, ?, 0, 'Waiting for a worker', ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(params), owner, now, now),
+            )
+        return job_id
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        fields["updated_at"] = datetime.now().isoformat(timespec="milliseconds")
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, owner=None, limit=50):
+        query = "SELECT * FROM jobs"
+        args = ()
+        if owner is not None:
+            query += " WHERE owner = ?"
+            args = (owner,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._connect() as conn:
+            rows = conn.execute(query, (*args, limit)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def request_cancel(self, job_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+
+    def is_cancel_requested(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def mark_interrupted(self):
+        """
+        Fail jobs left queued or running by a previous server process.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'Interrupted by a server restart' "
+                "WHERE status IN (?, ?)",
+                (FAILED, QUEUED, RUNNING),
+            )
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        for key in ("params", "result"):
+            job[key] = json.loads(job[key]) if job[key] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+
+# ================================
+# Job Runners (executed in worker processes)
+# ================================
+PLOT_KEYS = ("confusion_plot", "feature_plot")
+
+
+def _save_plots(output, name, folder=PLOTS_DIR):
+    # Results are stored as JSON, so in-memory PNG plots are written to files
+    os.makedirs(folder, exist_ok=True)
+    for key in PLOT_KEYS:
+        if output.get(key):
+            path = os.path.join(folder, f"{name}_{key}.png")
+            with open(path, "wb") as f:
+                f.write(output[key])
+            output[key] = path
+    return output
+
+
+def _run_train(params, progress_callback):
+    from src import trainer
+
+    if params.pop("train_all", False):
+        output = trainer.train_all_models(progress_callback=progress_callback, **params)
+        return {
+            "leaderboard": output["leaderboard"].to_dict(orient="records"),
+            "model_paths": output["model_paths"],
+            "target_column": output["target_column"],
+            "timings": output["timings"],
+        }
+
+    if params.pop("incremental", False):
+        output = trainer.train_incremental_from_csv(progress_callback=progress_callback, **params)
+    else:
+        output = trainer.train_model_from_csv(progress_callback=progress_callback, **params)
+    keys = ("metrics", "model_path", "confusion_plot", "feature_plot", "target_column", "timings", "run_key",
+            "cached")
+    # Plots of registered runs are already on disk
+    record = registry.get_registry().get(output["run_key"], touch=False)
+    if record is not None:
+        output = output | {key: record["plot_paths"].get(key) for key in PLOT_KEYS}
+    else:
+        output = _save_plots(output, os.path.splitext(os.path.basename(output["model_path"]))[0])
+    return {key: output[key] for key in keys} | {
+        "tuning": output.get("tuning"),
+        "selection": output.get("selection"),
+    }
+
+
+def _run_test(params, progress_callback):
+    from src import tester
+
+    output = tester.test_model_on_csv(progress_callback=progress_callback, **params)
+    return _save_plots(output, os.path.splitext(os.path.basename(output["predictions_path"]))[0])
+
+
+JOB_RUNNERS = {
+    "train": _run_train,
+    "test": _run_test,
+}
+
+
+def _init_worker(runs_root, model_dir):
+    # Spawned workers re-import the constants; save where the app process reads
+    from src import trainer
+
+    registry._registry = registry.RunRegistry(root=runs_root, model_dir=model_dir)
+    trainer.MODEL_DIR = model_dir
+
+
+def _execute_job(db_path, job_id, kind, params):
+    store = JobStore(db_path)
+    if store.is_cancel_requested(job_id):
+        store.update(job_id, status=CANCELLED, message="Cancelled before start")
+        return
+
+    def report(progress, message):
+        # Cancellation is cooperative: it takes effect at the next stage boundary
+        if store.is_cancel_requested(job_id):
+            raise JobCancelled()
+        fields = {"message": message}
+        if progress is not None:
+            fields["progress"] = progress
+        store.update(job_id, **fields)
+
+    store.update(job_id, status=RUNNING, message="Started")
+    try:
+        result = JOB_RUNNERS[kind](dict(params), report)
+    except JobCancelled:
+        store.update(job_id, status=CANCELLED, message="Cancelled")
+    except Exception as exc:
+        store.update(job_id, status=FAILED, error=f"{type(exc).__name__}: {exc}", message="Failed")
+    else:
+        store.update(job_id, status=COMPLETED, progress=1.0, message="Completed", result=result)
+
+
+# ================================
+# Job Manager
+# ================================
+class JobManager:
+    """
+    Submit training and testing runs to a process pool and track them in a JobStore.
+
+    Job state lives in SQLite, so a browser reload (or another session) can
+    reattach to a job by id and read its progress and results.
+
+    Jobs are admitted by this process's ResourceManager before they are handed
+    to a worker, so background jobs share the slots and per-session memory
+    limits of interactive runs. Inside the worker the run only gets its
+    thread budget: the worker's own manager never has a competing run.
+    """
+
+    def __init__(self, db_path=JOBS_DB_PATH, max_workers=JOB_MAX_WORKERS):
+        self.store = JobStore(db_path)
+        self.max_workers = max_workers
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._futures = {}
+
+    def _new_executor(self):
+        runs = registry.get_registry()
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(runs.root, runs.model_dir),
+        )
+
+    def _submit(self, *args):
+        # Returns the executor with the future, to replace it if its worker dies
+        with self._executor_lock:
+            try:
+                return self._executor, self._executor.submit(*args)
+            except BrokenProcessPool:
+                self._executor = self._new_executor()
+                return self._executor, self._executor.submit(*args)
+
+    def _replace_broken_executor(self, broken):
+        with self._executor_lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+    def submit(self, kind, params, owner=None):
+        """
+        Queue a job and return its id.
+
+        Args:
+            kind (str): "train" or "test"
+            params (dict): JSON-serializable keyword arguments for the runner
+            owner (str): optional session identifier
+        """
+        if kind not in JOB_RUNNERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = self.store.create(kind, params, owner)
+        threading.Thread(target=self._dispatch, args=(job_id, kind, params, owner), daemon=True).start()
+        return job_id
+
+    def _dispatch(self, job_id, kind, params, owner):
+        # Holds a resource slot in this process while the job runs in a worker
+        memory = resources.estimate_memory(params["csv_file"], streaming=bool(params.get("chunk_size")))
+
+        def report(progress, message):
+            self.store.update(job_id, message=message)
+
+        try:
+            with resources.get_manager().admit(kind, memory, session=owner, progress_callback=report):
+                if self.store.is_cancel_requested(job_id):
+                    self.store.update(job_id, status=CANCELLED, message="Cancelled before start")
+                    return
+                executor, future = self._submit(_execute_job, self.store.db_path, job_id, kind, params)
+                self._futures[job_id] = future
+                error = future.exception()
+            if error is not None:
+                # The worker died (killed, out of memory, crashed in native code) or the job
+                # could not be sent to it, so nothing recorded the outcome
+                if isinstance(error, BrokenProcessPool):
+                    self._replace_broken_executor(executor)
+                if self.store.get(job_id)["status"] not in FINISHED_STATES:
+                    self.store.update(job_id, status=FAILED, error=f"{type(error).__name__}: {error}",
+                                      message="Failed")
+        except CancelledError:
+            pass  # marked by cancel()
+        except resources.ResourceLimitError as exc:
+            self.store.update(job_id, status=FAILED, error=str(exc), message="Rejected")
+        except Exception as exc:
+            self.store.update(job_id, status=FAILED, error=f"{type(exc).__name__}: {exc}", message="Failed")
+
+    def cancel(self, job_id, owner=None):
+        """
+        Cancel a queued job immediately or ask a running job to stop at its next stage.
+
+        With an `owner`, only jobs submitted by that owner can be cancelled.
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job: {job_id}")
+        if owner is not None and job["owner"] != owner:
+            raise PermissionError(f"Job {job_id} was submitted by another session.")
+        self.store.request_cancel(job_id)
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.update(job_id, status=CANCELLED, message="Cancelled before start")
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def list(self, owner=None, limit=50):
+        """
+        Return the most recent jobs, only those of `owner` if given.
+        """
+        return self.store.list(owner, limit)
+
+    def queue_position(self, job_id):
+        """
+        Return how many queued jobs were submitted before this one (0 = next to run).
+        """
+        queued = [job["id"] for job in reversed(self.store.list(limit=1000)) if job["status"] == QUEUED]
+        return queued.index(job_id) if job_id in queued else None
+
+    def shutdown(self, wait=True):
+        with self._executor_lock:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """
+    Return the process-wide JobManager (created on first use, shared by all sessions).
+
+    Creating it fails the jobs left queued or running by a previous app process.
+    Other JobManager instances (scripts, tests) leave them alone, since they may
+    share the database with a running app.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+            _manager.store.mark_interrupted()
+        return _manager
@@ -0,0 +1,287 @@
+# src/metrics.py
+
+import numpy as np
+import pandas as pd
+
+from src.constants import DEFAULT_RANDOM_STATE, METRICS_BOOTSTRAP_SAMPLES, METRICS_CONFIDENCE_LEVEL
+
+# Metrics that get a bootstrap confidence interval
+INTERVAL_METRICS = ["accuracy", "f1_score", "macro_f1"]
+
+LOG_LOSS_EPS = 1e-15
+
+
+# ================================
+# Label Encoding
+# ================================
+def _sorted_labels(labels):
+    try:
+        return sorted(labels)
+    except TypeError:  # mixed types
+        return sorted(labels, key=str)
+
+
+def _keys(uniques, as_str):
+    values = np.asarray(uniques)
+    if as_str:
+        return [str(value) for value in values]
+    return [value.item() if isinstance(value, np.generic) else value for value in values]
+
+
+def encode_labels(y_true, y_pred, classes=None):
+    """
+    Integer-code true and predicted labels against their sorted union.
+
+    Labels are hashed once per array (pd.factorize); only the distinct values
+    are compared. When one side is numeric and the other is not (e.g. labels
+    read from CSV vs. labels the model was trained on), distinct values are
+    matched by their string form.
+
+    Args:
+        classes (array-like): optional model classes (predict_proba column order)
+
+    Returns:
+        tuple: true codes, predicted codes, labels, class codes (-1 for classes
+        that occur in neither array; None without `classes`)
+    """
+    true_codes, true_uniques = pd.factorize(np.asarray(y_true))
+    pred_codes, pred_uniques = pd.factorize(np.asarray(y_pred))
+    if (true_codes < 0).any() or (pred_codes < 0).any():
+        raise ValueError("Labels contain missing values.")
+
+    as_str = pd.api.types.is_numeric_dtype(true_uniques) != pd.api.types.is_numeric_dtype(pred_uniques)
+    true_keys = _keys(true_uniques, as_str)
+    pred_keys = _keys(pred_uniques, as_str)
+    labels = _sorted_labels(set(true_keys) | set(pred_keys))
+    index = {label: i for i, label in enumerate(labels)}
+
+    true_map = np.array([index[key] for key in true_keys], dtype=np.intp)
+    pred_map = np.array([index[key] for key in pred_keys], dtype=np.intp)
+    class_codes = None
+    if classes is not None:
+        class_codes = np.array([index.get(key, -1) for key in _keys(classes, as_str)], dtype=np.intp)
+    return true_map[true_codes], pred_map[pred_codes], labels, class_codes
+
+
+# ================================
+# Confusion Matrix
+# ================================
+def confusion_matrix_from_codes(true_codes, pred_codes, n_classes):
+    """
+    Count (true, predicted) pairs with a single bincount; true labels are rows.
+    """
+    counts = np.bincount(true_codes * n_classes + pred_codes, minlength=n_classes * n_classes)
+    return counts.reshape(n_classes, n_classes)
+
+
+def confusion_matrix(y_true, y_pred):
+    """
+    Return (confusion matrix, labels); the result can be merged across chunks with `merge_confusion_matrices`.
+    """
+    true_codes, pred_codes, labels, _ = encode_labels(y_true, y_pred)
+    return confusion_matrix_from_codes(true_codes, pred_codes, len(labels)), labels
+
+
+def merge_confusion_matrices(total, part):
+    """
+    Add two (confusion matrix, labels) pairs, aligning their labels. `total` may be None.
+    """
+    if total is None:
+        return part
+    (cm_a, labels_a), (cm_b, labels_b) = total, part
+    if labels_a == labels_b:
+        return cm_a + cm_b, labels_a
+
+    labels = _sorted_labels(set(labels_a) | set(labels_b))
+    index = {label: i for i, label in enumerate(labels)}
+    merged = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    for cm, cm_labels in ((cm_a, labels_a), (cm_b, labels_b)):
+        positions = [index[label] for label in cm_labels]
+        merged[np.ix_(positions, positions)] += np.asarray(cm, dtype=np.int64)
+    return merged, labels
+
+
+# ================================
+# Metrics
+# ================================
+def _divide(numerator, denominator):
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=np.float64), np.asarray(denominator, dtype=np.float64)
+    )
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator > 0)
+
+
+def _metric_arrays(cm):
+    """
+    Compute all confusion-matrix metrics for one matrix (k, k) or a stack of matrices (..., k, k).
+
+    Returns:
+        tuple: (dict of aggregate metrics, dict of per-class arrays)
+    """
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    support = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+    total = support.sum(axis=-1)
+
+    precision = _divide(tp, predicted)
+    recall = _divide(tp, support)
+    f1 = _divide(2 * precision * recall, precision + recall)
+    weights = _divide(support, total[..., None])
+    # Macro averages skip classes absent from both true and predicted labels (e.g. in a bootstrap sample)
+    present = (support + predicted) > 0
+    n_present = present.sum(axis=-1)
+
+    accuracy = _divide(tp.sum(axis=-1), total)
+    aggregates = {
+        "accuracy": accuracy,
+        "precision": (precision * weights).sum(axis=-1),
+        "recall": (recall * weights).sum(axis=-1),
+        "f1_score": (f1 * weights).sum(axis=-1),
+        "macro_precision": _divide((precision * present).sum(axis=-1), n_present),
+        "macro_recall": _divide((recall * present).sum(axis=-1), n_present),
+        "macro_f1": _divide((f1 * present).sum(axis=-1), n_present),
+        # With exactly one label per row, micro precision, recall and F1 all equal accuracy
+        "micro_precision": accuracy,
+        "micro_recall": accuracy,
+        "micro_f1": accuracy,
+    }
+    per_class = {"precision": precision, "recall": recall, "f1_score": f1, "support": support}
+    return aggregates, per_class
+
+
+def bootstrap_confidence_intervals(cm, n_bootstrap=METRICS_BOOTSTRAP_SAMPLES, confidence=METRICS_CONFIDENCE_LEVEL,
+                                   metrics=INTERVAL_METRICS, random_state=DEFAULT_RANDOM_STATE):
+    """
+    Percentile bootstrap intervals of confusion-matrix metrics.
+
+    Resampling rows with replacement only changes how many rows fall into each
+    confusion-matrix cell, so all resamples are drawn at once from a multinomial
+    over the cells: the cost depends on the number of classes, not of rows.
+
+    Returns:
+        dict: {metric: [low, high]}
+    """
+    cm = np.asarray(cm, dtype=np.int64)
+    n = int(cm.sum())
+    if n == 0 or n_bootstrap <= 0:
+        return {}
+
+    rng = np.random.default_rng(random_state)
+    samples = rng.multinomial(n, cm.ravel() / n, size=n_bootstrap).reshape(n_bootstrap, *cm.shape)
+    aggregates, _ = _metric_arrays(samples)
+
+    tail = (1 - confidence) / 2 * 100
+    return {
+        name: [round(float(value), 4) for value in np.percentile(aggregates[name], [tail, 100 - tail])]
+        for name in metrics
+    }
+
+
+def metrics_from_confusion_matrix(cm, labels, n_bootstrap=METRICS_BOOTSTRAP_SAMPLES,
+                                  random_state=DEFAULT_RANDOM_STATE):
+    """
+    Derive every label-based metric from one confusion matrix.
+
+    Returns:
+        dict: weighted accuracy/precision/recall/f1_score, macro_* and micro_* variants,
+        per_class, confidence_intervals, confusion_matrix and labels
+    """
+    cm = np.asarray(cm, dtype=np.int64)
+    aggregates, per_class = _metric_arrays(cm)
+
+    metrics = {name: round(float(value), 4) for name, value in aggregates.items()}
+    metrics["per_class"] = {
+        str(label): {
+            "precision": round(float(per_class["precision"][i]), 4),
+            "recall": round(float(per_class["recall"][i]), 4),
+            "f1_score": round(float(per_class["f1_score"][i]), 4),
+            "support": int(per_class["support"][i]),
+        }
+        for i, label in enumerate(labels)
+    }
+    metrics["confidence_intervals"] = bootstrap_confidence_intervals(cm, n_bootstrap, random_state=random_state)
+    metrics["confusion_matrix"] = cm.tolist()
+    metrics["labels"] = list(labels)
+    return metrics
+
+
+def probability_metrics(true_codes, proba, class_codes):
+    """
+    ROC-AUC (one-vs-rest macro average for multiclass) and log-loss from predicted probabilities.
+
+    Args:
+        true_codes (np.ndarray): true label codes from `encode_labels`
+        proba (array-like): (n_rows, n_classes) probabilities in model class order
+        class_codes (np.ndarray): label code of every probability column
+
+    Returns:
+        dict: roc_auc (None if no class has both positives and negatives), log_loss
+    """
+    from scipy.stats import rankdata
+
+    proba = np.asarray(proba, dtype=np.float64)
+    proba = _divide(proba, proba.sum(axis=1, keepdims=True))
+    n_rows, n_columns = proba.shape
+
+    # Column of each row's true class; -1 if the model never saw that class
+    column_of_label = np.full(max(true_codes.max(initial=-1), class_codes.max(initial=-1)) + 1, -1)
+    known = class_codes >= 0
+    column_of_label[class_codes[known]] = np.arange(n_columns)[known]
+    true_columns = column_of_label[true_codes]
+    has_column = true_columns >= 0
+    rows = np.arange(n_rows)
+
+    p_true = np.zeros(n_rows)
+    p_true[has_column] = proba[rows[has_column], true_columns[has_column]]
+    log_loss = float(-np.log(np.clip(p_true, LOG_LOSS_EPS, 1.0)).mean())
+
+    # Mann-Whitney U statistic of every column at once: AUC = (rank sum of positives - n_pos(n_pos+1)/2) / (n_pos n_neg)
+    ranks = rankdata(proba, axis=0)
+    positives = true_columns[has_column]
+    n_pos = np.bincount(positives, minlength=n_columns)
+    rank_sums = np.bincount(positives, weights=ranks[rows[has_column], positives], minlength=n_columns)
+    n_neg = n_rows - n_pos
+    auc = _divide(rank_sums - n_pos * (n_pos + 1) / 2, n_pos * n_neg)
+    valid = (n_pos > 0) & (n_neg > 0)
+
+    if n_columns == 2:
+        roc_auc = auc[1] if valid[1] else None
+    else:
+        roc_auc = auc[valid].mean() if valid.any() else None
+
+    return {
+        "roc_auc": round(float(roc_auc), 4) if roc_auc is not None else None,
+        "log_loss": round(log_loss, 4),
+    }
+
+
+def classification_metrics(y_true, y_pred, proba=None, classes=None, n_bootstrap=METRICS_BOOTSTRAP_SAMPLES,
+                           random_state=DEFAULT_RANDOM_STATE):
+    """
+    Compute all classification metrics in one pass over the labels.
+
+    Args:
+        y_true, y_pred (array-like): true and predicted labels
+        proba (array-like): optional predicted probabilities (adds roc_auc and log_loss)
+        classes (array-like): class order of the probability columns (model.classes_)
+        n_bootstrap (int): bootstrap resamples for confidence intervals (0 disables them)
+
+    Returns:
+        dict: see `metrics_from_confusion_matrix`, plus roc_auc and log_loss when `proba` is given
+    """
+    true_codes, pred_codes, labels, class_codes = encode_labels(y_true, y_pred, classes)
+    cm = confusion_matrix_from_codes(true_codes, pred_codes, len(labels))
+    metrics = metrics_from_confusion_matrix(cm, labels, n_bootstrap, random_state)
+    if proba is not None:
+        if class_codes is None:
+            raise ValueError("`classes` is required with `proba`.")
+        metrics.update(probability_metrics(true_codes, proba, class_codes))
+    return metrics
+
+
+def scalar_metrics(metrics):
+    """
+    Return only the single-number metrics (e.g. for artifact metadata or a leaderboard row).
+    """
+    return {name: value for name, value in metrics.items() if not isinstance(value, (dict, list))}
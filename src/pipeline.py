@@ -0,0 +1,226 @@
+# src/pipeline.py
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src import instrumentation
+from src.encoders import CategoricalEncoder
+from src.imputation import Imputer
+
+
+# ================================
+# Fitted Preprocessing Pipeline
+# ================================
+class PreprocessingPipeline:
+    """
+    Preprocessing state fitted once on the training data and reused at inference.
+
+    Holds the imputer (unless incomplete rows are dropped), the categorical
+    encoder, the fitted scaler, the feature column order and the training
+    dtypes. `transform` only applies the fitted state, so predictions do not
+    depend on batch size.
+
+    In sparse mode features stay in CSR format end to end and the scaler does
+    not center them, so memory scales with the number of non-zeros.
+
+    With `feature_selection` filters or a `projection` (see FeatureSelector),
+    a selector fitted after the scaler keeps only the informative columns,
+    so the model and every prediction work on the reduced feature set.
+
+    For data larger than memory, `partial_fit` can be called chunk by chunk
+    instead of `fit`; the pipeline is ready to transform after every call.
+    """
+
+    def __init__(self, target_column, encoding="ordinal", sparse=False, imputation="drop",
+                 missing_indicators=False, feature_selection=(), projection=None):
+        self.target_column = target_column
+        self.encoding = encoding
+        self.sparse = sparse
+        self.imputation = imputation
+        self.missing_indicators = missing_indicators
+        self.feature_selection = list(feature_selection)
+        self.projection = projection
+        self.imputer = None
+        self.feature_columns = []
+        self.numeric_columns = []
+        self.categorical_columns = []
+        self.output_columns = []
+        self.dtypes = {}
+        self.encoder = None
+        self.scaler = None
+        self.numeric_scaler = None
+        self.selector = None
+
+    def fit(self, df):
+        """
+        Fit the imputer, the categorical encoder, the scaler and the feature selector
+        on a training DataFrame.
+
+        Args:
+            df (pd.DataFrame): Training data including the target column
+
+        Returns:
+            PreprocessingPipeline: self
+        """
+        from sklearn.preprocessing import StandardScaler
+
+        X, y = self.split_target(df)
+        self.feature_columns = list(X.columns)
+        self.dtypes = {col: str(dtype) for col, dtype in X.dtypes.items()}
+        if self.imputation != "drop":
+            with instrumentation.stage("fit_imputer", X):
+                self.imputer = Imputer(self.imputation, add_indicators=self.missing_indicators).fit(X)
+            X = self._impute(X)
+
+        # Missing-value indicator columns count as numeric columns
+        self.categorical_columns = list(
+            X.select_dtypes(include=["object", "category"]).columns
+        )
+        self.numeric_columns = [col for col in X.columns if col not in self.categorical_columns]
+
+        with instrumentation.stage("fit_encoder", X):
+            self.encoder = CategoricalEncoder(self.encoding).fit(X, self.categorical_columns, y)
+        self.output_columns = self.numeric_columns + self.encoder.get_feature_names_out()
+
+        # Centering would densify sparse features, so only scale in sparse mode
+        self.scaler = StandardScaler(with_mean=not self.sparse)
+        encoded = self._encode(X)
+        with instrumentation.stage("fit_scaler", encoded):
+            self.scaler.fit(encoded)
+
+        if self.feature_selection or self.projection:
+            from src.selection import FeatureSelector
+
+            with instrumentation.stage("fit_selector", encoded):
+                self.selector = FeatureSelector(self.feature_selection, self.projection).fit(
+                    encoded, y, self.output_columns, self.scaler
+                )
+            self.output_columns = self.selector.output_columns
+        return self
+
+    def partial_fit(self, df):
+        """
+        Update the category dictionaries and running scaler statistics with one chunk.
+
+        Column roles and dtypes are taken from the first chunk. Scaling statistics
+        of numeric columns are accumulated with StandardScaler.partial_fit, those of
+        encoded columns are derived from the category counts.
+
+        Args:
+            df (pd.DataFrame): One chunk of training data including the target column
+
+        Returns:
+            PreprocessingPipeline: self
+        """
+        from sklearn.preprocessing import StandardScaler
+
+        if self.imputation != "drop":
+            raise ValueError("partial_fit only supports dropping incomplete rows (imputation='drop').")
+        if self.feature_selection or self.projection:
+            raise ValueError("partial_fit does not support feature selection; it needs the full training data.")
+        X, y = self.split_target(df)
+        if self.encoder is None:
+            self.feature_columns = list(X.columns)
+            self.dtypes = {col: str(dtype) for col, dtype in X.dtypes.items()}
+            self.categorical_columns = list(
+                X.select_dtypes(include=["object", "category"]).columns
+            )
+            self.numeric_columns = [col for col in self.feature_columns if col not in self.categorical_columns]
+            self.encoder = CategoricalEncoder(self.encoding)
+            self.numeric_scaler = StandardScaler()
+
+        self.encoder.partial_fit(X, self.categorical_columns)
+        self.output_columns = self.numeric_columns + self.encoder.get_feature_names_out()
+        if self.numeric_columns:
+            self.numeric_scaler.partial_fit(X[self.numeric_columns].to_numpy(dtype=np.float64))
+
+        self.scaler = self._scaler_from_moments()
+        return self
+
+    def _scaler_from_moments(self):
+        from sklearn.preprocessing import StandardScaler
+
+        encoded_mean, encoded_var = self.encoder.output_moments()
+        if self.numeric_columns:
+            mean = np.concatenate([self.numeric_scaler.mean_, encoded_mean])
+            var = np.concatenate([self.numeric_scaler.var_, encoded_var])
+        else:
+            mean, var = encoded_mean, encoded_var
+
+        # Same attributes StandardScaler.fit would set; constant columns keep a scale of 1
+        scaler = StandardScaler(with_mean=not self.sparse)
+        scale = np.sqrt(var)
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+        scaler.mean_ = mean
+        scaler.var_ = var
+        scaler.scale_ = scale
+        scaler.n_features_in_ = len(mean)
+        scaler.n_samples_seen_ = self.encoder.n_rows
+        return scaler
+
+    def transform(self, df):
+        """
+        Apply the fitted encoding, scaling and feature selection to new data.
+
+        Args:
+            df (pd.DataFrame): Data with at least the training feature columns
+
+        Returns:
+            pd.DataFrame (or scipy.sparse.csr_matrix in sparse mode): Model-ready
+            features in `output_columns` order
+        """
+        if self.scaler is None:
+            raise ValueError("Pipeline must be fitted before calling transform().")
+
+        missing = [col for col in self.feature_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Input data is missing feature columns: {missing}")
+
+        if self.imputer is not None:
+            df = self._impute(df[self.feature_columns])
+        encoded = self._encode(df)
+        with instrumentation.stage("scale", encoded):
+            scaled = self.scaler.transform(encoded)
+        if self.selector is not None:
+            with instrumentation.stage("select", scaled):
+                scaled = self.selector.transform(scaled)
+        if sp.issparse(scaled):
+            return scaled
+        return pd.DataFrame(scaled, columns=self.output_columns, index=df.index)
+
+    def fit_transform(self, df):
+        """
+        Fit the pipeline and return transformed features and the target.
+
+        Returns:
+            tuple: (X, y)
+        """
+        self.fit(df)
+        X, y = self.split_target(df)
+        return self.transform(X), y
+
+    def split_target(self, df):
+        """
+        Split a DataFrame into raw features and the target column.
+        """
+        if self.target_column not in df.columns:
+            raise ValueError(f"Target column '{self.target_column}' not found in data.")
+        return df.drop(columns=[self.target_column]), df[self.target_column]
+
+    def _impute(self, X):
+        with instrumentation.stage("impute", X):
+            return self.imputer.transform(X)
+
+    def _encode(self, X):
+        with instrumentation.stage("encode", X) as record:
+            numeric = X[self.numeric_columns].to_numpy(dtype=np.float64)
+            encoded = self.encoder.transform(X)
+            if self.sparse:
+                encoded = sp.hstack([sp.csr_matrix(numeric), sp.csr_matrix(encoded)], format="csr")
+            else:
+                if sp.issparse(encoded):
+                    encoded = encoded.toarray()
+                encoded = np.hstack([numeric, encoded])
+            record.update(instrumentation.shape_of(encoded))
+        return encoded
@@ -0,0 +1,286 @@
+# src/registry.py
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from src.constants import ARTIFACT_HEADER_SUFFIX, ARTIFACT_VERSION, MODEL_DIR, RUNS_DIR, RUNS_QUOTA_BYTES
+
+RECORD_FILENAME = "run.json"
+
+# PNG file of every plot kept with a run
+PLOT_FILES = {
+    "confusion_plot": "confusion.png",
+    "feature_plot": "features.png",
+}
+
+
+# ================================
+# Run Keys
+# ================================
+def _library_versions():
+    import sklearn
+
+    return {"sklearn": sklearn.__version__, "artifact": ARTIFACT_VERSION}
+
+
+def run_key(dataset_key, config):
+    """
+    Return the content address of a training run.
+
+    Args:
+        dataset_key (str): content hash of the dataset (cache.dataset_key)
+        config (dict): JSON-serializable run configuration (target, preprocessing,
+            model, hyperparameters, ...)
+
+    Returns:
+        str: hex digest; equal inputs and library versions give the same key
+    """
+    payload = {"dataset": dataset_key, "config": config, "versions": _library_versions()}
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def model_filename(model_name, key):
+    """
+    Artifact filename of a registered run; it is derived from the key, so a run is stored once.
+    """
+    return f"{model_name.replace(' ', '_')}_{key[:16]}.pkl"
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _write_json(path, data):
+    # Write to a temporary file first so readers never see a partial record
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+# ================================
+# Run Registry
+# ================================
+class RunRegistry:
+    """
+    Content-addressed store of finished training runs.
+
+    Every run is keyed by `run_key` and has a folder `root/<key>` with its
+    record (metrics, timings, configuration) and plots; the model artifact is
+    saved in `model_dir` under `model_filename`, so the server and the test
+    page find it like any other model. A run is visible once its record is
+    written, and the least recently used runs are evicted when the registry
+    grows beyond `quota_bytes`.
+    """
+
+    def __init__(self, root=RUNS_DIR, model_dir=MODEL_DIR, quota_bytes=RUNS_QUOTA_BYTES):
+        self.root = root
+        self.model_dir = model_dir
+        self.quota_bytes = quota_bytes
+        self._lock = threading.Lock()
+
+    def run_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _record_path(self, key):
+        return os.path.join(self.run_dir(key), RECORD_FILENAME)
+
+    def _read(self, key):
+        try:
+            with open(self._record_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _with_paths(self, record):
+        record["model_path"] = os.path.join(self.model_dir, record["model_file"])
+        record["plot_paths"] = {
+            name: os.path.join(self.run_dir(record["key"]), filename)
+            for name, filename in record.get("plots", {}).items()
+        }
+        return record
+
+    def get(self, key, touch=True):
+        """
+        Return the record of a run (with `model_path` and `plot_paths`), or None if it is
+        not registered or its artifact was removed.
+        """
+        record = self._read(key)
+        if record is None:
+            return None
+        record = self._with_paths(record)
+        if not os.path.exists(record["model_path"]):
+            return None
+        if touch:
+            record["last_used_at"] = datetime.now().isoformat(timespec="milliseconds")
+            self._write_record(record)
+        return record
+
+    def __contains__(self, key):
+        return self.get(key, touch=False) is not None
+
+    def load_plots(self, record):
+        """
+        Return {plot name: PNG bytes} of a run, with None for plots it does not have.
+        """
+        plots = dict.fromkeys(PLOT_FILES)
+        for name, path in record["plot_paths"].items():
+            with open(path, "rb") as f:
+                plots[name] = f.read()
+        return plots
+
+    def _write_record(self, record):
+        stored = {k: v for k, v in record.items() if k not in ("model_path", "plot_paths")}
+        _write_json(self._record_path(record["key"]), stored)
+
+    def register(self, key, config, model_path, plots=None, **fields):
+        """
+        Record a finished run whose artifact was saved at `model_path` (in `model_dir`).
+
+        Args:
+            config (dict): the configuration the key was computed from
+            plots (dict): {plot name: PNG bytes or None} (see PLOT_FILES)
+            **fields: JSON-serializable values stored in the record (metrics, timings, ...)
+
+        Returns:
+            dict: the record (see `get`)
+        """
+        run_dir = self.run_dir(key)
+        os.makedirs(run_dir, exist_ok=True)
+
+        stored_plots = {}
+        for name, png in (plots or {}).items():
+            if png:
+                filename = PLOT_FILES[name]
+                with open(os.path.join(run_dir, filename), "wb") as f:
+                    f.write(png)
+                stored_plots[name] = filename
+
+        now = datetime.now().isoformat(timespec="milliseconds")
+        record = {
+            "key": key,
+            "config": config,
+            **fields,
+            "model_file": os.path.basename(model_path),
+            "plots": stored_plots,
+            "created_at": now,
+            "last_used_at": now,
+        }
+        record["size_bytes"] = (
+            _file_size(model_path) + _file_size(model_path + ARTIFACT_HEADER_SUFFIX)
+            + sum(_file_size(os.path.join(run_dir, filename)) for filename in stored_plots.values())
+        )
+        # The record is written last: a run without one is incomplete and never returned
+        self._write_record(record)
+
+        self.gc(keep={key})
+        return self._with_paths(record)
+
+    def list(self):
+        """
+        Return the records of all complete runs, most recently used first.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        records = [self._read(key) for key in os.listdir(self.root)]
+        records = [self._with_paths(record) for record in records if record is not None]
+        return sorted(records, key=lambda record: record["last_used_at"], reverse=True)
+
+    def compare(self, keys=None):
+        """
+        Tabulate runs side by side: configuration, scalar metrics, timings and size.
+
+        Args:
+            keys (list): runs to compare (defaults to all runs)
+
+        Returns:
+            pd.DataFrame: one row per run, best weighted F1 first
+        """
+        records = self.list()
+        if keys is not None:
+            records = [record for record in records if record["key"] in keys]
+
+        rows = []
+        for record in records:
+            options = {
+                name: value for name, value in record["config"].items()
+                if name not in ("model_name", "target_column")
+            }
+            metrics = {
+                name: value for name, value in record.get("metrics", {}).items()
+                if not isinstance(value, (dict, list))
+            }
+            rows.append({
+                "key": record["key"],
+                "model": record.get("model_name"),
+                "target_column": record.get("target_column"),
+                **options,
+                **metrics,
+                "fit_time_s": record.get("fit_time_s"),
+                "predict_time_s": record.get("predict_time_s"),
+                "size_bytes": record["size_bytes"],
+                "created_at": record["created_at"],
+                "last_used_at": record["last_used_at"],
+            })
+        table = pd.DataFrame(rows)
+        if "f1_score" in table:
+            table = table.sort_values("f1_score", ascending=False, kind="stable").reset_index(drop=True)
+        return table
+
+    def delete(self, key):
+        """
+        Remove a run: its record, plots and model artifact.
+        """
+        record = self._read(key)
+        if record is not None:
+            model_path = os.path.join(self.model_dir, record["model_file"])
+            for path in (model_path, model_path + ARTIFACT_HEADER_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+        shutil.rmtree(self.run_dir(key), ignore_errors=True)
+
+    def total_size(self):
+        return sum(record["size_bytes"] for record in self.list())
+
+    def gc(self, quota_bytes=None, keep=()):
+        """
+        Delete the least recently used runs until the registry fits in `quota_bytes`.
+
+        Args:
+            quota_bytes (int): size limit (defaults to the registry's quota)
+            keep (set): keys that are never evicted (e.g. the run just registered)
+
+        Returns:
+            list: keys of the deleted runs
+        """
+        quota_bytes = self.quota_bytes if quota_bytes is None else quota_bytes
+        with self._lock:
+            records = self.list()
+            total = sum(record["size_bytes"] for record in records)
+            deleted = []
+            for record in reversed(records):
+                if total <= quota_bytes:
+                    break
+                if record["key"] in keep:
+                    continue
+                self.delete(record["key"])
+                total -= record["size_bytes"]
+                deleted.append(record["key"])
+        return deleted
+
+
+_registry = RunRegistry()
+
+
+def get_registry():
+    """
+    Return the process-wide run registry.
+    """
+    return _registry
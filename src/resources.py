@@ -0,0 +1,338 @@
+# src/resources.py
+
+import functools
+import inspect
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+
+from threadpoolctl import threadpool_limits
+
+from src import instrumentation, utils
+from src.constants import (
+    RESOURCE_MAX_CONCURRENT_JOBS, RESOURCE_MEMORY_PER_INPUT_BYTE, RESOURCE_POLL_INTERVAL_S,
+    RESOURCE_QUEUE_TIMEOUT_S, RESOURCE_SESSION_MEMORY_BYTES, RESOURCE_STREAMING_MEMORY_BYTES,
+    RESOURCE_THREADS_PER_JOB,
+)
+
+# Thread budget of the job running in the current context (None outside a job)
+_thread_budget = ContextVar("thread_budget", default=None)
+
+
+class ResourceLimitError(Exception):
+    """Raised when a run cannot be admitted: over the session's memory limit or queued too long."""
+
+
+# ================================
+# Estimates
+# ================================
+def current_session():
+    """
+    Return the id of the Streamlit session running this code, or None outside a session
+    (tests, background job workers, scripts).
+    """
+    # A process that never imported streamlit has no session, and stays free of the import
+    if "streamlit" not in sys.modules:
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def input_size(file):
+    """
+    Return the size in bytes of a file path or uploaded file (0 if unknown).
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return os.path.getsize(file) if os.path.exists(file) else 0
+    if hasattr(file, "size"):
+        return int(file.size)
+    if hasattr(file, "getbuffer"):
+        return file.getbuffer().nbytes
+    return 0
+
+
+def estimate_memory(file, streaming=False):
+    """
+    Estimate the working memory of a run on `file` from its size and format.
+
+    Args:
+        file: path or uploaded file
+        streaming (bool): the run reads the file in chunks, so its memory is bounded
+
+    Returns:
+        int: bytes
+    """
+    factor = RESOURCE_MEMORY_PER_INPUT_BYTE.get(utils.get_file_extension(file), 5)
+    estimate = input_size(file) * factor
+    return min(estimate, RESOURCE_STREAMING_MEMORY_BYTES) if streaming else estimate
+
+
+def n_jobs(default=None):
+    """
+    Return the thread budget of the current job, for estimators' `n_jobs`, or `default` outside a job.
+    """
+    budget = _thread_budget.get()
+    return default if budget is None else budget
+
+
+def _mb(n_bytes):
+    return f"{n_bytes / 1024 ** 2:,.0f} MB"
+
+
+# ================================
+# Resource Manager
+# ================================
+class ResourceManager:
+    """
+    Admission control for heavy runs in the shared Streamlit process.
+
+    Every browser session runs its script in a thread of the same process, so
+    without limits one user's Random Forest or profile report takes every core
+    and all memory. Runs enter through `acquire`:
+
+    - at most `max_concurrent_jobs` runs execute at once; the others wait in
+      arrival order and report their queue position;
+    - a running job gets `threads_per_job` threads: BLAS and OpenMP pools are
+      capped with threadpoolctl and `n_jobs()` returns the budget for
+      estimators and joblib;
+    - a session may reserve at most `session_memory_bytes` of estimated
+      working memory over its running and waiting runs; a run beyond that is
+      rejected with ResourceLimitError before it starts.
+
+    Runs started inside a running job (e.g. a test inside a training run) use
+    the outer job's slot.
+
+    `admit` and `thread_budget` are the two halves of `acquire`: background
+    jobs are admitted in this process and run in a worker process, and
+    generator runs hold their slot across items but apply the (context-local)
+    thread budget only while they compute the next item.
+    """
+
+    def __init__(self, max_concurrent_jobs=RESOURCE_MAX_CONCURRENT_JOBS, threads_per_job=RESOURCE_THREADS_PER_JOB,
+                 session_memory_bytes=RESOURCE_SESSION_MEMORY_BYTES, queue_timeout_s=RESOURCE_QUEUE_TIMEOUT_S):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.threads_per_job = threads_per_job
+        self.session_memory_bytes = session_memory_bytes
+        self.queue_timeout_s = queue_timeout_s
+        self._cond = threading.Condition()
+        self._tickets = itertools.count()
+        self._waiting = []           # tickets in arrival order
+        self._running = {}           # ticket -> kind
+        self._reserved = Counter()   # session -> reserved bytes
+        self._blas_limiter = None
+        self._blas_users = 0
+
+    def status(self):
+        """
+        Return the number of running and waiting runs and the limits.
+        """
+        with self._cond:
+            return {
+                "running": len(self._running),
+                "waiting": len(self._waiting),
+                "max_concurrent_jobs": self.max_concurrent_jobs,
+                "threads_per_job": self.threads_per_job,
+            }
+
+    def session_memory(self, session=None):
+        """
+        Return the bytes reserved by a session's running and waiting runs.
+        """
+        with self._cond:
+            return self._reserved[session]
+
+    @contextmanager
+    def acquire(self, kind, memory_bytes=0, session=None, progress_callback=None):
+        """
+        Wait for a free slot, then run the body with the job's thread budget.
+
+        Args:
+            kind (str): run kind shown in messages ("train", "test", "eda", ...)
+            memory_bytes (int): estimated working memory (see estimate_memory)
+            session: session to charge (defaults to the current Streamlit session)
+            progress_callback: optional callable(progress, message), told the queue position while waiting
+
+        Yields:
+            int: threads available to the job
+
+        Raises:
+            ResourceLimitError: the run exceeds the session's memory limit or waited
+                longer than `queue_timeout_s`
+        """
+        if _thread_budget.get() is not None:
+            yield _thread_budget.get()
+            return
+
+        with self.admit(kind, memory_bytes, session, progress_callback):
+            with self.thread_budget() as threads:
+                yield threads
+
+    @contextmanager
+    def admit(self, kind, memory_bytes=0, session=None, progress_callback=None):
+        """
+        Wait for a free slot and hold it, with the session's memory reservation, until the body ends.
+
+        Unlike `acquire`, the body's threads are not limited (see thread_budget).
+        Arguments and errors are those of `acquire`.
+        """
+        session = current_session() if session is None else session
+        with self._cond:
+            self._reserve(kind, session, memory_bytes)
+            ticket = next(self._tickets)
+            self._waiting.append(ticket)
+        try:
+            with instrumentation.stage("queue"):
+                self._wait_for_slot(ticket, kind, progress_callback)
+            yield
+        finally:
+            with self._cond:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                self._running.pop(ticket, None)
+                self._reserved[session] -= memory_bytes
+                if self._reserved[session] <= 0:
+                    del self._reserved[session]
+                self._cond.notify_all()
+
+    @contextmanager
+    def thread_budget(self):
+        """
+        Run the body with the job's thread budget: BLAS and OpenMP pools are capped
+        and `n_jobs()` returns the budget. The budget is reset when the body ends.
+
+        Yields:
+            int: threads available to the job
+        """
+        self._limit_blas()
+        token = _thread_budget.set(self.threads_per_job)
+        try:
+            with threadpool_limits(self.threads_per_job, user_api="openmp"):
+                yield self.threads_per_job
+        finally:
+            _thread_budget.reset(token)
+            self._restore_blas()
+
+    def _reserve(self, kind, session, memory_bytes):
+        limit = self.session_memory_bytes
+        if memory_bytes > limit:
+            raise ResourceLimitError(
+                f"This {kind} run needs about {_mb(memory_bytes)} of memory, more than the {_mb(limit)} "
+                "allowed per session. Use a smaller file or the chunked (streaming) mode."
+            )
+        used = self._reserved[session]
+        if used + memory_bytes > limit:
+            raise ResourceLimitError(
+                f"Your other runs already reserve {_mb(used)} of the {_mb(limit)} allowed per session; "
+                f"this {kind} run needs {_mb(memory_bytes)} more. Wait for them to finish."
+            )
+        self._reserved[session] += memory_bytes
+
+    def _wait_for_slot(self, ticket, kind, progress_callback):
+        deadline = time.monotonic() + self.queue_timeout_s
+        reported = None
+        while True:
+            with self._cond:
+                position = self._waiting.index(ticket)
+                if position == 0 and len(self._running) < self.max_concurrent_jobs:
+                    self._waiting.pop(0)
+                    self._running[ticket] = kind
+                    # The next run in line may fit as well
+                    self._cond.notify_all()
+                    return
+                if time.monotonic() >= deadline:
+                    raise ResourceLimitError(
+                        f"The server is busy: no slot became free within {self.queue_timeout_s:.0f} s. Try again later."
+                    )
+                if position == reported:
+                    self._cond.wait(RESOURCE_POLL_INTERVAL_S)
+                    continue
+                running = len(self._running)
+            # Reported outside the lock: the callback may update the UI or cancel the job
+            utils.report_progress(
+                progress_callback, None,
+                f"Waiting for a free slot: {position} run(s) ahead, {running} running"
+            )
+            reported = position
+
+    def _limit_blas(self):
+        # BLAS pools are shared by the whole process: capped while any job runs, restored after the last one.
+        # OpenMP limits apply per thread, so every job sets its own (see acquire).
+        with self._cond:
+            if self._blas_users == 0:
+                self._blas_limiter = threadpool_limits(self.threads_per_job, user_api="blas")
+            self._blas_users += 1
+
+    def _restore_blas(self):
+        with self._cond:
+            self._blas_users -= 1
+            if self._blas_users == 0:
+                self._blas_limiter.restore_original_limits()
+                self._blas_limiter = None
+
+
+_manager = ResourceManager()
+
+
+def get_manager():
+    """
+    Return the process-wide resource manager, shared by all sessions.
+    """
+    return _manager
+
+
+def governed(kind):
+    """
+    Decorator for run functions that take the input file as `csv_file`.
+
+    Every call goes through the process-wide manager's `acquire`, charged with
+    the estimated memory of the input file; the queue position is reported to
+    the function's `progress_callback`. Runs with a `chunk_size` argument
+    reserve the bounded memory of a chunked run. Generator functions hold
+    their slot until they are exhausted or closed, but the thread budget only
+    applies while they compute an item: the caller's code between items runs
+    outside the job.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def admission(enter, args, kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            arguments = arguments.arguments
+            return enter(
+                kind, estimate_memory(arguments["csv_file"], streaming=bool(arguments.get("chunk_size"))),
+                progress_callback=arguments.get("progress_callback"),
+            )
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if _thread_budget.get() is not None:
+                    # Started inside a running job: its slot and budget already apply
+                    yield from func(*args, **kwargs)
+                    return
+                manager = get_manager()
+                with admission(manager.admit, args, kwargs):
+                    with closing(func(*args, **kwargs)) as generator:
+                        while True:
+                            with manager.thread_budget():
+                                try:
+                                    item = next(generator)
+                                except StopIteration:
+                                    return
+                            yield item
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with admission(get_manager().acquire, args, kwargs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,166 @@
+# src/scalable.py
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDClassifier
+from sklearn.neighbors import KNeighborsClassifier
+
+from src.constants import (
+    DEFAULT_RANDOM_STATE, KERNEL_APPROX_COMPONENTS, KNN_MAX_REFERENCE_ROWS, KNN_TREE_MAX_FEATURES,
+    SCALABLE_PREDICT_BATCH_ROWS,
+)
+
+# Drop-in replacements for SVC and KNeighborsClassifier on large tables. They
+# accept the same tuning parameters (see tuning.SEARCH_SPACES), so the trainer
+# can swap them in above SCALABLE_MODEL_MIN_ROWS rows.
+
+
+def _as_matrix(X):
+    return X if sp.issparse(X) else np.asarray(X, dtype=np.float64)
+
+
+def _batches(n_rows, batch_rows=SCALABLE_PREDICT_BATCH_ROWS):
+    for start in range(0, n_rows, batch_rows):
+        yield slice(start, start + batch_rows)
+
+
+# ================================
+# Kernel-Approximation SVM
+# ================================
+class ApproximateKernelSVC(ClassifierMixin, BaseEstimator):
+    """
+    Linear SVM on a Nystroem approximation of the kernel.
+
+    Instead of the n x n kernel matrix of SVC (quadratic memory, quadratic to
+    cubic time), rows are mapped onto `n_components` landmark rows and a
+    linear SVM is trained on that map: time and memory grow linearly with the
+    number of rows. kernel="linear" trains the linear SVM on the features directly.
+
+    The linear SVM is fitted by SGD on the hinge loss with alpha = 1 / (C * n_rows),
+    the same objective as SVC's C; on large tables it converges an order of
+    magnitude faster than liblinear. `gamma="scale"` uses the same value as
+    SVC: 1 / (n_features * X.var()).
+    """
+
+    def __init__(self, C=1.0, kernel="rbf", gamma="scale", n_components=KERNEL_APPROX_COMPONENTS,
+                 max_iter=1000, random_state=DEFAULT_RANDOM_STATE):
+        self.C = C
+        self.kernel = kernel
+        self.gamma = gamma
+        self.n_components = n_components
+        self.max_iter = max_iter
+        self.random_state = random_state
+
+    def _gamma(self, X):
+        if self.gamma != "scale":
+            return self.gamma
+        if sp.issparse(X):
+            variance = X.multiply(X).mean() - X.mean() ** 2
+        else:
+            variance = X.var()
+        return 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+
+    def _features(self, X):
+        if self.feature_map_ is None:
+            return X
+        # The kernel map is dense (rows x n_components), so it is built in batches
+        mapped = np.empty((X.shape[0], self.feature_map_.components_.shape[0]), dtype=np.float64)
+        for rows in _batches(X.shape[0]):
+            mapped[rows] = self.feature_map_.transform(X[rows])
+        return mapped
+
+    def fit(self, X, y):
+        X = _as_matrix(X)
+        self.feature_map_ = None
+        if self.kernel != "linear":
+            self.feature_map_ = Nystroem(
+                kernel=self.kernel, gamma=self._gamma(X), n_components=min(self.n_components, X.shape[0]),
+                random_state=self.random_state,
+            ).fit(X)
+        self.svm_ = SGDClassifier(
+            loss="hinge", alpha=1.0 / (self.C * X.shape[0]), max_iter=self.max_iter, random_state=self.random_state
+        )
+        self.svm_.fit(self._features(X), y)
+        self.classes_ = self.svm_.classes_
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def decision_function(self, X):
+        # Scored in batches so the dense kernel map never holds every row at once
+        X = _as_matrix(X)
+        parts = [self.svm_.decision_function(self._features(X[rows])) for rows in _batches(X.shape[0])]
+        return np.concatenate(parts) if parts else self.svm_.decision_function(self._features(X))
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(np.intp)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+# ================================
+# Indexed K-Nearest Neighbors
+# ================================
+def stratified_rows(y, max_rows, random_state=DEFAULT_RANDOM_STATE):
+    """
+    Return sorted indices of at most about `max_rows` rows, keeping every class's share
+    (and at least one row per class).
+    """
+    y = np.asarray(y)
+    if len(y) <= max_rows:
+        return np.arange(len(y))
+    rng = np.random.default_rng(random_state)
+    _, codes = np.unique(y, return_inverse=True)
+    fraction = max_rows / len(y)
+    rows = [
+        rng.choice(class_rows, max(1, round(len(class_rows) * fraction)), replace=False)
+        for class_rows in np.split(np.argsort(codes, kind="stable"), np.cumsum(np.bincount(codes))[:-1])
+    ]
+    return np.sort(np.concatenate(rows))
+
+
+class IndexedKNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """
+    K-nearest neighbors over a bounded reference set with a prebuilt index.
+
+    Exact KNN compares every query with every training row, so prediction
+    time grows with the table. Here at most `max_reference_rows` training rows
+    (a class-stratified sample) are kept. The index is built at fit time and
+    pickled with the model: a KD-tree with at most `tree_max_features`
+    features (where trees beat a scan), a brute-force scan otherwise and for
+    sparse input. Queries run on `n_jobs` cores.
+    """
+
+    def __init__(self, n_neighbors=5, weights="uniform", p=2, max_reference_rows=KNN_MAX_REFERENCE_ROWS,
+                 tree_max_features=KNN_TREE_MAX_FEATURES, leaf_size=40, n_jobs=-1,
+                 random_state=DEFAULT_RANDOM_STATE):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.p = p
+        self.max_reference_rows = max_reference_rows
+        self.tree_max_features = tree_max_features
+        self.leaf_size = leaf_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        X = _as_matrix(X)
+        y = np.asarray(y)
+        rows = stratified_rows(y, self.max_reference_rows, self.random_state)
+        use_tree = not sp.issparse(X) and X.shape[1] <= self.tree_max_features
+
+        self.index_ = KNeighborsClassifier(
+            n_neighbors=self.n_neighbors, weights=self.weights, p=self.p,
+            algorithm="kd_tree" if use_tree else "brute", leaf_size=self.leaf_size, n_jobs=self.n_jobs,
+        ).fit(X[rows], y[rows])
+        self.classes_ = self.index_.classes_
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def predict(self, X):
+        return self.index_.predict(_as_matrix(X))
+
+    def predict_proba(self, X):
+        return self.index_.predict_proba(_as_matrix(X))
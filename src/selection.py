@@ -0,0 +1,231 @@
+# src/selection.py
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from src import resources
+from src.constants import (
+    DEFAULT_RANDOM_STATE, SELECTION_CORRELATION_THRESHOLD, SELECTION_DENSE_MAX_FEATURES,
+    SELECTION_IMPORTANCE_THRESHOLD, SELECTION_IMPORTANCE_TREES, SELECTION_MI_PROBES, SELECTION_PCA_VARIANCE,
+    SELECTION_QUASI_CONSTANT_SHARE, SELECTION_SAMPLE_ROWS, SELECTION_SVD_COMPONENTS,
+)
+
+
+# Filters in their recommended order: the cheap ones shrink the input of the expensive ones
+SELECTION_FILTERS = ["variance", "identifiers", "correlation", "mutual_info", "importance"]
+PROJECTIONS = ["pca", "svd"]
+
+
+# ================================
+# Column Statistics
+# ================================
+def _is_constant(X):
+    # Exact, unlike a variance computed as E[x^2] - E[x]^2
+    if sp.issparse(X):
+        return X.max(axis=0).toarray().ravel() == X.min(axis=0).toarray().ravel()
+    return np.ptp(X, axis=0) == 0
+
+
+def _dominant_share(X):
+    # A value held by at least half of the rows is the median, so comparing with
+    # the median finds the share of the most frequent value where it matters
+    if sp.issparse(X):
+        return 1.0 - X.getnnz(axis=0) / X.shape[0]
+    return (X == np.median(X, axis=0)).mean(axis=0)
+
+
+def _is_identifier(X):
+    # Integer-valued columns with a different value in every row: row IDs, ordinal codes of unique keys
+    integer = (X == np.round(X)).all(axis=0)
+    distinct = np.array([len(np.unique(column)) == len(column) for column in X.T])
+    return integer & distinct
+
+
+def _correlated(X, threshold):
+    # Keep columns in order; drop every later column correlated with a kept one
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.abs(np.nan_to_num(np.corrcoef(X, rowvar=False)))
+    upper = np.triu(corr, k=1) > threshold
+    dropped = np.zeros(X.shape[1], dtype=bool)
+    for j in range(X.shape[1]):
+        if not dropped[j]:
+            dropped |= upper[j]
+    return dropped
+
+
+# ================================
+# Feature Selector
+# ================================
+class FeatureSelector:
+    """
+    Drop uninformative features and optionally project the rest, fitted once on the training split.
+
+    The filters run in the given order on a class-stratified sample of at most
+    `sample_rows` rows of the encoded, unscaled features:
+
+    - "variance": constant and quasi-constant columns (one value in at least
+      `quasi_constant_share` of the rows)
+    - "identifiers": integer columns with a different value in every row
+    - "correlation": the later column of every pair with |Pearson r| above
+      `correlation_threshold`
+    - "mutual_info": columns whose mutual information with the target is no
+      higher than that of the best of `mi_probes` random noise columns
+    - "importance": columns whose random forest `feature_importances_` is below
+      `importance_threshold` times the mean importance
+
+    Filters that need dense columns ("identifiers" on sparse input, and
+    "correlation" or sparse "mutual_info" beyond SELECTION_DENSE_MAX_FEATURES
+    columns) are skipped and listed in the report. No filter removes every
+    column.
+
+    The projection, "pca" (dense features only) or "svd" (TruncatedSVD), is
+    fitted on the scaled kept columns of the sample. `transform` takes scaled
+    features and returns the kept columns, projected.
+    """
+
+    def __init__(self, filters=("variance", "correlation"), projection=None,
+                 quasi_constant_share=SELECTION_QUASI_CONSTANT_SHARE,
+                 correlation_threshold=SELECTION_CORRELATION_THRESHOLD, mi_probes=SELECTION_MI_PROBES,
+                 importance_threshold=SELECTION_IMPORTANCE_THRESHOLD, sample_rows=SELECTION_SAMPLE_ROWS,
+                 random_state=DEFAULT_RANDOM_STATE):
+        unknown = [name for name in filters if name not in SELECTION_FILTERS]
+        if unknown:
+            raise ValueError(f"Unsupported feature selection filters: {unknown}. Allowed: {SELECTION_FILTERS}")
+        if projection is not None and projection not in PROJECTIONS:
+            raise ValueError(f"Unsupported projection '{projection}'. Allowed: {PROJECTIONS}")
+        self.filters = list(filters)
+        self.projection = projection
+        self.quasi_constant_share = quasi_constant_share
+        self.correlation_threshold = correlation_threshold
+        self.mi_probes = mi_probes
+        self.importance_threshold = importance_threshold
+        self.sample_rows = sample_rows
+        self.random_state = random_state
+        self.support = None
+        self.projector = None
+        self.input_columns = []
+        self.output_columns = []
+        self.report = {}
+
+    def fit(self, X, y, feature_names, scaler=None):
+        """
+        Choose the kept columns and fit the projection.
+
+        Args:
+            X (np.ndarray or scipy.sparse matrix): encoded, unscaled training features
+            y (array-like): training target
+            feature_names (list): name of every column of X
+            scaler: fitted scaler applied before `transform` (used to fit the projection)
+
+        Returns:
+            FeatureSelector: self
+        """
+        from src.scalable import stratified_rows
+
+        start = time.perf_counter()
+        y = np.asarray(y)
+        rows = stratified_rows(y, self.sample_rows, self.random_state)
+        sample = X[rows] if sp.issparse(X) else np.asarray(X, dtype=np.float64)[rows]
+        y_sample = y[rows]
+
+        self.input_columns = list(feature_names)
+        kept = np.arange(X.shape[1])
+        dropped, skipped = {}, []
+        for name in self.filters:
+            columns = sample[:, kept]
+            drop = self._filter(name, columns, y_sample)
+            if drop is None:
+                skipped.append(name)
+                continue
+            if drop.all():
+                # Never remove every column: the first one survives
+                drop[0] = False
+            dropped[name] = [self.input_columns[i] for i in kept[drop]]
+            kept = kept[~drop]
+        self.support = kept
+        self.output_columns = [self.input_columns[i] for i in kept]
+
+        if self.projection is not None:
+            projected = sample[:, kept]
+            if scaler is not None:
+                projected = scaler.transform(sample)[:, kept]
+            self.projector = self._fit_projection(projected)
+            n_components = self.projector.components_.shape[0]
+            self.output_columns = [f"{self.projection}_{i}" for i in range(1, n_components + 1)]
+
+        self.report = {
+            "n_features_in": len(self.input_columns),
+            "n_features_out": len(self.output_columns),
+            "dropped": dropped,
+            "skipped": skipped,
+            "projection": self.projection,
+            "explained_variance": (
+                round(float(self.projector.explained_variance_ratio_.sum()), 4) if self.projector is not None else None
+            ),
+            "fit_time_s": round(time.perf_counter() - start, 4),
+        }
+        return self
+
+    def _filter(self, name, X, y):
+        """
+        Return a boolean mask of the columns to drop, or None if the filter cannot run on X.
+        """
+        if name == "variance":
+            return _is_constant(X) | (_dominant_share(X) >= self.quasi_constant_share)
+        if name == "identifiers":
+            return None if sp.issparse(X) else _is_identifier(X)
+        if sp.issparse(X) and name in ("correlation", "mutual_info"):
+            if X.shape[1] > SELECTION_DENSE_MAX_FEATURES:
+                return None
+            X = X.toarray()
+        if name == "correlation":
+            if X.shape[1] > SELECTION_DENSE_MAX_FEATURES:
+                return None
+            return _correlated(X, self.correlation_threshold)
+        if name == "mutual_info":
+            from sklearn.feature_selection import mutual_info_classif
+
+            # Estimates for independent columns are not exactly zero: noise columns scored
+            # alongside the features give the level a useless column reaches on this sample
+            probes = np.random.default_rng(self.random_state).normal(size=(X.shape[0], self.mi_probes))
+            scores = mutual_info_classif(
+                np.hstack([X, probes]), y, discrete_features=False, random_state=self.random_state
+            )
+            return scores[:X.shape[1]] <= scores[X.shape[1]:].max(initial=0.0)
+        # "importance": the importances of a small forest
+        from sklearn.ensemble import RandomForestClassifier
+
+        forest = RandomForestClassifier(
+            n_estimators=SELECTION_IMPORTANCE_TREES, random_state=self.random_state, n_jobs=resources.n_jobs()
+        ).fit(X, y)
+        importances = forest.feature_importances_
+        return importances < self.importance_threshold * importances.mean()
+
+    def _fit_projection(self, X):
+        if self.projection == "pca":
+            if sp.issparse(X):
+                raise ValueError("PCA needs dense features; use the 'svd' projection in sparse mode.")
+            from sklearn.decomposition import PCA
+
+            return PCA(n_components=SELECTION_PCA_VARIANCE, svd_solver="full", random_state=self.random_state).fit(X)
+
+        from sklearn.decomposition import TruncatedSVD
+
+        n_components = max(1, min(SELECTION_SVD_COMPONENTS, X.shape[1] - 1))
+        return TruncatedSVD(n_components=n_components, random_state=self.random_state).fit(X)
+
+    def transform(self, X):
+        """
+        Keep the selected columns of scaled features and apply the projection.
+
+        Returns:
+            np.ndarray or scipy.sparse.csr_matrix (sparse input without projection)
+        """
+        if self.support is None:
+            raise ValueError("FeatureSelector must be fitted before calling transform().")
+        X = X[:, self.support]
+        if self.projector is not None:
+            X = self.projector.transform(X)
+        return X
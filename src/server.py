@@ -0,0 +1,335 @@
+# src/server.py
+
+import argparse
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from src import utils
+from src.constants import (
+    MODEL_DIR, SERVER_HOST, SERVER_MAX_BATCH_SIZE, SERVER_MAX_MODELS, SERVER_MAX_WAIT_MS, SERVER_PORT,
+    SERVER_PREDICT_TIMEOUT_S,
+)
+
+
+class BatcherClosed(RuntimeError):
+    """Raised when a request is submitted to a micro-batcher whose model was evicted."""
+
+
+# ================================
+# Micro-Batching
+# ================================
+class MicroBatcher:
+    """
+    Collect concurrent prediction requests for one model into a single vectorized predict.
+
+    A worker thread takes the first waiting request, then adds every request
+    that is already queued (or arrives within `max_wait_ms`) up to
+    `max_batch_size` rows. A lone request is therefore served without delay,
+    while requests that pile up under load share one transform and predict call.
+    If the shared call fails, every request of the batch is retried on its own,
+    so a malformed request only fails itself.
+
+    After `close` the batcher serves the requests already queued and rejects
+    new ones with BatcherClosed.
+    """
+
+    def __init__(self, artifact, max_batch_size=SERVER_MAX_BATCH_SIZE, max_wait_ms=SERVER_MAX_WAIT_MS):
+        self.model = artifact["model"]
+        self.pipeline = artifact["pipeline"]
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, df):
+        """
+        Queue a DataFrame of records and return a Future resolving to its predictions.
+
+        Raises ValueError if the records lack a feature column of the model.
+        """
+        # Checked per request: in a merged batch missing columns would be filled with NaN
+        missing = [col for col in self.pipeline.feature_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Input data is missing feature columns: {missing}")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise BatcherClosed("The model was unloaded; submit the request again.")
+            self._queue.put((df, future))
+        return future
+
+    def predict(self, df, timeout=SERVER_PREDICT_TIMEOUT_S):
+        return self.submit(df).result(timeout=timeout)
+
+    def close(self):
+        # The stop marker is queued after every accepted request
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+
+    def _collect(self, first):
+        batch = [first]
+        rows = len(first[0])
+        while rows < self.max_batch_size:
+            try:
+                item = self._queue.get(timeout=self.max_wait) if self.max_wait else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            frames = [df for df, _ in batch]
+            try:
+                combined = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+                predictions = self._predict(combined)
+            except Exception as exc:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    continue
+                # Find the faulty requests: the others still get their predictions
+                for df, future in batch:
+                    try:
+                        future.set_result(self._predict(df))
+                    except Exception as request_exc:
+                        future.set_exception(request_exc)
+                continue
+
+            start = 0
+            for df, future in batch:
+                future.set_result(predictions[start:start + len(df)])
+                start += len(df)
+
+    def _predict(self, df):
+        return self.model.predict(self.pipeline.transform(df))
+
+
+# ================================
+# Warm Model Registry
+# ================================
+class ModelRegistry:
+    """
+    Load model artifacts from `model_dir` on first use and keep the most
+    recently used ones warm, each with its own micro-batcher.
+
+    Artifacts are loaded outside the registry lock, so loading a cold model
+    does not hold up requests to warm ones; concurrent requests for the same
+    cold model wait for one load.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, max_models=SERVER_MAX_MODELS,
+                 max_batch_size=SERVER_MAX_BATCH_SIZE, max_wait_ms=SERVER_MAX_WAIT_MS):
+        self.model_dir = model_dir
+        self.max_models = max_models
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._batchers = OrderedDict()
+        self._loading = {}  # model name -> lock held while its artifact loads
+        self._lock = threading.Lock()
+
+    def list_models(self):
+        if not os.path.isdir(self.model_dir):
+            return []
+        return sorted(name for name in os.listdir(self.model_dir) if name.endswith(".pkl"))
+
+    def get(self, model_name):
+        """
+        Return the micro-batcher of a model, loading the artifact if it is not warm.
+        """
+        # Only artifacts listed by list_models: no paths, directories or other files
+        if os.path.basename(model_name) != model_name or not model_name.endswith(".pkl"):
+            raise ValueError(f"Invalid model name: {model_name}")
+
+        batcher = self._warm(model_name)
+        if batcher is not None:
+            return batcher
+
+        with self._lock:
+            loading = self._loading.setdefault(model_name, threading.Lock())
+        with loading:
+            batcher = self._warm(model_name)
+            if batcher is not None:
+                return batcher
+            try:
+                # Memory-map large arrays so several server processes share one copy
+                artifact = utils.load_artifact(os.path.join(self.model_dir, model_name), mmap_mode="r")
+                batcher = MicroBatcher(artifact, self.max_batch_size, self.max_wait_ms)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(model_name, None)
+                raise
+
+            with self._lock:
+                self._loading.pop(model_name, None)
+                self._batchers[model_name] = batcher
+                evicted = []
+                while len(self._batchers) > self.max_models:
+                    evicted.append(self._batchers.popitem(last=False)[1])
+            for old in evicted:
+                old.close()
+            return batcher
+
+    def _warm(self, model_name):
+        with self._lock:
+            if model_name in self._batchers:
+                self._batchers.move_to_end(model_name)
+                return self._batchers[model_name]
+        return None
+
+    def predict(self, model_name, df, timeout=SERVER_PREDICT_TIMEOUT_S):
+        """
+        Predict records with a model, reloading it if it is evicted while the request is submitted.
+        """
+        while True:
+            try:
+                future = self.get(model_name).submit(df)
+            except BatcherClosed:
+                continue
+            return future.result(timeout=timeout)
+
+    def warm_models(self):
+        with self._lock:
+            return list(self._batchers)
+
+
+# ================================
+# HTTP/JSON Endpoint
+# ================================
+def parse_records(payload):
+    """
+    Turn a JSON payload into a DataFrame of records.
+
+    Accepts a single record ({"feature": value, ...}), a list of records, or an
+    object with a "records" list or a "record" object.
+    """
+    if isinstance(payload, dict) and "records" in payload:
+        payload = payload["records"]
+    elif isinstance(payload, dict) and "record" in payload:
+        payload = payload["record"]
+
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list) or not payload or not all(isinstance(r, dict) for r in payload):
+        raise ValueError("Expected a record object or a non-empty list of record objects.")
+    return pd.DataFrame.from_records(payload)
+
+
+def make_handler(registry):
+    """
+    Build a request handler class bound to a model registry.
+    """
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "warm_models": registry.warm_models()})
+            elif self.path == "/models":
+                self._send(200, {"models": registry.list_models()})
+            else:
+                self._send(404, {"error": f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            prefix = "/predict/"
+            if not self.path.startswith(prefix):
+                self._send(404, {"error": f"Unknown path: {self.path}"})
+                return
+
+            model_name = self.path[len(prefix):]
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                records = parse_records(json.loads(self.rfile.read(length) or b"null"))
+                registry.get(model_name)
+            except FileNotFoundError as exc:
+                self._send(404, {"error": str(exc)})
+                return
+            except ValueError as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            except Exception as exc:
+                self._send(500, {"error": f"Could not load model {model_name}: {exc}"})
+                return
+
+            try:
+                predictions = registry.predict(model_name, records)
+            except ValueError as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            except TimeoutError:
+                self._send(503, {"error": "Prediction timed out; the server is overloaded."})
+                return
+            except Exception as exc:
+                self._send(500, {"error": str(exc)})
+                return
+            self._send(200, {"model": model_name, "predictions": predictions.tolist()})
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # Per-request logging would dominate single-row latency
+            pass
+
+    return PredictionHandler
+
+
+def create_server(host=SERVER_HOST, port=SERVER_PORT, registry=None):
+    """
+    Create (but do not start) the scoring HTTP server.
+    """
+    registry = registry or ModelRegistry()
+    server = ThreadingHTTPServer((host, port), make_handler(registry))
+    server.daemon_threads = True
+    server.registry = registry
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve trained models over HTTP/JSON.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--max-models", type=int, default=SERVER_MAX_MODELS)
+    parser.add_argument("--max-batch-size", type=int, default=SERVER_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SERVER_MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.model_dir, args.max_models, args.max_batch_size, args.max_wait_ms)
+    server = create_server(args.host, args.port, registry)
+    print(f"Serving models from {args.model_dir} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
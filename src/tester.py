@@ -2,79 +2,216 @@
 
 import os
 import pandas as pd
-from src import utils
+from src import instrumentation, metrics as metrics_engine, resources, utils
+from src.constants import DEFAULT_CHUNK_SIZE, PREDICTIONS_DIR
 from src.visualizer import plot_confusion_matrix
+from src.writer import PredictionWriter, prediction_filename
 
 
 # ================================
 # Main Testing Function
 # ================================
-def test_model_on_csv(csv_file, model_path, target_column=None):
+@instrumentation.instrumented("test")
+@resources.governed("test")
+def test_model_on_csv(csv_file, model_path, target_column=None, chunk_size=None, progress_callback=None,
+                      output_format="csv", output_columns="all", key_column=None, probabilities=False):
     """
     Load a trained model and run predictions on new data.
 
     Args:
         csv_file: path or uploaded file
-        model_path: trained model .pkl path
+        model_path: trained model artifact (.pkl) path
         target_column: (optional) column name if true labels are present
+        chunk_size: (optional) stream the CSV in chunks of this many rows
+        progress_callback: (optional) callable(progress, message) called between stages
+        output_format: "csv", "parquet" or "arrow" (Arrow IPC) predictions file
+        output_columns: "all" to keep the input columns, "key" for `key_column`
+            (or the input row number) and the predictions only
+        key_column: (optional) input column identifying rows with output_columns="key"
+        probabilities: also write one `proba_<class>` column per class (models with predict_proba)
+        export_timings: (optional) "jsonl" or "prometheus" to also write stage timings to TIMINGS_DIR
 
     Returns:
-        dict: predictions, metrics (optional), confusion matrix path (optional)
+        dict: predictions file, metrics (optional), confusion matrix PNG (optional), per-stage timings
     """
+    if chunk_size:
+        return test_model_on_csv_streaming(
+            csv_file, model_path, target_column, chunk_size, progress_callback,
+            output_format, output_columns, key_column, probabilities,
+        )
 
-    # Load model
-    model = utils.load_model(model_path)
+    utils.report_progress(progress_callback, 0.0, "Loading model and data")
+
+    # Load model and its fitted preprocessing pipeline once
+    with instrumentation.stage("load_model"):
+        artifact = utils.load_artifact(model_path)
+    model = artifact["model"]
+    pipeline = artifact["pipeline"]
 
     # Load and preprocess CSV
-    df = utils.load_csv(csv_file)
-    df = utils.handle_missing_values(df)
-
-    # Inference target if available
-    has_target = False
-    if target_column and target_column in df.columns:
-        has_target = True
-    elif not target_column:
-        inferred = utils.infer_target_column(df)
-        if inferred in df.columns:
-            target_column = inferred
-            has_target = True
-
-    if has_target:
-        X = df.drop(columns=[target_column])
-        y_true = df[target_column]
-    else:
-        X = df
-        y_true = None
-
-    # Encode and scale
-    df_encoded, _ = utils.encode_categorical_columns(X)
-    X_scaled, _ = utils.scale_numeric_columns(df_encoded)
+    with instrumentation.stage("load") as record:
+        df = utils.load_data(csv_file)
+        record.update(instrumentation.shape_of(df))
+    with instrumentation.stage("handle_missing_values", df):
+        df = _handle_missing_values(df, pipeline)
+
+    # Use the training target column when the test data contains it
+    if not target_column:
+        target_column = pipeline.target_column
+    has_target = target_column in df.columns
+    y_true = df[target_column] if has_target else None
+
+    # Apply the fitted encoders and scaler (no refitting at test time)
+    with instrumentation.stage("transform", df):
+        X = pipeline.transform(df)
 
     # Predict
-    predictions = model.predict(X_scaled)
+    utils.report_progress(progress_callback, 0.5, "Predicting")
+    with instrumentation.stage("predict", X):
+        predictions = model.predict(X)
+        proba = _predict_proba(model, X, probabilities)
 
-    # Save predictions
-    pred_df = df.copy()
-    pred_df["Prediction"] = predictions
-    pred_filename = utils.get_unique_filename("predictions", ".csv")
-    pred_path = utils.save_dataframe(pred_df, pred_filename)
+    # Save predictions next to the input rows, without copying them
+    with instrumentation.stage("save", df):
+        pred_path = os.path.join(PREDICTIONS_DIR, prediction_filename(output_format))
+        with PredictionWriter(pred_path, output_format, output_columns, key_column) as writer:
+            writer.write(df, predictions, proba, _classes(model, proba))
 
     # Evaluate (if true labels available)
     metrics = None
-    confusion_plot_path = None
-    if has_target:
-        y_true = y_true.astype(str)
-        predictions = predictions.astype(str)
-        metrics = utils.get_classification_metrics(y_true, predictions)
+    confusion_plot = None
+    if has_target and y_true.notna().any():
+        labelled = y_true.notna().to_numpy()
+        with instrumentation.stage("metrics", df):
+            metrics = metrics_engine.classification_metrics(
+                y_true[labelled], predictions[labelled],
+                proba=None if proba is None else proba[labelled], classes=_classes(model, proba),
+            )
+        with instrumentation.stage("plot"):
+            confusion_plot = plot_confusion_matrix(metrics["confusion_matrix"], metrics["labels"])
 
-        plots_dir = "outputs/plots"
-        os.makedirs(plots_dir, exist_ok=True)
-        confusion_plot_path = os.path.join(plots_dir, f"{pred_filename}_confusion.png")
-        plot_confusion_matrix(y_true, predictions, save_path=confusion_plot_path)
+    utils.report_progress(progress_callback, 1.0, "Testing completed")
 
     # Return results
     return {
-        "predictions_csv": pred_path,
+        "predictions_path": pred_path,
+        "predictions_format": output_format,
+        "probabilities": proba is not None,
+        "metrics": metrics,
+        "confusion_plot": confusion_plot,
+    }
+
+
+def _predict_proba(model, X, probabilities):
+    # Models without probability estimates (e.g. SVC without probability=True) write predictions only
+    if probabilities and hasattr(model, "predict_proba"):
+        return model.predict_proba(X)
+    return None
+
+
+def _classes(model, proba):
+    return None if proba is None else model.classes_
+
+
+def _handle_missing_values(df, pipeline):
+    # Pipelines with a fitted imputer fill missing features themselves, so no row is dropped
+    if pipeline.imputer is not None:
+        return df
+    return utils.handle_missing_values(df)
+
+
+# ================================
+# Streaming Testing Function
+# ================================
+@instrumentation.instrumented("test")
+@resources.governed("test")
+def test_model_on_csv_streaming(csv_file, model_path, target_column=None,
+                                chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None,
+                                output_format="csv", output_columns="all", key_column=None,
+                                probabilities=False):
+    """
+    Run predictions chunk by chunk so memory depends on `chunk_size`, not file size.
+
+    Predictions are appended to the output file after every chunk and the
+    confusion matrix is accumulated across chunks. Probabilities are written
+    but not scored: ROC-AUC needs every row's scores at once.
+
+    Args:
+        csv_file: path or uploaded file
+        model_path: trained model artifact (.pkl) path
+        target_column: (optional) column name if true labels are present
+        chunk_size: number of rows per chunk
+        progress_callback: (optional) callable(progress, message) called after every chunk
+        output_format, output_columns, key_column, probabilities: see `test_model_on_csv`
+
+    Returns:
+        dict: predictions file, metrics (optional), confusion matrix PNG (optional), per-stage timings
+    """
+    with instrumentation.stage("load_model"):
+        artifact = utils.load_artifact(model_path)
+    model = artifact["model"]
+    pipeline = artifact["pipeline"]
+
+    if not target_column:
+        target_column = pipeline.target_column
+
+    pred_path = os.path.join(PREDICTIONS_DIR, prediction_filename(output_format))
+
+    confusion = None
+    first_chunk = True
+    rows_done = 0
+    chunks = utils.iter_chunks(csv_file, chunk_size)
+    with PredictionWriter(pred_path, output_format, output_columns, key_column) as writer:
+        while True:
+            with instrumentation.stage("load") as record:
+                chunk = next(chunks, None)
+                record.update(instrumentation.shape_of(chunk))
+            if chunk is None:
+                break
+
+            # Number rows across chunks, so the row key survives dropped rows
+            chunk.index = pd.RangeIndex(rows_done, rows_done + len(chunk))
+            rows_done += len(chunk)
+            with instrumentation.stage("handle_missing_values", chunk):
+                chunk = _handle_missing_values(chunk, pipeline)
+            if chunk.empty:
+                continue
+
+            with instrumentation.stage("transform", chunk):
+                X = pipeline.transform(chunk)
+            with instrumentation.stage("predict", X):
+                predictions = model.predict(X)
+                proba = _predict_proba(model, X, probabilities)
+
+            if target_column in chunk.columns and chunk[target_column].notna().any():
+                labelled = chunk[target_column].notna().to_numpy()
+                with instrumentation.stage("metrics", chunk):
+                    confusion = metrics_engine.merge_confusion_matrices(
+                        confusion,
+                        metrics_engine.confusion_matrix(chunk[target_column][labelled], predictions[labelled]),
+                    )
+
+            with instrumentation.stage("save", chunk):
+                writer.write(chunk, predictions, proba, _classes(model, proba))
+            first_chunk = False
+            utils.report_progress(progress_callback, None, f"Scored {rows_done:,} rows")
+
+    if first_chunk:
+        raise ValueError("No rows left to predict after removing missing values.")
+
+    metrics = None
+    confusion_plot = None
+    if confusion is not None:
+        metrics = metrics_engine.metrics_from_confusion_matrix(*confusion)
+        with instrumentation.stage("plot"):
+            confusion_plot = plot_confusion_matrix(metrics["confusion_matrix"], metrics["labels"])
+
+    utils.report_progress(progress_callback, 1.0, "Testing completed")
+
+    return {
+        "predictions_path": pred_path,
+        "predictions_format": output_format,
+        "probabilities": probabilities and hasattr(model, "predict_proba"),
         "metrics": metrics,
-        "confusion_plot": confusion_plot_path,
+        "confusion_plot": confusion_plot,
     }
@@ -1,95 +1,949 @@
 # src/trainer.py
 
+import itertools
 import os
+import time
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC
+import scipy.sparse as sp
+from joblib import Parallel, delayed
 
-from sklearn.model_selection import train_test_split
-
-from src import utils
+from src import cache, instrumentation, metrics as metrics_engine, registry, resources, utils
+from src.constants import (
+    ARTIFACT_COMPRESSION, CLASSIFICATION_MODELS, DEFAULT_CHUNK_SIZE, DEFAULT_RANDOM_STATE, DEFAULT_TEST_SIZE,
+    MODEL_DIR, MODEL_ENGINES, PROGRESSIVE_FRACTIONS, PROGRESSIVE_MIN_GAIN, PROGRESSIVE_MIN_ROWS,
+    SCALABLE_MODEL_MAPPING, SCALABLE_MODEL_MIN_ROWS, SKLEARN_MODEL_MAPPING, TUNING_TIME_BUDGET_S,
+)
+from src.pipeline import PreprocessingPipeline
 from src.visualizer import plot_confusion_matrix, plot_feature_importance
 
 
 # ================================
 # Supported Models Dictionary
 # ================================
-SUPPORTED_MODELS = {
-    "Random Forest": RandomForestClassifier,
-    "Logistic Regression": LogisticRegression,
-    "Decision Tree": DecisionTreeClassifier,
-    "Support Vector Machine": SVC,
+# Estimator classes are imported on first lookup, so importing the trainer
+# (and starting the app) does not pay for every sklearn submodule
+SUPPORTED_MODELS = utils.LazyClassMapping({
+    name: SKLEARN_MODEL_MAPPING[code] for name, code in CLASSIFICATION_MODELS.items()
+})
+
+# Variants whose cost grows linearly with the rows, swapped in for large tables
+SCALABLE_MODELS = utils.LazyClassMapping({
+    name: SCALABLE_MODEL_MAPPING[code] for name, code in CLASSIFICATION_MODELS.items()
+    if code in SCALABLE_MODEL_MAPPING
+})
+
+# Models whose fit/predict accept scipy.sparse CSR input
+SPARSE_SUPPORTED_MODELS = {
+    "Random Forest",
+    "Logistic Regression",
+    "Decision Tree",
+    "Support Vector Machine",
+    "K-Nearest Neighbors",
+}
+
+# Models trained out of core with partial_fit, one chunk at a time
+INCREMENTAL_MODELS = utils.LazyClassMapping({
+    "SGD Classifier": "sklearn.linear_model.SGDClassifier",
+    "Naive Bayes": "sklearn.naive_bayes.GaussianNB",
+})
+
+INCREMENTAL_MODEL_PARAMS = {
+    "SGD Classifier": {"loss": "log_loss", "random_state": DEFAULT_RANDOM_STATE},
+}
+
+SPARSE_INCREMENTAL_MODELS = {
+    "SGD Classifier",
 }
 
 
+def check_model_name(model_name, sparse=False):
+    """
+    Validate that a model is supported (and accepts sparse input in sparse mode).
+    """
+    if model_name not in SUPPORTED_MODELS:
+        raise ValueError(f"Unsupported model: {model_name}")
+    if sparse and model_name not in SPARSE_SUPPORTED_MODELS:
+        raise ValueError(f"Model '{model_name}' does not support sparse input.")
+
+
+def resolve_model_class(model_name, n_rows, engine="auto"):
+    """
+    Pick the exact estimator or its scalable variant (see SCALABLE_MODELS).
+
+    Args:
+        n_rows (int): number of training rows
+        engine (str): "exact", "scalable", or "auto" to use the scalable variant
+            from SCALABLE_MODEL_MIN_ROWS training rows on
+
+    Returns:
+        tuple: (estimator class, engine used: "exact" or "scalable")
+    """
+    if engine not in MODEL_ENGINES:
+        raise ValueError(f"Unsupported engine: {engine}")
+    scalable = engine == "scalable" or (engine == "auto" and n_rows >= SCALABLE_MODEL_MIN_ROWS)
+    if scalable and model_name in SCALABLE_MODELS:
+        return SCALABLE_MODELS[model_name], "scalable"
+    return SUPPORTED_MODELS[model_name], "exact"
+
+
 # ================================
-# Main Training Function
+# Shared Training Steps
 # ================================
-def train_model_from_csv(csv_file, target_column=None, model_name="Random Forest"):
+def prepare_training_data(csv_file, target_column=None, encoding="ordinal", sparse=False, imputation="drop",
+                          missing_indicators=False, feature_selection=(), projection=None):
     """
-    Full pipeline: Load -> Preprocess -> Train -> Evaluate -> Save
+    Load, clean, preprocess and split the data once so it can be reused by several models.
+
+    Results are cached by dataset content hash, target column and preprocessing
+    options, so Streamlit reruns on the same upload skip parsing and preprocessing.
+    In sparse mode X_train and X_test are CSR matrices.
+
+    With imputation="drop" incomplete rows are removed. Any other strategy of
+    imputation.IMPUTATION_STRATEGIES only drops rows without a target; missing
+    features are filled by an imputer fitted on the training split and saved
+    in the pipeline.
+
+    `feature_selection` filters and a `projection` (see selection.FeatureSelector)
+    are fitted on the training split and saved in the pipeline, so X_train,
+    X_test and later predictions only carry the kept features.
 
     Returns:
-        dict: metrics, model_path, plot paths, and label encoders
+        dict: X_train, X_test, y_train, y_test, feature_names, pipeline, target_column
     """
+    key = ("training_data", cache.dataset_key(csv_file), target_column, encoding, sparse, imputation,
+           missing_indicators, tuple(feature_selection), projection)
+    with instrumentation.stage("prepare_data") as record:
+        data = cache.get_cache().get_or_compute(
+            key, lambda: _prepare_training_data(
+                csv_file, target_column, encoding, sparse, imputation, missing_indicators, feature_selection,
+                projection,
+            )
+        )
+        record.update(instrumentation.shape_of(data["X_train"]))
+    return data
+
 
+def _prepare_training_data(csv_file, target_column, encoding, sparse, imputation, missing_indicators,
+                           feature_selection=(), projection=None):
     # Load and clean the data
-    df = utils.load_csv(csv_file)
-    df = utils.handle_missing_values(df)
+    with instrumentation.stage("load") as record:
+        df = cache.load_dataframe(csv_file)
+        record.update(instrumentation.shape_of(df))
 
     # Auto-infer target column if not provided
     if not target_column:
         target_column = utils.infer_target_column(df)
 
-    # Encode categorical features
-    df_encoded, label_encoders = utils.encode_categorical_columns(df)
+    with instrumentation.stage("handle_missing_values", df):
+        if imputation == "drop":
+            df = utils.handle_missing_values(df)
+        else:
+            # Features are imputed by the pipeline; rows without a label cannot be used
+            df = df.dropna(subset=[target_column])
+
+    from sklearn.model_selection import train_test_split
 
-    # Split data
-    X, y = utils.split_features_target(df_encoded, target_column)
-    X, scaler = utils.scale_numeric_columns(X)
+    with instrumentation.stage("split", df):
+        train_df, test_df = train_test_split(df, test_size=DEFAULT_TEST_SIZE, random_state=DEFAULT_RANDOM_STATE)
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+    # Fit encoders and scaler on the training split only; the same pipeline
+    # is reused for the held-out split and at test time
+    pipeline = PreprocessingPipeline(
+        target_column, encoding=encoding, sparse=sparse, imputation=imputation,
+        missing_indicators=missing_indicators, feature_selection=feature_selection, projection=projection,
     )
+    with instrumentation.stage("fit_pipeline", train_df):
+        pipeline.fit(train_df)
+    with instrumentation.stage("transform", df):
+        X_train, y_train = pipeline.split_target(train_df)
+        X_train = pipeline.transform(X_train)
+        X_test, y_test = pipeline.split_target(test_df)
+        X_test = pipeline.transform(X_test)
 
-    # Select model
-    if model_name not in SUPPORTED_MODELS:
-        raise ValueError(f"Unsupported model: {model_name}")
-    model_class = SUPPORTED_MODELS[model_name]
-    model = model_class()
+    return {
+        "X_train": X_train,
+        "X_test": X_test,
+        "y_train": y_train,
+        "y_test": y_test,
+        "feature_names": pipeline.output_columns,
+        "pipeline": pipeline,
+        "target_column": target_column,
+    }
+
+
+def fit_and_evaluate(model_name, X_train, y_train, X_test, y_test, params=None, engine="auto", n_jobs=None):
+    """
+    Fit one supported model and evaluate it on the held-out split.
+
+    Args:
+        params (dict): optional estimator parameters (e.g. from tune_hyperparameters)
+        engine (str): "auto", "exact" or "scalable" (see resolve_model_class)
+        n_jobs (int): threads for models with an `n_jobs` parameter (defaults to the
+            running job's thread budget, see resources.n_jobs)
+
+    Returns:
+        dict: model, predictions, metrics, fit_time and predict_time (seconds), engine used
+    """
+    check_model_name(model_name, sparse=sp.issparse(X_train))
+    model_class, engine = resolve_model_class(model_name, X_train.shape[0], engine)
+    model = model_class(**(params or {}))
+    n_jobs = resources.n_jobs() if n_jobs is None else n_jobs
+    if n_jobs is not None and "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+
+    with instrumentation.stage("fit", X_train):
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+    with instrumentation.stage("predict", X_test):
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        predict_time = time.perf_counter() - start
+
+    # Probability metrics (ROC-AUC, log-loss) for models that expose probabilities
+    proba = None
+    if hasattr(model, "predict_proba"):
+        with instrumentation.stage("predict_proba", X_test):
+            proba = model.predict_proba(X_test)
+
+    with instrumentation.stage("metrics", X_test):
+        metrics = metrics_engine.classification_metrics(
+            y_test, y_pred, proba=proba, classes=getattr(model, "classes_", None)
+        )
+
+    return {
+        "model": model,
+        "y_pred": y_pred,
+        "metrics": metrics,
+        "fit_time": fit_time,
+        "predict_time": predict_time,
+        "engine": engine,
+    }
+
+
+def tune_hyperparameters(model_name, data, time_budget=TUNING_TIME_BUDGET_S, progress_callback=None,
+                         engine="auto"):
+    """
+    Search the hyperparameters of a model on the training split only.
+
+    Returns:
+        dict: best_params, best_score (cross-validated weighted F1) and search statistics
+    """
+    # The search spaces pull in scipy.stats, so tuning is only imported when used
+    from src import tuning
+
+    check_model_name(model_name, sparse=sp.issparse(data["X_train"]))
+    model_class, _ = resolve_model_class(model_name, data["X_train"].shape[0], engine)
+    return tuning.tune_model(
+        model_name, model_class, data["X_train"], data["y_train"],
+        time_budget=time_budget, n_jobs=resources.n_jobs(default=-1), progress_callback=progress_callback,
+    )
+
+
+def _scaled_progress(progress_callback, start, end):
+    # Map a sub-task's 0..1 progress onto the [start, end] range of the caller
+    if progress_callback is None:
+        return None
+    return lambda progress, message: progress_callback(
+        None if progress is None else start + (end - start) * progress, message
+    )
+
+
+def _tuning_summary(tuning_result):
+    return {k: v for k, v in tuning_result.items() if k != "history"}
+
+
+def _save_trained_model(result, data, model_name, run_key, compress=False, tuning_result=None):
+    model_filename = registry.model_filename(model_name, run_key)
+    model_path = utils.save_artifact(
+        result["model"], data["pipeline"], model_filename, folder=MODEL_DIR,
+        metadata={
+            "model_name": model_name,
+            "target_column": data["target_column"],
+            "n_train_rows": data["X_train"].shape[0],
+            "training_time_s": round(result["fit_time"], 4),
+            "engine": result["engine"],
+            "metrics": metrics_engine.scalar_metrics(result["metrics"]),
+            "params": result["model"].get_params(),
+            "tuning": _tuning_summary(tuning_result) if tuning_result else None,
+            "feature_selection": selection_report(data["pipeline"]),
+        },
+        compress=ARTIFACT_COMPRESSION if compress else 0,
+    )
+    return model_filename, model_path
+
+
+# ================================
+# Run Reuse
+# ================================
+def _run_config(model_name, target_column, encoding, sparse, imputation, missing_indicators, tune=False,
+                time_budget=None, compress=False, engine="auto", feature_selection=(), projection=None):
+    # Everything that changes the trained model or its artifact; see registry.run_key
+    return {
+        "model_name": model_name,
+        "target_column": target_column,
+        "encoding": encoding,
+        "sparse": sparse,
+        "imputation": imputation,
+        "missing_indicators": missing_indicators,
+        "feature_selection": list(feature_selection),
+        "projection": projection,
+        "tune": tune,
+        "time_budget": time_budget if tune else None,
+        "compress": compress,
+        "engine": engine if model_name in SCALABLE_MODELS else None,
+    }
+
+
+def _lookup_run(csv_file, config, reuse):
+    """
+    Return (run key, registered record or None) of a training configuration.
+    """
+    with instrumentation.stage("lookup_run"):
+        key = registry.run_key(cache.dataset_key(csv_file), config)
+        return key, registry.get_registry().get(key) if reuse else None
+
+
+def _register_run(key, config, model_path, result, target_column, plots, tuning_result=None):
+    return registry.get_registry().register(
+        key, config, model_path, plots=plots,
+        model_name=config["model_name"],
+        target_column=target_column,
+        metrics=result["metrics"],
+        fit_time_s=round(result["fit_time"], 4),
+        predict_time_s=round(result["predict_time"], 4),
+        engine=result.get("engine"),
+        tuning=_tuning_summary(tuning_result) if tuning_result else None,
+    )
+
+
+def _cached_output(record):
+    # Same keys as a fresh train_model_from_csv result
+    with instrumentation.stage("load_run"):
+        plots = registry.get_registry().load_plots(record)
+        pipeline = utils.load_artifact(record["model_path"])["pipeline"]
+    return {
+        "metrics": record["metrics"],
+        "model_path": record["model_path"],
+        "confusion_plot": plots["confusion_plot"],
+        "feature_plot": plots["feature_plot"],
+        "target_column": record["target_column"],
+        "pipeline": pipeline,
+        "tuning": record.get("tuning"),
+        "selection": selection_report(pipeline),
+        "fit_time_s": record["fit_time_s"],
+        "predict_time_s": record["predict_time_s"],
+        "run_key": record["key"],
+        "cached": True,
+    }
+
+
+def selection_report(pipeline):
+    """
+    Return the feature selection report of a fitted pipeline (see FeatureSelector), or None.
+    """
+    return pipeline.selector.report if pipeline.selector is not None else None
+
+
+# ================================
+# Main Training Function
+# ================================
+@instrumentation.instrumented("train")
+@resources.governed("train")
+def train_model_from_csv(csv_file, target_column=None, model_name="Random Forest", encoding="ordinal",
+                         sparse=False, compress=False, tune=False, time_budget=TUNING_TIME_BUDGET_S,
+                         imputation="drop", missing_indicators=False, engine="auto", reuse=True,
+                         feature_selection=(), projection=None, progress_callback=None):
+    """
+    Full pipeline: Load -> Preprocess -> (Tune) -> Train -> Evaluate -> Save
+
+    Set `compress` to store a smaller, compressed artifact (it cannot be memory-mapped).
+    Set `tune` to search hyperparameters for up to `time_budget` seconds before the final fit.
+    `imputation` and `missing_indicators` select how missing values are handled (see prepare_training_data).
+    `engine` selects the exact SVM / KNN or their scalable variants ("auto" switches on the
+    training row count, see resolve_model_class).
+    `feature_selection` filters and a `projection` shrink the features before the model
+    (see prepare_training_data); the selector is saved with the model.
+    Every run is stored in the run registry; with `reuse`, a run with the same dataset
+    content and configuration is returned from the registry instead of being retrained.
+    `progress_callback(progress, message)` is called between stages.
+    Set `export_timings` to "jsonl" or "prometheus" to also write the stage timings to TIMINGS_DIR.
+
+    Returns:
+        dict: metrics, model_path, PNG plots, the fitted pipeline, the tuning summary (if tuned),
+        the feature selection report (if any), fit and predict times, run_key, cached (True if
+        reused) and per-stage timings
+    """
+    check_model_name(model_name, sparse)
+
+    config = _run_config(
+        model_name, target_column, encoding, sparse, imputation, missing_indicators, tune, time_budget, compress,
+        engine, feature_selection, projection,
+    )
+    key, record = _lookup_run(csv_file, config, reuse)
+    if record is not None:
+        utils.report_progress(progress_callback, 1.0, "Reused a previous identical run")
+        return _cached_output(record)
+
+    utils.report_progress(progress_callback, 0.0, "Loading and preprocessing data")
+    data = prepare_training_data(
+        csv_file, target_column, encoding, sparse, imputation, missing_indicators, feature_selection, projection
+    )
+
+    tuning_result = None
+    if tune:
+        utils.report_progress(progress_callback, 0.1, f"Tuning {model_name}")
+        with instrumentation.stage("tune", data["X_train"]):
+            tuning_result = tune_hyperparameters(
+                model_name, data, time_budget, _scaled_progress(progress_callback, 0.1, 0.4), engine
+            )
+
+    # Train, predict and evaluate
+    utils.report_progress(progress_callback, 0.4, f"Training {model_name}")
+    result = fit_and_evaluate(
+        model_name, data["X_train"], data["y_train"], data["X_test"], data["y_test"],
+        params=tuning_result["best_params"] if tuning_result else None, engine=engine,
+    )
+
+    utils.report_progress(progress_callback, 0.8, "Saving model and plots")
+    output = _finish_training(result, data, model_name, key, config, compress, tuning_result)
+    utils.report_progress(progress_callback, 1.0, "Training completed")
+    return output
+
+
+def _finish_training(result, data, model_name, key, config, compress=False, tuning_result=None):
+    """
+    Plot, save and register a model fitted on the full training split.
+
+    Returns:
+        dict: the train_model_from_csv result
+    """
+    model = result["model"]
+
+    # Render plots in memory, reusing the confusion matrix of the metrics
+    with instrumentation.stage("plot"):
+        metrics = result["metrics"]
+        confusion_plot = plot_confusion_matrix(metrics["confusion_matrix"], metrics["labels"])
+
+        feature_plot = None
+        if hasattr(model, "feature_importances_"):
+            feature_plot = plot_feature_importance(model, data["feature_names"])
+
+    # Save model together with its preprocessing pipeline, then register the run
+    with instrumentation.stage("save"):
+        _, model_path = _save_trained_model(result, data, model_name, key, compress, tuning_result)
+        _register_run(
+            key, config, model_path, result, data["target_column"],
+            {"confusion_plot": confusion_plot, "feature_plot": feature_plot}, tuning_result,
+        )
+
+    return {
+        "metrics": result["metrics"],
+        "model_path": model_path,
+        "confusion_plot": confusion_plot,
+        "feature_plot": feature_plot,
+        "target_column": data["target_column"],
+        "pipeline": data["pipeline"],
+        "tuning": _tuning_summary(tuning_result) if tuning_result else None,
+        "selection": selection_report(data["pipeline"]),
+        "fit_time_s": round(result["fit_time"], 4),
+        "predict_time_s": round(result["predict_time"], 4),
+        "run_key": key,
+        "cached": False,
+    }
+
+
+# ================================
+# Progressive Training
+# ================================
+def progressive_sample_rows(y, fractions=PROGRESSIVE_FRACTIONS, min_rows=PROGRESSIVE_MIN_ROWS,
+                            random_state=DEFAULT_RANDOM_STATE):
+    """
+    Draw nested stratified samples: every sample keeps each class's share (at least
+    one row per class) and contains all rows of the smaller samples.
+
+    Fractions are raised to at least `min_rows` rows; fractions that give the same
+    sample are merged, and the last sample is always the full data.
+
+    Returns:
+        list: (fraction, sorted row indices) pairs
+    """
+    _, codes = np.unique(np.asarray(y), return_inverse=True)
+    n_rows = len(codes)
+    counts = np.bincount(codes)
+
+    # Rank rows within their class in one random order, so samples are prefixes of it
+    order = np.lexsort((np.random.default_rng(random_state).random(n_rows), codes))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.empty(n_rows, dtype=np.intp)
+    rank[order] = np.arange(n_rows) - starts[codes[order]]
+
+    samples = []
+    for fraction in sorted({*fractions, 1.0}):
+        fraction = min(max(fraction, min_rows / n_rows), 1.0)
+        per_class = np.maximum(1, np.round(counts * fraction)).astype(np.intp)
+        rows = np.flatnonzero(rank < per_class[codes])
+        if samples and len(rows) == len(samples[-1][1]):
+            continue
+        samples.append((round(len(rows) / n_rows, 4), rows))
+    return samples
+
+
+def _take_rows(X, rows):
+    return X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+
+
+@resources.governed("train")
+def iter_progressive_training(csv_file, target_column=None, model_name="Random Forest",
+                              fractions=PROGRESSIVE_FRACTIONS, encoding="ordinal", sparse=False,
+                              imputation="drop", missing_indicators=False, engine="auto", compress=False,
+                              feature_selection=(), projection=None):
+    """
+    Train one model on growing stratified samples of the training split (e.g. 1%, 10%, 100%).
+
+    Every step is evaluated on the same held-out split and yielded as soon as it
+    finishes, so the caller can draw the learning curve and stop iterating once
+    it flattens: larger samples are only trained when the next step is requested.
+    The full-data step is saved and registered like train_model_from_csv.
+
+    Yields:
+        dict: fraction, n_rows, metrics, fit_time_s, predict_time_s, engine and gain (change of
+        the weighted F1 since the previous step); the full-data step also has "output", the
+        train_model_from_csv result
+    """
+    check_model_name(model_name, sparse)
+    data = prepare_training_data(
+        csv_file, target_column, encoding, sparse, imputation, missing_indicators, feature_selection, projection
+    )
+    config = _run_config(
+        model_name, target_column, encoding, sparse, imputation, missing_indicators, compress=compress,
+        engine=engine, feature_selection=feature_selection, projection=projection,
+    )
+    key = registry.run_key(cache.dataset_key(csv_file), config)
+
+    previous_f1 = None
+    for fraction, rows in progressive_sample_rows(data["y_train"], fractions):
+        full = len(rows) == len(data["y_train"])
+        X_train = data["X_train"] if full else _take_rows(data["X_train"], rows)
+        y_train = data["y_train"] if full else _take_rows(data["y_train"], rows)
+        result = fit_and_evaluate(model_name, X_train, y_train, data["X_test"], data["y_test"], engine=engine)
+
+        metrics = result["metrics"]
+        step = {
+            "fraction": fraction,
+            "n_rows": len(rows),
+            "metrics": metrics,
+            "fit_time_s": round(result["fit_time"], 4),
+            "predict_time_s": round(result["predict_time"], 4),
+            "engine": result["engine"],
+            "gain": None if previous_f1 is None else round(metrics["f1_score"] - previous_f1, 4),
+        }
+        previous_f1 = metrics["f1_score"]
+        if full:
+            step["output"] = _finish_training(result, data, model_name, key, config, compress)
+        yield step
+
+
+def curve_flattened(steps, min_gain=PROGRESSIVE_MIN_GAIN):
+    """
+    Return True when the last step improved the weighted F1 by less than `min_gain`.
+    """
+    return bool(steps) and steps[-1]["gain"] is not None and steps[-1]["gain"] < min_gain
+
+
+# ================================
+# Feature Selection Comparison
+# ================================
+@instrumentation.instrumented("compare_selection")
+@resources.governed("train")
+def compare_feature_selection(csv_file, target_column=None, model_name="Random Forest",
+                              feature_selection=("variance", "correlation"), projection=None,
+                              progress_callback=None, **options):
+    """
+    Train a model on all features and on the selected features, and compare the two runs.
+
+    Both runs go through train_model_from_csv (and the run registry), so a
+    baseline trained before is reused. `options` are passed to both runs.
+
+    Returns:
+        dict: baseline and selected (train_model_from_csv results) and comparison: feature
+        counts, fit / predict speedups, accuracy and F1 change and model size ratio
+    """
+    baseline = train_model_from_csv(
+        csv_file, target_column, model_name, progress_callback=_scaled_progress(progress_callback, 0.0, 0.5),
+        **options,
+    )
+    selected = train_model_from_csv(
+        csv_file, target_column, model_name, feature_selection=feature_selection, projection=projection,
+        progress_callback=_scaled_progress(progress_callback, 0.5, 1.0), **options,
+    )
+    return {
+        "baseline": baseline,
+        "selected": selected,
+        "comparison": selection_trade_off(baseline, selected),
+    }
+
+
+def selection_trade_off(baseline, selected):
+    """
+    Return the feature counts, speedups and accuracy / F1 change of a run with feature selection.
+    """
+    baseline_metrics, selected_metrics = baseline["metrics"], selected["metrics"]
+    report = selected["selection"] or {}
+    return {
+        "n_features_before": len(baseline["pipeline"].output_columns),
+        "n_features_after": len(selected["pipeline"].output_columns),
+        "selection_time_s": report.get("fit_time_s"),
+        "fit_speedup": round(baseline["fit_time_s"] / max(selected["fit_time_s"], 1e-9), 2),
+        "predict_speedup": round(baseline["predict_time_s"] / max(selected["predict_time_s"], 1e-9), 2),
+        "accuracy_change": round(selected_metrics["accuracy"] - baseline_metrics["accuracy"], 4),
+        "f1_change": round(selected_metrics["f1_score"] - baseline_metrics["f1_score"], 4),
+        "model_size_ratio": round(
+            os.path.getsize(selected["model_path"]) / max(os.path.getsize(baseline["model_path"]), 1), 3
+        ),
+    }
+
+
+# ================================
+# Multi-Model Training
+# ================================
+@instrumentation.instrumented("train_all")
+@resources.governed("train_all")
+def train_all_models(csv_file, target_column=None, model_names=None, n_workers=None,
+                     encoding="ordinal", sparse=False, tune=False, time_budget=TUNING_TIME_BUDGET_S,
+                     imputation="drop", missing_indicators=False, engine="auto", reuse=True,
+                     feature_selection=(), projection=None, progress_callback=None):
+    """
+    Train several models on one shared preprocessing pass and rank them.
+
+    The data is loaded and preprocessed once. Models are fitted concurrently
+    in a process pool; large feature arrays are memory-mapped and shared
+    read-only between the workers instead of being copied. Models with an
+    identical run in the registry are not retrained (see train_model_from_csv).
+
+    Args:
+        csv_file: path or uploaded file
+        target_column: target column name (inferred if not given)
+        model_names (list): models to train (defaults to all SUPPORTED_MODELS)
+        n_workers (int): number of worker processes (defaults to one per model)
+        encoding (str): categorical encoding strategy (see encoders.ENCODING_STRATEGIES)
+        sparse (bool): keep features in CSR format; by default only sparse-capable models are trained
+        tune (bool): search hyperparameters first, splitting `time_budget` seconds evenly across models
+        imputation (str): "drop" or an imputation strategy (see prepare_training_data)
+        missing_indicators (bool): add a 0/1 column per feature with missing values
+        engine (str): "auto", "exact" or "scalable" SVM / KNN (see resolve_model_class)
+        feature_selection (list): filters of selection.SELECTION_FILTERS applied before every model
+        projection (str): optional "pca" or "svd" projection of the kept features
+        reuse (bool): return registered runs of the same configuration instead of retraining
+        progress_callback: optional callable(progress, message), called as models finish
+
+    Returns:
+        dict: leaderboard DataFrame, model paths, target column, the fitted pipeline and per-stage timings
+    """
+    if not model_names:
+        model_names = [
+            name for name in SUPPORTED_MODELS
+            if not sparse or name in SPARSE_SUPPORTED_MODELS
+        ]
+    for name in model_names:
+        check_model_name(name, sparse)
+
+    # Every model gets the same share of the tuning budget, whether or not the others are reused
+    model_budget = time_budget / len(model_names)
+    configs, keys, records = {}, {}, {}
+    for name in model_names:
+        configs[name] = _run_config(
+            name, target_column, encoding, sparse, imputation, missing_indicators, tune, model_budget,
+            engine=engine, feature_selection=feature_selection, projection=projection,
+        )
+        keys[name], records[name] = _lookup_run(csv_file, configs[name], reuse)
+    to_train = [name for name in model_names if records[name] is None]
+
+    rows = {}
+    model_paths = {}
+    for name in model_names:
+        if records[name] is not None:
+            record = records[name]
+            model_paths[name] = record["model_path"]
+            rows[name] = _leaderboard_row(
+                name, record["metrics"], record["fit_time_s"], record["predict_time_s"], record.get("engine"),
+                record["tuning"], tune, cached=True,
+            )
+
+    if not to_train:
+        utils.report_progress(progress_callback, 1.0, "Reused previous identical runs")
+        record = records[model_names[0]]
+        with instrumentation.stage("load_run"):
+            pipeline = utils.load_artifact(record["model_path"])["pipeline"]
+        return {
+            "leaderboard": _rank(rows, model_names),
+            "model_paths": model_paths,
+            "target_column": record["target_column"],
+            "pipeline": pipeline,
+        }
+
+    utils.report_progress(progress_callback, 0.0, "Loading and preprocessing data")
+    data = prepare_training_data(
+        csv_file, target_column, encoding, sparse, imputation, missing_indicators, feature_selection, projection
+    )
+
+    # Each search already uses every core for its cross-validation folds, so models are tuned one at a time
+    tuning_results = {}
+    if tune:
+        for i, name in enumerate(to_train):
+            start = 0.05 + 0.15 * i / len(to_train)
+            with instrumentation.stage(f"tune:{name}", data["X_train"]):
+                tuning_results[name] = tune_hyperparameters(
+                    name, data, model_budget,
+                    _scaled_progress(progress_callback, start, start + 0.15 / len(to_train)), engine,
+                )
+
+    utils.report_progress(progress_callback, 0.2, f"Training {len(to_train)} models")
+    # The job's thread budget is shared by the worker processes
+    threads = resources.n_jobs(default=n_workers or len(to_train))
+    n_jobs = min(n_workers or len(to_train), len(to_train), threads)
+    # Workers run without a timer; their fit and predict times are in the leaderboard
+    with instrumentation.stage("train_models", data["X_train"]):
+        results = Parallel(n_jobs=n_jobs, backend="loky", mmap_mode="r", return_as="generator")(
+            delayed(fit_and_evaluate)(
+                name, data["X_train"], data["y_train"], data["X_test"], data["y_test"],
+                params=tuning_results[name]["best_params"] if tune else None, engine=engine,
+                n_jobs=max(1, threads // n_jobs),
+            )
+            for name in to_train
+        )
+
+        for i, (name, result) in enumerate(zip(to_train, results), start=1):
+            utils.report_progress(
+                progress_callback, 0.2 + 0.8 * i / len(to_train), f"Trained {name} ({i}/{len(to_train)})"
+            )
+            metrics = result["metrics"]
+            with instrumentation.stage("plot"):
+                plots = {
+                    "confusion_plot": plot_confusion_matrix(metrics["confusion_matrix"], metrics["labels"]),
+                    "feature_plot": (
+                        plot_feature_importance(result["model"], data["feature_names"])
+                        if hasattr(result["model"], "feature_importances_") else None
+                    ),
+                }
+            with instrumentation.stage("save"):
+                _, model_paths[name] = _save_trained_model(
+                    result, data, name, keys[name], tuning_result=tuning_results.get(name)
+                )
+                _register_run(
+                    keys[name], configs[name], model_paths[name], result, data["target_column"], plots,
+                    tuning_results.get(name),
+                )
+            rows[name] = _leaderboard_row(
+                name, metrics, round(result["fit_time"], 4), round(result["predict_time"], 4), result["engine"],
+                _tuning_summary(tuning_results[name]) if tune else None, tune,
+            )
+
+    return {
+        "leaderboard": _rank(rows, model_names),
+        "model_paths": model_paths,
+        "target_column": data["target_column"],
+        "pipeline": data["pipeline"],
+    }
+
+
+def _leaderboard_row(name, metrics, fit_time_s, predict_time_s, engine, tuning, tune, cached=False):
+    row = {
+        "model": name,
+        "accuracy": metrics["accuracy"],
+        "precision": metrics["precision"],
+        "recall": metrics["recall"],
+        "f1_score": metrics["f1_score"],
+        "macro_f1": metrics["macro_f1"],
+        "roc_auc": metrics.get("roc_auc"),
+        "fit_time_s": fit_time_s,
+        "predict_time_s": predict_time_s,
+        "engine": engine,
+        "cached": cached,
+    }
+    if tune:
+        row["cv_f1_score"] = tuning["best_score"]
+        row["best_params"] = str(tuning["best_params"])
+    return row
+
+
+def _rank(rows, model_names):
+    return (
+        pd.DataFrame([rows[name] for name in model_names])
+        .sort_values(["f1_score", "accuracy"], ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+# ================================
+# Out-of-Core Training
+# ================================
+def iter_split_chunks(csv_file, chunk_size, holdout_fraction=DEFAULT_TEST_SIZE,
+                      random_state=DEFAULT_RANDOM_STATE):
+    """
+    Stream a file in chunks and split every chunk into training and holdout rows.
+
+    The split is drawn from a generator seeded by the chunk number, so every
+    pass over the same file selects the same holdout rows.
+
+    Yields:
+        tuple: (train_df, holdout_df), both without missing values
+    """
+    chunks = utils.iter_chunks(csv_file, chunk_size)
+    for i in itertools.count():
+        with instrumentation.stage("load") as record:
+            chunk = next(chunks, None)
+            record.update(instrumentation.shape_of(chunk))
+        if chunk is None:
+            return
+
+        with instrumentation.stage("split", chunk):
+            holdout = np.random.default_rng([random_state, i]).random(len(chunk)) < holdout_fraction
+        with instrumentation.stage("handle_missing_values", chunk):
+            train_df = utils.handle_missing_values(chunk[~holdout])
+            holdout_df = utils.handle_missing_values(chunk[holdout])
+        yield train_df, holdout_df
+
+
+@instrumentation.instrumented("train_incremental")
+@resources.governed("train_incremental")
+def train_incremental_from_csv(csv_file, target_column=None, model_name="SGD Classifier", encoding="ordinal",
+                               sparse=False, chunk_size=DEFAULT_CHUNK_SIZE, n_epochs=1,
+                               holdout_fraction=DEFAULT_TEST_SIZE, compress=False, reuse=True,
+                               progress_callback=None):
+    """
+    Train on a file larger than memory by streaming it in chunks.
+
+    Pass 1 fits the preprocessing pipeline (category dictionaries and running
+    scaler statistics) on the training rows, the next `n_epochs` passes train
+    the model with `partial_fit`, and a last pass evaluates it on the streamed
+    holdout rows. Memory depends on `chunk_size`, not on the file size.
+    Runs are registered and reused like in train_model_from_csv.
+
+    Returns:
+        dict: metrics, model_path, confusion plot (PNG bytes), target_column, the fitted pipeline,
+        run_key, cached and per-stage timings
+    """
+    if model_name not in INCREMENTAL_MODELS:
+        raise ValueError(f"Unsupported incremental model: {model_name}")
+    if sparse and model_name not in SPARSE_INCREMENTAL_MODELS:
+        raise ValueError(f"Model '{model_name}' does not support sparse input.")
+
+    # Uploads can only be read once; every pass needs to reopen the file
+    csv_file = cache.persist_upload(csv_file)
+
+    config = {
+        "model_name": model_name,
+        "target_column": target_column,
+        "encoding": encoding,
+        "sparse": sparse,
+        "incremental": {"chunk_size": chunk_size, "n_epochs": n_epochs, "holdout_fraction": holdout_fraction},
+        "compress": compress,
+    }
+    key, record = _lookup_run(csv_file, config, reuse)
+    if record is not None:
+        utils.report_progress(progress_callback, 1.0, "Reused a previous identical run")
+        return _cached_output(record)
+
+    # Pass 1: preprocessing statistics and the set of classes
+    utils.report_progress(progress_callback, 0.0, "Fitting preprocessing on streamed chunks")
+    pipeline = None
+    classes = None
+    n_train_rows = 0
+    with instrumentation.stage("fit_pipeline") as record:
+        for train_df, _ in iter_split_chunks(csv_file, chunk_size, holdout_fraction):
+            if pipeline is None:
+                target_column = target_column or utils.infer_target_column(train_df)
+                pipeline = PreprocessingPipeline(target_column, encoding=encoding, sparse=sparse)
+            if train_df.empty:
+                continue
+            with instrumentation.stage("partial_fit_pipeline", train_df):
+                pipeline.partial_fit(train_df)
+            chunk_classes = train_df[target_column].unique()
+            classes = chunk_classes if classes is None else np.union1d(classes, chunk_classes)
+            n_train_rows += len(train_df)
+        record.update(rows=n_train_rows, cols=len(pipeline.output_columns) if pipeline else 0)
+
+    if not n_train_rows:
+        raise ValueError("No training rows left after removing missing values.")
 
-    # Train model
-    model.fit(X_train, y_train)
+    # Passes 2..n: train chunk by chunk, rows shuffled within each chunk
+    model = INCREMENTAL_MODELS[model_name](**INCREMENTAL_MODEL_PARAMS.get(model_name, {}))
+    rng = np.random.default_rng(DEFAULT_RANDOM_STATE)
+    start = time.perf_counter()
+    for epoch in range(n_epochs):
+        utils.report_progress(
+            progress_callback, 0.2 + 0.6 * epoch / n_epochs, f"Training {model_name} (epoch {epoch + 1}/{n_epochs})"
+        )
+        with instrumentation.stage("train_epoch"):
+            for train_df, _ in iter_split_chunks(csv_file, chunk_size, holdout_fraction):
+                if train_df.empty:
+                    continue
+                train_df = train_df.iloc[rng.permutation(len(train_df))]
+                X, y = pipeline.split_target(train_df)
+                X = pipeline.transform(X)
+                with instrumentation.stage("fit", X):
+                    model.partial_fit(X, y, classes=classes)
+    fit_time = time.perf_counter() - start
 
-    # Predict and evaluate
-    y_pred = model.predict(X_test)
-    metrics = utils.get_classification_metrics(y_test, y_pred)
+    # Last pass: evaluate on the streamed holdout
+    utils.report_progress(progress_callback, 0.8, "Evaluating on the streamed holdout")
+    confusion = None
+    predict_time = 0.0
+    with instrumentation.stage("evaluate"):
+        for _, holdout_df in iter_split_chunks(csv_file, chunk_size, holdout_fraction):
+            if holdout_df.empty:
+                continue
+            X, y = pipeline.split_target(holdout_df)
+            X = pipeline.transform(X)
+            with instrumentation.stage("predict", X):
+                start = time.perf_counter()
+                predictions = model.predict(X)
+                predict_time += time.perf_counter() - start
+            with instrumentation.stage("metrics", X):
+                confusion = metrics_engine.merge_confusion_matrices(
+                    confusion, metrics_engine.confusion_matrix(y, predictions)
+                )
 
-    # Save model
-    model_filename = utils.get_unique_filename(model_name.replace(" ", "_"))
-    model_path = utils.save_model(model, model_filename)
+    if confusion is None:
+        raise ValueError("The holdout is empty; increase holdout_fraction or use a larger file.")
+    metrics = metrics_engine.metrics_from_confusion_matrix(*confusion)
 
-    # Save plots
-    plots_dir = "outputs/plots"
-    os.makedirs(plots_dir, exist_ok=True)
+    with instrumentation.stage("plot"):
+        confusion_plot = plot_confusion_matrix(metrics["confusion_matrix"], metrics["labels"])
 
-    confusion_plot_path = os.path.join(plots_dir, f"{model_filename}_confusion.png")
-    plot_confusion_matrix(y_test, y_pred, save_path=confusion_plot_path)
+    # Save model together with its preprocessing pipeline, then register the run
+    with instrumentation.stage("save"):
+        model_path = utils.save_artifact(
+            model, pipeline, registry.model_filename(model_name, key), folder=MODEL_DIR,
+            metadata={
+                "model_name": model_name,
+                "target_column": target_column,
+                "n_train_rows": n_train_rows,
+                "training_time_s": round(fit_time, 4),
+                "metrics": metrics_engine.scalar_metrics(metrics),
+                "params": model.get_params(),
+                "incremental": {"chunk_size": chunk_size, "n_epochs": n_epochs},
+            },
+            compress=ARTIFACT_COMPRESSION if compress else 0,
+        )
+        _register_run(
+            key, config, model_path,
+            {"metrics": metrics, "fit_time": fit_time, "predict_time": predict_time},
+            target_column, {"confusion_plot": confusion_plot},
+        )
 
-    feature_plot_path = None
-    if hasattr(model, "feature_importances_"):
-        feature_plot_path = os.path.join(plots_dir, f"{model_filename}_features.png")
-        plot_feature_importance(model, X.columns, save_path=feature_plot_path)
+    utils.report_progress(progress_callback, 1.0, "Training completed")
 
-    # Return results
     return {
         "metrics": metrics,
         "model_path": model_path,
-        "confusion_plot": confusion_plot_path,
-        "feature_plot": feature_plot_path,
+        "confusion_plot": confusion_plot,
+        "feature_plot": None,
         "target_column": target_column,
-        "label_encoders": label_encoders,
-        "scaler": scaler,
+        "pipeline": pipeline,
+        "run_key": key,
+        "cached": False,
     }
@@ -0,0 +1,271 @@
+# src/tuning.py
+
+import math
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.stats import loguniform, randint
+from sklearn.metrics import f1_score
+from sklearn.model_selection import KFold, ParameterSampler, StratifiedKFold
+
+from src import utils
+from src.constants import (
+    DEFAULT_RANDOM_STATE, TUNING_CV_FOLDS, TUNING_HALVING_FACTOR, TUNING_MAX_RUNGS,
+    TUNING_MIN_SAMPLES, TUNING_TIME_BUDGET_S,
+)
+
+
+# ================================
+# Search Spaces
+# ================================
+SEARCH_SPACES = {
+    "Random Forest": {
+        "max_depth": [None, 5, 10, 20, 40],
+        "min_samples_leaf": randint(1, 10),
+        "max_features": ["sqrt", "log2", 0.5],
+    },
+    "Logistic Regression": {
+        "C": loguniform(1e-3, 1e2),
+        "class_weight": [None, "balanced"],
+    },
+    "Decision Tree": {
+        "max_depth": [None, 3, 5, 10, 20],
+        "min_samples_leaf": randint(1, 20),
+        "criterion": ["gini", "entropy"],
+    },
+    "Support Vector Machine": {
+        "C": loguniform(1e-2, 1e2),
+        "gamma": ["scale", 0.001, 0.01, 0.1, 1.0],
+    },
+    "K-Nearest Neighbors": {
+        "n_neighbors": randint(1, 50),
+        "weights": ["uniform", "distance"],
+        "p": [1, 2],
+    },
+}
+
+# Parameters set on every configuration
+FIXED_PARAMS = {
+    "Logistic Regression": {"max_iter": 1000},
+}
+
+# Parameters that cannot exceed the number of training rows of a fit
+ROW_BOUNDED_PARAMS = ["n_neighbors"]
+
+# Errors of an estimator that cannot fit a configuration on a fold (degenerate or too little data)
+FIT_ERRORS = (ValueError, np.linalg.LinAlgError, FloatingPointError)
+
+# Models budgeted by an estimator parameter instead of training rows: (param, min, max)
+RESOURCE_PARAMS = {
+    "Random Forest": ("n_estimators", 10, 200),
+}
+
+
+# ================================
+# Cross-Validation Helpers
+# ================================
+def make_folds(y, n_folds=TUNING_CV_FOLDS, random_state=DEFAULT_RANDOM_STATE):
+    """
+    Return (train_idx, test_idx) pairs, stratified when every class has enough rows.
+
+    Training indices are shuffled so that their prefixes are random subsamples.
+    """
+    _, counts = np.unique(y, return_counts=True)
+    splitter_class = StratifiedKFold if counts.min() >= n_folds else KFold
+    splitter = splitter_class(n_splits=n_folds, shuffle=True, random_state=random_state)
+
+    rng = np.random.default_rng(random_state)
+    return [(rng.permutation(train_idx), test_idx) for train_idx, test_idx in splitter.split(np.zeros(len(y)), y)]
+
+
+def _fit_and_score(model_class, params, X, y, train_idx, test_idx, deadline):
+    """
+    Return the weighted F1 of one fold, None if skipped after the deadline, or the
+    error of a fit the estimator rejects on this fold.
+    """
+    if time.time() > deadline:
+        return None
+    model = model_class(**params)
+    try:
+        model.fit(X[train_idx], y[train_idx])
+        return f1_score(y[test_idx], model.predict(X[test_idx]), average="weighted")
+    except FIT_ERRORS as exc:
+        # Invalid parameter values (sklearn's InvalidParameterError is also a TypeError)
+        # are a broken search space, not a failed fit
+        if isinstance(exc, TypeError):
+            raise
+        return exc
+
+
+def _bound_to_rows(config, n_rows):
+    return {
+        name: min(value, n_rows) if name in ROW_BOUNDED_PARAMS else value
+        for name, value in config.items()
+    }
+
+
+def _rung_resources(model_name, n_train_rows, factor):
+    """
+    Return the resource name and the resource of every rung, ending at the full budget.
+    """
+    if model_name in RESOURCE_PARAMS:
+        name, r_min, r_max = RESOURCE_PARAMS[model_name]
+    else:
+        name, r_min, r_max = "n_samples", min(TUNING_MIN_SAMPLES, n_train_rows), n_train_rows
+
+    n_rungs = 1 + int(math.log(r_max / r_min, factor)) if r_max > r_min else 1
+    n_rungs = min(n_rungs, TUNING_MAX_RUNGS)
+    resources = [int(r_max / factor ** (n_rungs - 1 - rung)) for rung in range(n_rungs)]
+    return name, resources
+
+
+# ================================
+# Successive Halving
+# ================================
+def successive_halving(model_name, model_class, X, y, folds, deadline, factor=TUNING_HALVING_FACTOR,
+                       n_jobs=-1, random_state=DEFAULT_RANDOM_STATE, fit_errors=None):
+    """
+    Run one successive-halving bracket.
+
+    A batch of random configurations is scored on a small budget (training rows,
+    or n_estimators for forests); only the best 1/factor move on to the next rung
+    with factor times the budget. Cross-validation folds of a rung run in parallel.
+    A configuration with a failed fit is dropped; the errors are appended to
+    `fit_errors` if given.
+
+    Returns:
+        list[dict]: one history row per evaluated (configuration, rung)
+    """
+    resource_name, resources = _rung_resources(model_name, len(folds[0][0]), factor)
+    candidates = list(ParameterSampler(
+        SEARCH_SPACES[model_name], n_iter=factor ** (TUNING_MAX_RUNGS - 1), random_state=random_state
+    ))
+    fixed = FIXED_PARAMS.get(model_name, {})
+
+    history = []
+    with Parallel(n_jobs=n_jobs, backend="loky", mmap_mode="r") as parallel:
+        for rung, resource in enumerate(resources):
+            configs = [{**fixed, **params} for params in candidates]
+            if resource_name != "n_samples":
+                configs = [{**config, resource_name: resource} for config in configs]
+            limit = resource if resource_name == "n_samples" else None
+            n_fit_rows = min(len(train_idx[:limit]) for train_idx, _ in folds)
+            configs = [_bound_to_rows(config, n_fit_rows) for config in configs]
+
+            scores = parallel(
+                delayed(_fit_and_score)(model_class, config, X, y, train_idx[:limit], test_idx, deadline)
+                for config in configs
+                for train_idx, test_idx in folds
+            )
+
+            # A configuration with a skipped or failed fold is dropped
+            failed = [score for score in scores if isinstance(score, Exception)]
+            if fit_errors is not None:
+                fit_errors.extend(failed)
+            ranked = []
+            for i, config in enumerate(configs):
+                fold_scores = scores[i * len(folds):(i + 1) * len(folds)]
+                if any(score is None or isinstance(score, Exception) for score in fold_scores):
+                    continue
+                row = {
+                    "rung": rung,
+                    "resource": resource,
+                    "params": config,
+                    "score": float(np.mean(fold_scores)),
+                }
+                history.append(row)
+                ranked.append((row["score"], i))
+
+            if not ranked or time.time() > deadline:
+                break
+            ranked.sort(reverse=True)
+            candidates = [candidates[i] for _, i in ranked[:max(1, len(ranked) // factor)]]
+
+    return history
+
+
+def tune_model(model_name, model_class, X, y, time_budget=TUNING_TIME_BUDGET_S, n_folds=TUNING_CV_FOLDS,
+               factor=TUNING_HALVING_FACTOR, n_jobs=-1, patience=2, random_state=DEFAULT_RANDOM_STATE,
+               progress_callback=None):
+    """
+    Search hyperparameters of one model within a wall-clock time budget.
+
+    Successive-halving brackets with fresh random configurations are run
+    (Hyperband style) until the budget is spent or `patience` brackets in a row
+    do not improve the best cross-validated weighted F1.
+
+    Args:
+        model_name (str): key of SEARCH_SPACES
+        model_class: estimator class to instantiate
+        X: training features (DataFrame, ndarray or CSR matrix)
+        y: training labels
+        time_budget (float): seconds after which no new fit is started
+        n_jobs (int): parallel workers for cross-validation fits (-1 = all cores)
+        progress_callback: optional callable(progress, message), called after every bracket
+
+    Returns:
+        dict: best_params, best_score, n_configurations, n_brackets, elapsed_s, history
+
+    Raises:
+        ValueError: if fits ran but every configuration failed
+    """
+    if model_name not in SEARCH_SPACES:
+        raise ValueError(f"No search space defined for model: {model_name}")
+
+    start = time.time()
+    deadline = start + time_budget
+    X = X.to_numpy() if isinstance(X, pd.DataFrame) else X
+    y = np.asarray(y)
+    folds = make_folds(y, n_folds, random_state)
+
+    history = []
+    fit_errors = []
+    best = None
+    n_brackets = 0
+    stale = 0
+    while time.time() < deadline and stale < patience:
+        bracket = successive_halving(
+            model_name, model_class, X, y, folds, deadline, factor, n_jobs, random_state + n_brackets, fit_errors
+        )
+        n_brackets += 1
+        history.extend(bracket)
+
+        # Compare on the largest budget reached; scores on smaller budgets are optimistic or noisy
+        bracket_best = max(bracket, key=lambda row: (row["resource"], row["score"]), default=None)
+        if bracket_best and (best is None or (bracket_best["resource"], bracket_best["score"])
+                             > (best["resource"], best["score"])):
+            best = bracket_best
+            stale = 0
+        else:
+            stale += 1
+
+        utils.report_progress(
+            progress_callback, min((time.time() - start) / time_budget, 1.0),
+            f"Tuning {model_name}: {len(history)} evaluations, best F1 {best['score']:.4f}" if best
+            else f"Tuning {model_name}"
+        )
+
+    if not history and fit_errors:
+        error = fit_errors[-1]
+        raise ValueError(
+            f"Tuning {model_name} failed: no configuration could be fitted. "
+            f"Last error: {type(error).__name__}: {error}"
+        ) from error
+    # Fall back to the default configuration if the budget ran out before any evaluation
+    best_params = best["params"] if best else FIXED_PARAMS.get(model_name, {})
+    best_params = {name: value.item() if isinstance(value, np.generic) else value
+                   for name, value in best_params.items()}
+    if model_name in RESOURCE_PARAMS:
+        # The final model always gets the full budget, even if the search was cut short
+        resource_name, _, r_max = RESOURCE_PARAMS[model_name]
+        best_params[resource_name] = r_max
+
+    return {
+        "best_params": best_params,
+        "best_score": round(best["score"], 4) if best else None,
+        "n_configurations": sum(row["rung"] == 0 for row in history),
+        "n_brackets": n_brackets,
+        "elapsed_s": round(time.time() - start, 2),
+        "history": history,
+    }
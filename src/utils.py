@@ -1,34 +1,122 @@
 # src/utils.py
 
 import os
+import json
 import pandas as pd
 import numpy as np
 import joblib
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.model_selection import train_test_split
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import importlib
+import uuid
+from collections.abc import Mapping
 from datetime import datetime
 
+from src.encoders import CategoricalEncoder
+from src.imputation import Imputer
+from src.constants import (
+    ALLOWED_FILE_EXTENSIONS, ARTIFACT_FORMAT, ARTIFACT_HEADER_SUFFIX, ARTIFACT_VERSION, CSV_NULL_VALUES,
+    MAX_CATEGORY_RATIO,
+)
+
 # ================================
 # File Operations
 # ================================
 
-def save_model(model, filename, folder="models"):
+def save_model(model, filename, folder="models", compress=0):
     """
     Save the trained model to disk using joblib.
+
+    Uncompressed files (compress=0) can be memory-mapped on load; a compression
+    level of 1-9 gives a smaller file for storage and download.
     """
     os.makedirs(folder, exist_ok=True)
     path = os.path.join(folder, filename)
-    joblib.dump(model, path)
+    joblib.dump(model, path, compress=compress)
     return path
 
 
-def load_model(filepath):
+def load_model(filepath, mmap_mode=None):
     """
     Load a saved model from disk using joblib.
+
+    With mmap_mode="r" large numpy arrays are memory-mapped read-only, so
+    several processes share one page-cached copy (ignored for compressed files).
     """
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"Model file not found at: {filepath}")
-    return joblib.load(filepath)
+    return joblib.load(filepath, mmap_mode=mmap_mode)
+
+
+def save_artifact(model, pipeline, filename, folder="models", metadata=None, compress=0):
+    """
+    Save the model together with its fitted preprocessing pipeline as one
+    versioned artifact, plus a small JSON header next to it.
+    """
+    metadata = metadata or {}
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "model": model,
+        "pipeline": pipeline,
+        "metadata": metadata,
+    }
+    path = save_model(artifact, filename, folder=folder, compress=compress)
+
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "model_class": type(model).__name__,
+        "target_column": pipeline.target_column,
+        "feature_columns": pipeline.feature_columns,
+        "dtypes": pipeline.dtypes,
+        "output_columns": pipeline.output_columns,
+        "imputation": pipeline.imputation,
+        "compressed": bool(compress),
+        "size_bytes": os.path.getsize(path),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **metadata,
+    }
+    with open(path + ARTIFACT_HEADER_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2, default=str)
+    return path
+
+
+def read_artifact_header(filepath):
+    """
+    Return the metadata header of an artifact without unpickling the model.
+
+    Falls back to loading the artifact when the header file is missing
+    (e.g. a model uploaded on its own).
+    """
+    header_path = filepath + ARTIFACT_HEADER_SUFFIX
+    if os.path.exists(header_path):
+        with open(header_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    artifact = load_artifact(filepath)
+    return {"format": artifact["format"], "version": artifact["version"], **artifact["metadata"]}
+
+
+def load_artifact(filepath, mmap_mode=None):
+    """
+    Load a versioned artifact saved by `save_artifact`.
+
+    Raises:
+        ValueError: if the file is not an artifact or its version is unsupported
+    """
+    artifact = load_model(filepath, mmap_mode=mmap_mode)
+    if not isinstance(artifact, dict) or artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(
+            "Model file does not contain a preprocessing pipeline. "
+            "Please retrain the model with the current version of the app."
+        )
+    if artifact["version"] > ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact version {artifact['version']} "
+            f"(this app supports up to {ARTIFACT_VERSION})."
+        )
+    return artifact
 
 
 def save_dataframe(df, filename, folder="outputs/predictions"):
@@ -41,14 +129,102 @@ def save_dataframe(df, filename, folder="outputs/predictions"):
     return path
 
 
-def load_csv(file):
+def get_file_extension(file):
+    """
+    Return the lower-case extension of a file path or uploaded file (defaults to .csv).
+    """
+    name = file if isinstance(file, (str, os.PathLike)) else getattr(file, "name", "")
+    extension = os.path.splitext(os.fspath(name))[1].lower()
+    return extension or ".csv"
+
+
+def iter_chunks(file, chunk_size):
+    """
+    Iterate over a CSV, Parquet or Feather file in DataFrame chunks of about `chunk_size` rows.
+    """
+    extension = get_file_extension(file)
+    if extension == ".parquet":
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif extension == ".feather":
+        reader = pa.ipc.open_file(file)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).to_pandas()
+    else:
+        yield from pd.read_csv(file, chunksize=chunk_size)
+
+
+def load_data(file, optimize=True):
     """
-    Load a CSV file from Streamlit uploader or file path.
+    Load a CSV, Parquet or Feather file from Streamlit uploader or file path.
+
+    Args:
+        file: path or uploaded file
+        optimize (bool): convert low-cardinality strings to categoricals and
+            downcast integer columns
+
+    Returns:
+        pd.DataFrame
     """
-    if isinstance(file, str):
-        return pd.read_csv(file)
+    extension = get_file_extension(file)
+    if extension not in ALLOWED_FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported file type '{extension}'. Allowed: {ALLOWED_FILE_EXTENSIONS}")
+
+    if extension == ".parquet":
+        df = pq.read_table(file).to_pandas()
+    elif extension == ".feather":
+        df = pd.read_feather(file)
     else:
-        return pd.read_csv(file)
+        df = load_csv(file)
+
+    return optimize_dtypes(df) if optimize else df
+
+
+def load_csv(file):
+    """
+    Load a CSV file from Streamlit uploader or file path using the multi-threaded Arrow reader.
+
+    Missing values and date / timestamp columns (kept as strings) are read as
+    with `pd.read_csv` defaults.
+    """
+    convert_options = pa_csv.ConvertOptions(null_values=CSV_NULL_VALUES, strings_can_be_null=True)
+    table = pa_csv.read_csv(file, convert_options=convert_options)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    return table.to_pandas()
+
+
+def optimize_dtypes(df, max_category_ratio=MAX_CATEGORY_RATIO):
+    """
+    Reduce memory use: low-cardinality string columns become categoricals and
+    integer columns are downcast to the smallest type that holds their values.
+
+    Floats stay float64: chunked reads (iter_chunks) keep float64, and the same
+    file must give the same features in both modes.
+    """
+    optimized = {}
+    n_rows = max(len(df), 1)
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            if series.nunique(dropna=True) / n_rows <= max_category_ratio:
+                optimized[col] = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            optimized[col] = pd.to_numeric(series, downcast="integer")
+    return df.assign(**optimized) if optimized else df
+
+
+def convert_to_parquet(file, path):
+    """
+    Convert a CSV file to Parquet once so later loads skip CSV parsing.
+    """
+    if get_file_extension(file) == ".parquet":
+        return file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df = load_data(file, optimize=True)
+    df.to_parquet(path, index=False)
+    return path
 
 # ================================
 # Data Preprocessing
@@ -57,25 +233,28 @@ def load_csv(file):
 def handle_missing_values(df, strategy="drop"):
     """
     Handle missing values in the dataset.
-    Currently only supports 'drop' strategy.
+
+    "drop" removes incomplete rows; any other strategy of IMPUTATION_STRATEGIES
+    fills them with an Imputer fitted on `df` itself. Use the imputer of a
+    PreprocessingPipeline to apply training statistics to new data.
     """
     if strategy == "drop":
         return df.dropna()
-    else:
-        raise NotImplementedError("Only 'drop' strategy is currently supported.")
+    return Imputer(strategy).fit_transform(df)
 
 
-def encode_categorical_columns(df):
+def encode_categorical_columns(df, strategy="ordinal", y=None):
     """
-    Encode all categorical columns using LabelEncoder.
-    Returns modified DataFrame and a dictionary of encoders.
+    Encode all categorical columns with a hash-based CategoricalEncoder.
+    Returns encoded DataFrame and the fitted encoder.
     """
-    label_encoders = {}
-    for col in df.select_dtypes(include=["object", "category"]).columns:
-        le = LabelEncoder()
-        df[col] = le.fit_transform(df[col])
-        label_encoders[col] = le
-    return df, label_encoders
+    columns = list(df.select_dtypes(include=["object", "category"]).columns)
+    encoder = CategoricalEncoder(strategy).fit(df, columns, y)
+    encoded = encoder.transform(df)
+    if hasattr(encoded, "toarray"):
+        encoded = encoded.toarray()
+    encoded_df = pd.DataFrame(encoded, columns=encoder.get_feature_names_out(), index=df.index)
+    return pd.concat([df.drop(columns=columns), encoded_df], axis=1), encoder
 
 
 def scale_numeric_columns(df, exclude_columns=[]):
@@ -83,6 +262,8 @@ def scale_numeric_columns(df, exclude_columns=[]):
     Scale numeric columns using StandardScaler.
     Returns scaled DataFrame and scaler object.
     """
+    from sklearn.preprocessing import StandardScaler
+
     scaler = StandardScaler()
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     numeric_cols = [col for col in numeric_cols if col not in exclude_columns]
@@ -106,25 +287,55 @@ def split_features_target(df, target_column):
 
 def get_unique_filename(base_name, extension=".pkl"):
     """
-    Generate a unique filename using a timestamp.
+    Generate a unique filename using a timestamp and a random suffix, so runs
+    started in the same second do not overwrite each other.
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"{base_name}_{timestamp}{extension}"
+    return f"{base_name}_{timestamp}_{uuid.uuid4().hex[:8]}{extension}"
 
 
-def get_classification_metrics(y_true, y_pred):
+def import_object(dotted_path):
     """
-    Return a dictionary of common classification metrics.
+    Import and return an object from its dotted path, e.g. "sklearn.svm.SVC".
     """
-    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+    module_name, _, attribute = dotted_path.rpartition(".")
+    return getattr(importlib.import_module(module_name), attribute)
 
-    return {
-        "accuracy": round(accuracy_score(y_true, y_pred), 4),
-        "precision": round(precision_score(y_true, y_pred, average="weighted"), 4),
-        "recall": round(recall_score(y_true, y_pred, average="weighted"), 4),
-        "f1_score": round(f1_score(y_true, y_pred, average="weighted"), 4),
-        "confusion_matrix": confusion_matrix(y_true, y_pred).tolist()
-    }
+
+class LazyClassMapping(Mapping):
+    """
+    Read-only mapping of names to classes given as dotted paths.
+
+    A class (and its library) is imported the first time it is looked up, so
+    listing the names costs nothing at startup.
+    """
+
+    def __init__(self, paths):
+        self.paths = dict(paths)
+        self._classes = {}
+
+    def __getitem__(self, name):
+        if name not in self._classes:
+            self._classes[name] = import_object(self.paths[name])
+        return self._classes[name]
+
+    def __contains__(self, name):
+        # Membership checks must not import the class
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+
+def report_progress(progress_callback, progress, message):
+    """
+    Forward a progress update (fraction in [0, 1] or None, message) to an optional callback.
+    """
+    if progress_callback is not None:
+        progress_callback(progress, message)
 
 
 def is_csv(filename):
@@ -134,6 +345,13 @@ def is_csv(filename):
     return filename.lower().endswith(".csv")
 
 
+def is_allowed_file(filename):
+    """
+    Check if the uploaded file has a supported tabular format.
+    """
+    return get_file_extension(filename) in ALLOWED_FILE_EXTENSIONS
+
+
 def infer_target_column(df):
     """
     Attempt to infer the target column based on name heuristics.
@@ -1,66 +1,133 @@
 # src/visualizer.py
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import io
 import numpy as np
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay
+
+from src.constants import CONFUSION_MATRIX_MAX_CLASSES, FEATURE_IMPORTANCE_TOP_N
+
+# Plots are drawn on standalone Agg figures instead of pyplot's global state, so
+# concurrent sessions can render at the same time. matplotlib is imported inside
+# the plotters: it takes longer to import than the rest of the app.
+
+OTHER_LABEL = "Other"
+
+
+def _new_figure(figsize):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _to_png(figure, save_path=None):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    png = buffer.getvalue()
+    if save_path:
+        with open(save_path, "wb") as f:
+            f.write(png)
+    return png
 
 
 # ============================
 # Confusion Matrix Plotter
 # ============================
-def plot_confusion_matrix(y_true, y_pred, save_path=None):
+def top_k_confusion_matrix(cm, labels, max_classes=CONFUSION_MATRIX_MAX_CLASSES):
     """
-    Plot and save confusion matrix.
+    Keep the `max_classes` classes with the most true rows and merge the rest into "Other".
 
     Args:
-        y_true (array-like): True labels
-        y_pred (array-like): Predicted labels
-        save_path (str): Path to save the plot
+        cm (array-like): Confusion matrix counts (true labels as rows)
+        labels (list): Class labels in matrix order
+
+    Returns:
+        tuple: (reduced counts, reduced labels), unchanged if there are few enough classes
     """
-    cm = confusion_matrix(y_true, y_pred)
-    labels = sorted(list(set(y_true)))
+    cm = np.asarray(cm, dtype=np.int64)
+    if len(labels) <= max_classes:
+        return cm, list(labels)
 
-    plt.figure(figsize=(6, 5))
-    sns.heatmap(cm, annot=True, fmt="d", cmap="Blues", xticklabels=labels, yticklabels=labels)
-    plt.title("Confusion Matrix")
-    plt.xlabel("Predicted Label")
-    plt.ylabel("True Label")
-    plt.tight_layout()
+    # Stable sort keeps the original label order among the kept classes
+    keep = np.sort(np.argsort(-cm.sum(axis=1), kind="stable")[:max_classes])
+    other = np.setdiff1d(np.arange(len(labels)), keep)
+
+    reduced = np.zeros((len(keep) + 1, len(keep) + 1), dtype=np.int64)
+    reduced[:-1, :-1] = cm[np.ix_(keep, keep)]
+    reduced[:-1, -1] = cm[np.ix_(keep, other)].sum(axis=1)
+    reduced[-1, :-1] = cm[np.ix_(other, keep)].sum(axis=0)
+    reduced[-1, -1] = cm[np.ix_(other, other)].sum()
+    return reduced, [labels[i] for i in keep] + [OTHER_LABEL]
 
-    if save_path:
-        plt.savefig(save_path)
-    plt.close()
+
+def plot_confusion_matrix(cm, labels, save_path=None, max_classes=CONFUSION_MATRIX_MAX_CLASSES):
+    """
+    Plot an already computed confusion matrix (e.g. metrics["confusion_matrix"]).
+
+    Problems with more than `max_classes` classes are drawn as a top-k view, so
+    rendering time does not grow with the number of classes.
+
+    Args:
+        cm (array-like): Confusion matrix counts (true labels as rows)
+        labels (list): Class labels in matrix order
+        save_path (str): Optional path to also write the PNG to
+
+    Returns:
+        bytes: PNG image
+    """
+    cm, labels = top_k_confusion_matrix(cm, labels, max_classes)
+    names = [str(label) for label in labels]
+    size = min(4 + 0.4 * len(names), 12)
+
+    figure = _new_figure((size + 1, size))
+    ax = figure.subplots()
+    image = ax.imshow(cm, cmap="Blues")
+    figure.colorbar(image, ax=ax)
+
+    threshold = cm.max() / 2 if cm.size else 0
+    for (i, j), count in np.ndenumerate(cm):
+        ax.text(j, i, str(count), ha="center", va="center", fontsize=8,
+                color="white" if count > threshold else "black")
+
+    ax.set_xticks(np.arange(len(names)), labels=names, rotation=45 if len(names) > 5 else 0, ha="right")
+    ax.set_yticks(np.arange(len(names)), labels=names)
+    reduced = len(cm) > max_classes
+    ax.set_title(f"Confusion Matrix (top {max_classes} classes)" if reduced else "Confusion Matrix")
+    ax.set_xlabel("Predicted Label")
+    ax.set_ylabel("True Label")
+    figure.tight_layout()
+    return _to_png(figure, save_path)
 
 
 # ============================
 # Feature Importance Plotter
 # ============================
-def plot_feature_importance(model, feature_names, save_path=None, top_n=20):
+def plot_feature_importance(model, feature_names, save_path=None, top_n=FEATURE_IMPORTANCE_TOP_N):
     """
-    Plot and save feature importance for tree-based models.
+    Plot feature importance for tree-based models.
 
     Args:
         model: Trained model (must have `feature_importances_`)
         feature_names (list): Feature names
-        save_path (str): File path to save plot
+        save_path (str): Optional path to also write the PNG to
         top_n (int): Number of top features to show
+
+    Returns:
+        bytes: PNG image
     """
     if not hasattr(model, "feature_importances_"):
         raise ValueError("Model does not support feature importance.")
 
     importances = model.feature_importances_
     indices = np.argsort(importances)[::-1][:top_n]
-    top_features = [feature_names[i] for i in indices]
-    top_importances = importances[indices]
-
-    plt.figure(figsize=(8, 6))
-    sns.barplot(x=top_importances, y=top_features, palette="viridis")
-    plt.title("Top Feature Importances")
-    plt.xlabel("Importance Score")
-    plt.ylabel("Features")
-    plt.tight_layout()
 
-    if save_path:
-        plt.savefig(save_path)
-    plt.close()
+    figure = _new_figure((8, 6))
+    ax = figure.subplots()
+    # Most important feature on top
+    ax.barh([str(feature_names[i]) for i in indices[::-1]], importances[indices[::-1]], color="tab:green")
+    ax.set_title("Top Feature Importances")
+    ax.set_xlabel("Importance Score")
+    ax.set_ylabel("Features")
+    figure.tight_layout()
+    return _to_png(figure, save_path)
@@ -0,0 +1,203 @@
+# src/writer.py
+
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from src import utils
+from src.constants import (
+    PREDICTION_COLUMN, PREDICTION_COLUMN_MODES, PREDICTION_FORMATS, PREDICTION_WRITE_BATCH_ROWS,
+    PROBABILITY_COLUMN_PREFIX, ROW_KEY_COLUMN,
+)
+
+
+def prediction_filename(output_format):
+    """
+    Return a unique predictions filename with the extension of `output_format`.
+    """
+    return utils.get_unique_filename("predictions", PREDICTION_FORMATS[output_format][0])
+
+
+def mime_type(path):
+    """
+    Return the download MIME type of a predictions file from its extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for format_extension, mime in PREDICTION_FORMATS.values():
+        if extension == format_extension:
+            return mime
+    return "application/octet-stream"
+
+
+def _plain_schema(schema):
+    # Categorical columns arrive as dictionary arrays whose index width depends on
+    # the batch, so they are written as their values to keep one schema per file
+    return pa.schema([
+        field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+        for field in schema
+    ])
+
+
+# ================================
+# Prediction Writer
+# ================================
+class PredictionWriter:
+    """
+    Write predictions to a CSV, Parquet or Arrow IPC file, batch by batch.
+
+    Every batch of input rows is converted straight to an Arrow table, and the
+    prediction (and optional `proba_<class>`) columns are appended to that
+    table, so the input DataFrame is never copied or modified. With
+    columns="key" only a key column is kept: `key_column` of the input, or the
+    0-based input row number (ROW_KEY_COLUMN) when it is None.
+
+    Parquet and Arrow files have one schema. When a later chunk's column
+    types do not fit it (e.g. integers, then floats with NaN; an all-null
+    column, then strings), the file written so far is rewritten with the
+    promoted common schema.
+
+    Use as a context manager, or call `close` once every batch is written
+    (`abort` on failure). A context manager that exits with an error deletes
+    the partial file.
+    """
+
+    def __init__(self, path, output_format="csv", columns="all", key_column=None):
+        if output_format not in PREDICTION_FORMATS:
+            raise ValueError(f"Unsupported prediction format '{output_format}'. Allowed: {list(PREDICTION_FORMATS)}")
+        if columns not in PREDICTION_COLUMN_MODES:
+            raise ValueError(f"Unsupported prediction columns '{columns}'. Allowed: {PREDICTION_COLUMN_MODES}")
+        self.path = path
+        self.output_format = output_format
+        self.columns = columns
+        self.key_column = key_column
+        self.rows_written = 0
+        self._schema = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df, predictions, proba=None, classes=None, row_numbers=None):
+        """
+        Append the predictions of the rows of `df`.
+
+        Args:
+            df (pd.DataFrame): input rows (left unchanged)
+            predictions (array-like): one prediction per row
+            proba (array-like): optional (n_rows, n_classes) class probabilities
+            classes (array-like): class of every probability column (model.classes_)
+            row_numbers (array-like): 0-based input row numbers, the default key
+                (defaults to the index of `df`)
+        """
+        if self.columns == "key" and self.key_column is not None and self.key_column not in df.columns:
+            raise ValueError(f"Key column '{self.key_column}' not found in the data.")
+        if proba is not None and classes is None:
+            raise ValueError("`classes` is required with `proba`.")
+
+        predictions = np.asarray(predictions)
+        row_numbers = np.asarray(df.index if row_numbers is None else row_numbers)
+        # An empty input still writes a file with the output columns
+        for start in range(0, max(len(df), 1), PREDICTION_WRITE_BATCH_ROWS):
+            rows = slice(start, start + PREDICTION_WRITE_BATCH_ROWS)
+            batch_proba = None if proba is None else proba[rows]
+            self._write_table(self._table(df.iloc[rows], predictions[rows], batch_proba, classes, row_numbers[rows]))
+
+    def _table(self, df, predictions, proba, classes, row_numbers):
+        outputs = {PREDICTION_COLUMN: pa.array(predictions)}
+        if proba is not None:
+            for i, label in enumerate(classes):
+                outputs[f"{PROBABILITY_COLUMN_PREFIX}{label}"] = pa.array(proba[:, i], type=pa.float64())
+
+        if self.columns == "all":
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        elif self.key_column is None:
+            table = pa.table({ROW_KEY_COLUMN: pa.array(row_numbers, type=pa.int64())})
+        else:
+            table = pa.Table.from_pandas(df[[self.key_column]], preserve_index=False)
+
+        # Output columns replace input columns of the same name
+        table = table.drop_columns([name for name in outputs if name in table.column_names])
+        for name, values in outputs.items():
+            table = table.append_column(name, values)
+        return table
+
+    def _write_table(self, table):
+        table = table.cast(_plain_schema(table.schema))
+        first = self._writer is None
+        if first:
+            self._schema = table.schema
+            self._writer = self._open(self._schema)
+        if self.output_format == "csv":
+            # CSV has no schema: a column may change type between chunks (e.g. int to float)
+            pa_csv.write_csv(table, self._writer, pa_csv.WriteOptions(include_header=first))
+        else:
+            if table.schema != self._schema:
+                try:
+                    table = table.cast(self._schema)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                    self._widen(table.schema)
+                    table = table.cast(self._schema)
+            self._writer.write_table(table)
+        self.rows_written += table.num_rows
+
+    def _widen(self, schema):
+        # Rewrite the batches written so far with the common schema; happens at most
+        # once per type change, so files with stable column types are written once
+        try:
+            unified = pa.unify_schemas([self._schema, schema], promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ValueError(f"Column types changed between chunks: {e}") from e
+        self._writer.close()
+        partial = self.path + ".partial"
+        os.replace(self.path, partial)
+        self._schema = unified
+        self._writer = self._open(unified)
+        try:
+            for batch in self._read_batches(partial):
+                self._writer.write_table(pa.Table.from_batches([batch]).cast(unified))
+        finally:
+            os.remove(partial)
+
+    def _read_batches(self, path):
+        if self.output_format == "parquet":
+            with pq.ParquetFile(path) as f:
+                yield from f.iter_batches(batch_size=PREDICTION_WRITE_BATCH_ROWS)
+        else:
+            with pa.memory_map(path) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+
+    def _open(self, schema):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self.output_format == "parquet":
+            return pq.ParquetWriter(self.path, schema)
+        if self.output_format == "arrow":
+            return pa.ipc.new_file(self.path, schema)
+        return pa.OSFile(self.path, "wb")
+
+    def close(self):
+        """
+        Finish the file and return its path.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.path
+
+    def abort(self):
+        """
+        Close the writer and delete the partial file.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,50 @@
+# test/conftest.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_iris
+from src import registry, tester, trainer
+from src.registry import RunRegistry
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_outputs(tmp_path_factory):
+    """Save models, registered runs and predictions in a temporary folder instead of outputs/"""
+    root = tmp_path_factory.mktemp("outputs")
+    model_dir = str(root / "models")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(trainer, "MODEL_DIR", model_dir)
+        monkeypatch.setattr(tester, "PREDICTIONS_DIR", str(root / "predictions"))
+        monkeypatch.setattr(registry, "_registry", RunRegistry(root=str(root / "runs"), model_dir=model_dir))
+        yield root
+
+@pytest.fixture
+def make_df():
+    """
+    Build a mixed-type frame of n_rows: 'num' (float, 1 to 6), 'count' (int), 'color' (red, blue,
+    red, green, red, blue), 'size' (categorical S, M, L) and 'target' (1 on even rows).
+    With missing=True every fourth 'num' and 'color' value is missing.
+    """
+    def make(n_rows=6, missing=False):
+        rows = np.arange(n_rows)
+        df = pd.DataFrame({
+            'num': (rows % 6 + 1).astype(float),
+            'count': rows,
+            'color': np.array(['red', 'blue', 'red', 'green', 'red', 'blue'], dtype=object)[rows % 6],
+            'size': pd.Categorical(np.array(['S', 'M', 'L'])[rows % 3]),
+            'target': (rows % 2 == 0).astype(int),
+        })
+        if missing:
+            df.loc[rows % 4 == 3, ['num', 'color']] = None
+        return df
+    return make
+
+@pytest.fixture
+def iris_df():
+    return load_iris(as_frame=True).frame
+
+@pytest.fixture
+def iris_csv(tmp_path, iris_df):
+    path = str(tmp_path / "iris.csv")
+    iris_df.to_csv(path, index=False)
+    return path
@@ -0,0 +1,43 @@
+# test/test_artifacts.py
+
+import os
+import shutil
+import tempfile
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.neighbors import KNeighborsClassifier
+from src import utils
+from src.pipeline import PreprocessingPipeline
+
+MODEL_DIR = tempfile.mkdtemp()
+
+def setup_module(module):
+    df = load_iris(as_frame=True).frame
+    module.pipeline = PreprocessingPipeline("target")
+    module.X, y = module.pipeline.fit_transform(df)
+    module.model = KNeighborsClassifier().fit(module.X, y)
+
+def teardown_module(module):
+    shutil.rmtree(MODEL_DIR, ignore_errors=True)
+
+def test_header_is_readable_without_unpickling():
+    path = utils.save_artifact(model, pipeline, "knn.pkl", folder=MODEL_DIR,
+                               metadata={"model_name": "K-Nearest Neighbors", "training_time_s": 0.01})
+    header = utils.read_artifact_header(path)
+
+    assert header["model_class"] == "KNeighborsClassifier"
+    assert header["feature_columns"] == pipeline.feature_columns, "Feature schema missing from header"
+    assert header["size_bytes"] == os.path.getsize(path), "Header size does not match file"
+    assert header["training_time_s"] == 0.01, "Custom metadata missing from header"
+
+def test_mmap_and_compressed_artifacts_predict_identically():
+    plain = utils.save_artifact(model, pipeline, "plain.pkl", folder=MODEL_DIR)
+    packed = utils.save_artifact(model, pipeline, "packed.pkl", folder=MODEL_DIR, compress=3)
+
+    mapped = utils.load_artifact(plain, mmap_mode="r")
+    assert isinstance(mapped["model"]._fit_X, np.memmap), "Large arrays should be memory-mapped"
+
+    expected = model.predict(X)
+    assert (mapped["model"].predict(X) == expected).all()
+    assert (utils.load_artifact(packed)["model"].predict(X) == expected).all()
+    assert utils.read_artifact_header(packed)["compressed"] is True
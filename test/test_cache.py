@@ -0,0 +1,38 @@
+# test/test_cache.py
+
+import io
+import numpy as np
+import pandas as pd
+from src import cache
+from src.cache import LRUCache
+
+def test_lru_cache_evicts_least_recently_used():
+    lru = LRUCache(max_entries=2, max_bytes=10_000)
+    lru.put("a", np.zeros(10))
+    lru.put("b", np.zeros(10))
+    lru.get("a")
+    lru.put("c", np.zeros(10))
+
+    assert "a" in lru and "c" in lru, "Recently used entries were evicted"
+    assert "b" not in lru, "Least recently used entry was not evicted"
+
+def test_lru_cache_respects_memory_budget():
+    lru = LRUCache(max_entries=10, max_bytes=1000)
+    lru.put("small", np.zeros(50))   # 400 bytes
+    lru.put("medium", np.zeros(75))  # 600 bytes
+    lru.put("large", np.zeros(500))  # 4000 bytes, larger than the budget
+
+    assert "large" not in lru, "Oversized value should not be stored"
+    assert lru.total_bytes <= 1000, "Memory budget exceeded"
+
+def test_load_dataframe_parses_each_content_once(monkeypatch):
+    content = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}).to_csv(index=False).encode()
+    calls = []
+    original = cache.utils.load_data
+    monkeypatch.setattr(cache.utils, "load_data", lambda file: calls.append(1) or original(file))
+
+    first = cache.load_dataframe(io.BytesIO(content))
+    second = cache.load_dataframe(io.BytesIO(content))
+
+    assert len(calls) == 1, "Identical content was parsed twice"
+    assert first is second, "Cached DataFrame was not reused"
@@ -0,0 +1,20 @@
+# test/test_eda.py
+
+import numpy as np
+from src import eda
+
+def test_quick_summary_reports_missingness_and_quantiles(make_df):
+    summary = eda.quick_summary(make_df(1000, missing=True))
+
+    assert summary.loc['num', 'missing'] == 250, "Missing count is wrong"
+    assert summary.loc['color', 'unique'] == 3, "Cardinality is wrong"
+    assert summary.loc['num', '50%'] == 3.0, "Median is wrong"
+    assert np.isnan(summary.loc['color', 'max']), "Quantiles should only exist for numeric columns"
+
+def test_stratified_sample_caps_rows_and_keeps_class_balance(make_df):
+    df = make_df(1000).assign(target=[0] * 900 + [1] * 100)
+    sample = eda.stratified_sample(df, 200, stratify_column='target')
+
+    assert len(sample) == 200, "Sample should be capped at max_rows"
+    assert sample['target'].mean() == df['target'].mean(), "Class balance not preserved"
+    assert eda.stratified_sample(df, 5000) is df, "Small data should not be sampled"
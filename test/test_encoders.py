@@ -0,0 +1,36 @@
+# test/test_encoders.py
+
+import numpy as np
+import pandas as pd
+from src.encoders import CategoricalEncoder, UNSEEN_CODE
+
+def test_ordinal_encoding_maps_unseen_to_bucket(make_df):
+    encoder = CategoricalEncoder("ordinal").fit(make_df(), ['color', 'size'])
+    new = pd.DataFrame({'color': ['blue', 'purple'], 'size': pd.Categorical(['S', 'XL'])})
+
+    encoded = encoder.transform(new)
+
+    assert encoded.shape == (2, 2), "Ordinal encoding should produce one column per feature"
+    assert encoded[1, 0] == UNSEEN_CODE and encoded[1, 1] == UNSEEN_CODE, "Unseen categories not bucketed"
+    assert encoded[0, 0] != UNSEEN_CODE, "Known category encoded as unseen"
+
+def test_onehot_encoding_is_sparse_with_unseen_column(make_df):
+    encoder = CategoricalEncoder("onehot").fit(make_df(), ['color'])
+    encoded = encoder.transform(pd.DataFrame({'color': ['red', 'purple']}))
+
+    assert hasattr(encoded, "tocsr"), "One-hot output should be sparse"
+    assert encoded.shape == (2, 4), "Expected 3 categories plus the unseen column"
+    assert encoded.sum(axis=1).tolist() == [[1.0], [1.0]], "Each row should have exactly one indicator"
+    assert encoded[1, 3] == 1.0, "Unseen value should land in the unseen column"
+    assert encoder.get_feature_names_out()[-1] == "color=__unseen__"
+
+def test_frequency_and_target_encoding(make_df):
+    df = make_df()
+    y = df['target'].to_numpy()
+
+    frequency = CategoricalEncoder("frequency").fit(df, ['color']).transform(df)
+    assert np.isclose(frequency[0, 0], 0.5), "'red' appears in half of the rows"
+
+    target = CategoricalEncoder("target", smoothing=0.0).fit(df, ['color'], y)
+    encoded = target.transform(pd.DataFrame({'color': ['red', 'blue', 'purple']}))
+    assert np.allclose(encoded[:, 0], [1.0, 0.0, 0.5]), "Unexpected target encoding"
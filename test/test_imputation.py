@@ -0,0 +1,49 @@
+# test/test_imputation.py
+
+import numpy as np
+import pandas as pd
+from src import tester, trainer
+from src.constants import MISSING_INDICATOR_SUFFIX
+from src.imputation import IMPUTATION_STRATEGIES, Imputer
+
+def _frame(n_rows=400, missing_rate=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "x1": rng.normal(size=n_rows),
+        "x2": rng.normal(size=n_rows),
+        "color": rng.choice(["red", "green", "blue"], n_rows),
+    })
+    df["target"] = np.where(df["x1"] + df["x2"] > 0, "yes", "no")
+    for col in ("x1", "x2", "color"):
+        df.loc[rng.random(n_rows) < missing_rate, col] = np.nan
+    return df
+
+def test_every_strategy_fills_all_values():
+    df = _frame().drop(columns=["target"])
+    for strategy in IMPUTATION_STRATEGIES[1:]:
+        imputed = Imputer(strategy, add_indicators=True).fit_transform(df)
+        assert len(imputed) == len(df), f"{strategy} dropped rows"
+        assert not imputed.isna().any().any(), f"{strategy} left missing values"
+        assert (imputed[f"x1{MISSING_INDICATOR_SUFFIX}"] == df["x1"].isna()).all()
+
+def test_fitted_statistics_are_reused_at_inference():
+    train = _frame(seed=0).drop(columns=["target"])
+    imputer = Imputer("median").fit(train)
+    new = pd.DataFrame({"x1": [np.nan], "x2": [np.nan], "color": [np.nan]})
+    filled = imputer.transform(new)
+    assert filled.loc[0, "x1"] == train["x1"].median(), "Statistics were refitted on the new data"
+    assert filled.loc[0, "color"] == train["color"].value_counts().index[0]
+
+def test_training_and_testing_keep_incomplete_rows(tmp_path):
+    csv_path = str(tmp_path / "missing.csv")
+    _frame().to_csv(csv_path, index=False)
+
+    output = trainer.train_model_from_csv(
+        csv_path, "target", "Logistic Regression", imputation="median", missing_indicators=True
+    )
+    assert output["pipeline"].imputer is not None, "Imputer not saved in the pipeline"
+
+    result = tester.test_model_on_csv(csv_path, output["model_path"])
+    predictions = pd.read_csv(result["predictions_path"])
+    assert len(predictions) == 400, "Rows with missing features were dropped at test time"
+    assert result["metrics"]["accuracy"] > 0.6
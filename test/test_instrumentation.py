@@ -0,0 +1,56 @@
+# test/test_instrumentation.py
+
+import json
+import time
+import numpy as np
+from src import instrumentation
+from src.instrumentation import StageTimer
+
+def test_stage_timer_merges_repeated_nested_stages():
+    timer = StageTimer()
+    with timer.activate():
+        with instrumentation.stage("load", np.zeros((10, 3))):
+            time.sleep(0.01)
+        with instrumentation.stage("score"):
+            for _ in range(3):
+                with instrumentation.stage("predict", np.zeros((5, 3))):
+                    pass
+
+    summary = {row["stage"]: row for row in timer.summary()}
+    assert [row["stage"] for row in timer.summary()] == ["load", "score", "predict"], "Stages out of order"
+    assert summary["load"]["wall_s"] >= 0.01
+    assert summary["predict"]["calls"] == 3 and summary["predict"]["rows"] == 15
+    assert summary["predict"]["depth"] == 1
+    assert instrumentation.total_time(timer.summary()) == round(summary["load"]["wall_s"] + summary["score"]["wall_s"], 4)
+
+def test_stage_is_noop_without_active_timer():
+    with instrumentation.stage("orphan") as record:
+        pass
+    assert record == {}
+
+def test_instrumented_adds_timings_and_nested_runs_share_the_timer():
+    @instrumentation.instrumented("inner")
+    def inner():
+        with instrumentation.stage("inner_stage"):
+            pass
+        return {}
+
+    @instrumentation.instrumented("outer")
+    def outer():
+        with instrumentation.stage("outer_stage"):
+            pass
+        return inner()
+
+    result = outer()
+    assert [row["stage"] for row in result["timings"]] == ["outer_stage", "inner_stage"]
+
+def test_exports_render_every_stage():
+    timings = [{"stage": "fit", "depth": 0, "calls": 1, "wall_s": 1.5, "cpu_s": 1.2,
+                "peak_rss_delta_mb": None, "rows": 100, "cols": 4}]
+
+    line = json.loads(instrumentation.to_json_lines(timings, {"run": "r1"}))
+    assert line["run"] == "r1" and line["wall_s"] == 1.5
+
+    text = instrumentation.to_prometheus(timings, {"run": "r1"})
+    assert 'automl_stage_wall_seconds{run="r1",stage="fit",depth="0"} 1.5' in text
+    assert "automl_stage_peak_rss_delta_megabytes{" not in text, "Missing values must not be exported"
@@ -0,0 +1,123 @@
+# test/test_jobs.py
+
+import os
+import time
+import shutil
+import tempfile
+import pandas as pd
+import pytest
+from src import jobs, resources
+from src.jobs import JobManager, JobStore
+from src.resources import ResourceManager
+
+temp_dir = tempfile.mkdtemp()
+csv_path = os.path.join(temp_dir, "train.csv")
+db_path = os.path.join(temp_dir, "jobs.db")
+
+def setup_module(module):
+    df = pd.DataFrame({
+        'feature1': list(range(40)),
+        'feature2': ['a', 'b'] * 20,
+        'target': [0, 1] * 20
+    })
+    df.to_csv(csv_path, index=False)
+
+def teardown_module(module):
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+def wait_for(manager, job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["status"] in jobs.FINISHED_STATES:
+            return job
+        time.sleep(0.2)
+    raise AssertionError(f"Job {job_id} did not finish in {timeout}s")
+
+def test_train_job_runs_in_background():
+    manager = JobManager(db_path=db_path, max_workers=1)
+    try:
+        job_id = manager.submit("train", {
+            "csv_file": csv_path,
+            "target_column": "target",
+            "model_name": "Logistic Regression",
+        })
+        job = wait_for(manager, job_id)
+    finally:
+        manager.shutdown()
+
+    assert job["status"] == jobs.COMPLETED, job["error"]
+    assert job["progress"] == 1.0
+    assert os.path.exists(job["result"]["model_path"]), "Model file not saved"
+    assert "accuracy" in job["result"]["metrics"]
+
+def test_cancel_queued_job():
+    store = JobStore(db_path)
+    job_id = store.create("train", {"csv_file": csv_path})
+    store.request_cancel(job_id)
+
+    jobs._execute_job(db_path, job_id, "train", {"csv_file": csv_path})
+
+    assert store.get(job_id)["status"] == jobs.CANCELLED
+
+def test_restart_marks_unfinished_jobs_failed():
+    store = JobStore(db_path)
+    job_id = store.create("train", {"csv_file": csv_path})
+    store.update(job_id, status=jobs.RUNNING)
+
+    store.mark_interrupted()
+
+    assert store.get(job_id)["status"] == jobs.FAILED
+
+def test_jobs_wait_for_a_slot_in_the_app_process(monkeypatch):
+    monkeypatch.setattr(resources, "_manager", ResourceManager(max_concurrent_jobs=1))
+    manager = JobManager(db_path=db_path, max_workers=1)
+    try:
+        with resources.get_manager().acquire("train"):
+            job_id = manager.submit("train", {"csv_file": csv_path, "target_column": "target",
+                                              "model_name": "Logistic Regression"})
+            time.sleep(1)
+            job = manager.get(job_id)
+            assert job["status"] == jobs.QUEUED and "Waiting for a free slot" in job["message"]
+        job = wait_for(manager, job_id)
+    finally:
+        manager.shutdown()
+
+    assert job["status"] == jobs.COMPLETED, job["error"]
+    assert resources.get_manager().status()["running"] == 0
+
+def test_jobs_are_listed_and_cancelled_by_their_owner():
+    store = JobStore(db_path)
+    job_id = store.create("train", {"csv_file": csv_path}, owner="session-a")
+    manager = JobManager(db_path=db_path, max_workers=1)
+    try:
+        assert store.get(job_id)["status"] == jobs.QUEUED, "Another process's manager failed a live job"
+        assert [job["id"] for job in manager.list(owner="session-a")] == [job_id]
+        assert manager.list(owner="session-b") == [], "Jobs of another session were listed"
+
+        with pytest.raises(PermissionError):
+            manager.cancel(job_id, owner="session-b")
+        assert not store.get(job_id)["cancel_requested"]
+        manager.cancel(job_id, owner="session-a")
+        assert store.get(job_id)["cancel_requested"]
+    finally:
+        manager.shutdown()
+
+def _kill_worker(db_path, job_id, kind, params):
+    JobStore(db_path).update(job_id, status=jobs.RUNNING)
+    os._exit(1)
+
+def test_dead_worker_fails_its_job_and_the_pool_recovers(monkeypatch):
+    manager = JobManager(db_path=db_path, max_workers=1)
+    try:
+        monkeypatch.setattr(jobs, "_execute_job", _kill_worker)
+        job = wait_for(manager, manager.submit("train", {"csv_file": csv_path}))
+        assert job["status"] == jobs.FAILED and "BrokenProcessPool" in job["error"]
+
+        monkeypatch.undo()
+        job = wait_for(manager, manager.submit("train", {
+            "csv_file": csv_path, "target_column": "target", "model_name": "Logistic Regression",
+        }))
+    finally:
+        manager.shutdown()
+    assert job["status"] == jobs.COMPLETED, job["error"]
@@ -0,0 +1,54 @@
+# test/test_loading.py
+
+import os
+import pandas as pd
+from src import utils
+
+def test_csv_parquet_and_feather_load_identically(tmp_path, make_df):
+    df = make_df(100)
+    paths = {
+        ".csv": str(tmp_path / "data.csv"),
+        ".parquet": str(tmp_path / "data.parquet"),
+        ".feather": str(tmp_path / "data.feather"),
+    }
+    df.to_csv(paths[".csv"], index=False)
+    df.to_parquet(paths[".parquet"], index=False)
+    df.to_feather(paths[".feather"])
+
+    loaded = {ext: utils.load_data(path) for ext, path in paths.items()}
+    for ext, frame in loaded.items():
+        assert frame.shape == df.shape, f"{ext} loaded with wrong shape"
+        assert list(frame['color'].astype(str)) == list(df['color']), f"{ext} changed string values"
+
+    chunks = list(utils.iter_chunks(paths[".parquet"], chunk_size=30))
+    assert sum(len(chunk) for chunk in chunks) == len(df), "Chunked Parquet read lost rows"
+
+def test_csv_missing_values_match_pandas(tmp_path):
+    csv_path = str(tmp_path / "missing.csv")
+    with open(csv_path, "w") as f:
+        f.write("a,b,c\n1.1,x,0\n2.2,,1\n,y,0\n3.3,NA,1\n4.4,null,0\n")
+
+    loaded = utils.load_csv(csv_path)
+    expected = pd.read_csv(csv_path)
+    pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+    assert loaded["b"].isna().tolist() == [False, True, False, True, True], "Missing strings read as values"
+
+    # In-memory and chunked reads give the same float values
+    chunked = pd.concat(utils.iter_chunks(csv_path, chunk_size=2), ignore_index=True)
+    assert utils.load_data(csv_path)["a"].dtype == chunked["a"].dtype == "float64"
+
+def test_optimize_dtypes_downcasts_and_categorizes(make_df):
+    optimized = utils.optimize_dtypes(make_df(100))
+
+    assert optimized['color'].dtype == 'category', "Low-cardinality strings should be categorical"
+    assert optimized['count'].dtype.itemsize == 1, "Small integers should be downcast"
+    assert optimized['num'].dtype == 'float64', "Floats should keep their precision"
+
+def test_convert_to_parquet_round_trip(tmp_path, make_df):
+    csv_path = str(tmp_path / "convert.csv")
+    make_df(100).to_csv(csv_path, index=False)
+
+    parquet_path = utils.convert_to_parquet(csv_path, str(tmp_path / "convert.parquet"))
+
+    assert os.path.exists(parquet_path), "Parquet file not written"
+    assert utils.load_data(parquet_path).shape == make_df(100).shape, "Parquet copy has wrong shape"
@@ -0,0 +1,51 @@
+# test/test_metrics.py
+
+import numpy as np
+from sklearn import metrics as sk_metrics
+from src import metrics
+
+def _sample(n_classes, n_rows=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, n_classes, n_rows)
+    proba = rng.dirichlet(np.ones(n_classes), n_rows)
+    proba[np.arange(n_rows), y_true] += 0.5
+    proba /= proba.sum(axis=1, keepdims=True)
+    return y_true, proba
+
+def test_metrics_match_sklearn():
+    for n_classes in (2, 4):
+        y_true, proba = _sample(n_classes)
+        y_pred = proba.argmax(axis=1)
+        result = metrics.classification_metrics(y_true, y_pred, proba=proba, classes=np.arange(n_classes))
+
+        assert result["accuracy"] == round(sk_metrics.accuracy_score(y_true, y_pred), 4)
+        assert result["f1_score"] == round(sk_metrics.f1_score(y_true, y_pred, average="weighted"), 4)
+        assert result["macro_recall"] == round(sk_metrics.recall_score(y_true, y_pred, average="macro"), 4)
+        assert result["confusion_matrix"] == sk_metrics.confusion_matrix(y_true, y_pred).tolist()
+        expected_auc = (sk_metrics.roc_auc_score(y_true, proba[:, 1]) if n_classes == 2
+                        else sk_metrics.roc_auc_score(y_true, proba, multi_class="ovr"))
+        assert result["roc_auc"] == round(expected_auc, 4)
+        assert result["log_loss"] == round(sk_metrics.log_loss(y_true, proba), 4)
+
+def test_merged_chunks_match_single_pass():
+    y_true = np.array(["a", "b", "c", "a", "b", "c", "a", "d"])
+    y_pred = np.array(["a", "b", "b", "a", "c", "c", "a", "a"])
+
+    merged = None
+    for start in range(0, len(y_true), 3):
+        merged = metrics.merge_confusion_matrices(
+            merged, metrics.confusion_matrix(y_true[start:start + 3], y_pred[start:start + 3])
+        )
+
+    assert metrics.metrics_from_confusion_matrix(*merged) == metrics.classification_metrics(y_true, y_pred)
+
+def test_numeric_and_string_labels_are_matched():
+    result = metrics.classification_metrics(np.array([1, 2, 2]), np.array(["1", "2", "1"]))
+    assert result["labels"] == ["1", "2"] and result["accuracy"] == round(2 / 3, 4)
+
+def test_bootstrap_intervals_contain_the_estimate():
+    y_true, proba = _sample(3)
+    result = metrics.classification_metrics(y_true, proba.argmax(axis=1))
+    for name, (low, high) in result["confidence_intervals"].items():
+        assert low <= result[name] <= high, f"{name} outside its confidence interval"
+        assert high - low < 0.1, f"{name} interval is implausibly wide"
@@ -0,0 +1,73 @@
+# test/test_pipeline.py
+
+import numpy as np
+import pandas as pd
+from src.pipeline import PreprocessingPipeline
+
+def test_transform_matches_fit_transform(make_df):
+    df = make_df()
+    pipeline = PreprocessingPipeline('target')
+    X_fit, y = pipeline.fit_transform(df)
+
+    X_again = pipeline.transform(df.drop(columns=['target']))
+
+    assert list(X_fit.columns) == ['num', 'count', 'color', 'size'], "Feature order not preserved"
+    assert np.allclose(X_fit.to_numpy(), X_again.to_numpy()), "Transform is not deterministic"
+    assert list(y) == list(df['target']), "Target should be returned unchanged"
+
+def test_transform_is_independent_of_batch_size(make_df):
+    df = make_df()
+    pipeline = PreprocessingPipeline('target').fit(df)
+
+    full = pipeline.transform(df)
+    single_row = pipeline.transform(df.iloc[[4]])
+
+    assert np.allclose(full.iloc[[4]].to_numpy(), single_row.to_numpy()), \
+        "Single-row output differs from batch output"
+
+def test_unseen_category_and_missing_column(make_df):
+    df = make_df()
+    pipeline = PreprocessingPipeline('target').fit(df)
+
+    new = make_df(1).drop(columns=['target']).assign(color='purple')
+    X = pipeline.transform(new)
+    assert not X.isnull().any().any(), "Unseen categories should still produce numeric output"
+
+    try:
+        pipeline.transform(new.drop(columns=['color']))
+        assert False, "Expected ValueError for missing feature column"
+    except ValueError:
+        pass
+
+def test_sparse_mode_keeps_csr_output():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'num': rng.normal(size=200),
+        'id': [f"id{i}" for i in range(200)],
+        'target': rng.integers(0, 2, size=200)
+    })
+    pipeline = PreprocessingPipeline('target', encoding='onehot', sparse=True)
+    X, _ = pipeline.fit_transform(df)
+
+    assert hasattr(X, 'tocsr') and X.format == 'csr', "Sparse mode should return a CSR matrix"
+    assert X.shape == (200, 1 + 200 + 1), "Unexpected one-hot width"
+    assert X.nnz <= 2 * 200, "Non-zeros should scale with rows, not rows times columns"
+    assert pipeline.scaler.with_mean is False, "Sparse scaling must not center the data"
+
+
+def test_partial_fit_matches_full_fit_statistics():
+    df = pd.DataFrame({
+        'num': np.arange(300, dtype=float),
+        'cat': np.array(['a', 'b', 'c', 'd'], dtype=object)[np.arange(300) % 4 * (np.arange(300) > 100)],
+        'target': np.arange(300) % 2,
+    })
+    for encoding in ["ordinal", "onehot", "frequency"]:
+        full = PreprocessingPipeline('target', encoding=encoding).fit(df)
+        incremental = PreprocessingPipeline('target', encoding=encoding)
+        for start in range(0, len(df), 70):
+            incremental.partial_fit(df.iloc[start:start + 70])
+
+        assert incremental.output_columns == full.output_columns, f"{encoding}: columns differ"
+        np.testing.assert_allclose(incremental.scaler.mean_, full.scaler.mean_, atol=1e-9)
+        np.testing.assert_allclose(incremental.scaler.scale_, full.scaler.scale_, atol=1e-9)
+        np.testing.assert_allclose(incremental.transform(df).to_numpy(), full.transform(df).to_numpy(), atol=1e-9)
@@ -0,0 +1,70 @@
+# test/test_registry.py
+
+import os
+import time
+from sklearn.datasets import load_iris
+from src import registry, trainer, utils
+from src.registry import RunRegistry
+
+def _register(runs, key, size, f1_score=0.5):
+    model_path = os.path.join(runs.model_dir, registry.model_filename("Decision Tree", key))
+    with open(model_path, "wb") as f:
+        f.write(b"0" * size)
+    return runs.register(key, {"model_name": "Decision Tree"}, model_path, plots={"confusion_plot": b"png"},
+                         model_name="Decision Tree", metrics={"accuracy": 0.9, "f1_score": f1_score})
+
+def test_run_key_depends_on_data_and_config():
+    config = {"model_name": "Decision Tree", "encoding": "ordinal"}
+    key = registry.run_key("data", config)
+
+    assert key == registry.run_key("data", dict(reversed(config.items()))), "Key depends on dict order"
+    assert key != registry.run_key("other", config), "Dataset ignored"
+    assert key != registry.run_key("data", {**config, "encoding": "onehot"}), "Config ignored"
+
+def test_registry_lists_compares_and_collects_garbage(tmp_path):
+    runs = RunRegistry(root=str(tmp_path / "runs"), model_dir=str(tmp_path), quota_bytes=10_000)
+    _register(runs, "old", 4000)
+    time.sleep(0.01)  # last_used_at has a resolution of one millisecond
+    _register(runs, "new", 4000, f1_score=0.8)
+
+    record = runs.get("old")
+    assert record["metrics"]["accuracy"] == 0.9, "Metrics not stored"
+    assert runs.load_plots(record)["confusion_plot"] == b"png", "Plot not stored"
+    assert list(runs.compare()["key"]) == ["new", "old"], "Comparison not ranked by F1"
+
+    time.sleep(0.01)
+    runs.get("new")  # "old" is now the least recently used run
+    _register(runs, "latest", 4000)
+
+    assert "old" not in runs, "Least recently used run was not evicted"
+    assert "new" in runs and "latest" in runs, "Runs within the quota were evicted"
+    assert not os.path.exists(os.path.join(runs.model_dir, registry.model_filename("Decision Tree", "old"))), \
+        "Evicted artifact left on disk"
+    assert runs.total_size() <= 10_000, "Quota exceeded"
+
+def test_identical_training_run_is_reused(tmp_path, monkeypatch):
+    # A registry of its own: other tests train on the same data
+    monkeypatch.setattr(trainer, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(registry, "_registry", RunRegistry(root=str(tmp_path / "runs"), model_dir=str(tmp_path)))
+    csv_path = str(tmp_path / "iris_registry.csv")
+    load_iris(as_frame=True).frame.to_csv(csv_path, index=False)
+
+    first = trainer.train_model_from_csv(csv_path, "target", "Decision Tree")
+    second = trainer.train_model_from_csv(csv_path, "target", "Decision Tree")
+    other = trainer.train_model_from_csv(csv_path, "target", "Decision Tree", encoding="onehot")
+
+    assert not first["cached"] and second["cached"], "Identical run was retrained"
+    assert second["model_path"] == first["model_path"], "Cached run points to another artifact"
+    assert second["metrics"] == first["metrics"], "Cached metrics differ"
+    assert second["confusion_plot"] == first["confusion_plot"], "Cached plot differs"
+    assert second["pipeline"] is not None, "Cached run has no pipeline"
+    assert other["run_key"] != first["run_key"] and not other["cached"], "Different config reused a run"
+
+    models = ["Decision Tree", "Logistic Regression"]
+    leaderboard = trainer.train_all_models(csv_path, "target", model_names=models)["leaderboard"]
+    cached = dict(zip(leaderboard["model"], leaderboard["cached"]))
+    assert cached == {"Decision Tree": True, "Logistic Regression": False}, "Leaderboard did not reuse runs"
+
+def test_unique_filenames_do_not_collide():
+    names = {utils.get_unique_filename("model") for _ in range(100)}
+    assert len(names) == 100, "Filenames created in the same second collide"
@@ -0,0 +1,101 @@
+# test/test_resources.py
+
+import os
+import threading
+import time
+import pytest
+from src import resources, trainer
+from src.resources import ResourceLimitError, ResourceManager
+
+def test_runs_wait_in_order_and_report_their_position():
+    manager = ResourceManager(max_concurrent_jobs=1, threads_per_job=1)
+    started, messages = [], {"b": [], "c": []}
+    release = threading.Event()
+
+    def run(name, hold=False):
+        callback = (lambda progress, message: messages[name].append(message)) if name in messages else None
+        with manager.acquire("train", progress_callback=callback):
+            started.append(name)
+            if hold:
+                release.wait(5)
+
+    first = threading.Thread(target=run, args=("a", True))
+    first.start()
+    while not started:
+        time.sleep(0.01)
+    waiting = [threading.Thread(target=run, args=(name,)) for name in ("b", "c")]
+    for thread in waiting:
+        thread.start()
+        time.sleep(0.1)
+
+    assert manager.status()["running"] == 1 and manager.status()["waiting"] == 2, "Slot limit not enforced"
+    release.set()
+    for thread in [first, *waiting]:
+        thread.join(5)
+
+    assert started == ["a", "b", "c"], "Runs did not start in arrival order"
+    assert messages["b"][0] == "Waiting for a free slot: 0 run(s) ahead, 1 running"
+    assert messages["c"][0] == "Waiting for a free slot: 1 run(s) ahead, 1 running"
+    assert manager.status()["running"] == 0 and manager.status()["waiting"] == 0
+
+def test_session_memory_limit_rejects_runs_gracefully():
+    manager = ResourceManager(session_memory_bytes=1000)
+
+    with pytest.raises(ResourceLimitError, match="allowed per session"):
+        with manager.acquire("train", memory_bytes=2000, session="s1"):
+            pass
+
+    errors = []
+
+    def second_run(session):
+        try:
+            with manager.acquire("test", memory_bytes=600, session=session):
+                pass
+        except ResourceLimitError as e:
+            errors.append((session, str(e)))
+
+    with manager.acquire("train", memory_bytes=600, session="s1"):
+        assert manager.session_memory("s1") == 600
+        for session in ("s1", "s2"):
+            thread = threading.Thread(target=second_run, args=(session,))
+            thread.start()
+            thread.join(5)
+    assert [session for session, _ in errors] == ["s1"], "Only the session over its limit is rejected"
+    assert "already reserve" in errors[0][1]
+    assert manager.session_memory("s1") == 0, "Memory of a finished run stays reserved"
+
+def test_jobs_get_a_thread_budget(iris_csv):
+    manager = ResourceManager(max_concurrent_jobs=1, threads_per_job=3)
+    assert resources.n_jobs(default=-1) == -1, "Budget applied outside a job"
+
+    data = trainer.prepare_training_data(iris_csv, "target")
+    with manager.acquire("train") as threads:
+        # A nested run shares the outer job's slot instead of waiting for it
+        with manager.acquire("test") as nested_threads:
+            assert threads == nested_threads == resources.n_jobs() == 3
+        result = trainer.fit_and_evaluate(
+            "Random Forest", data["X_train"], data["y_train"], data["X_test"], data["y_test"]
+        )
+    assert result["model"].n_jobs == 3, "Estimator ignored the thread budget"
+    assert resources.n_jobs() is None
+
+def test_governed_runs_charge_the_input_file(monkeypatch, iris_csv):
+    assert resources.estimate_memory(iris_csv) == os.path.getsize(iris_csv) * 5
+
+    monkeypatch.setattr(resources, "_manager", ResourceManager(session_memory_bytes=100))
+    with pytest.raises(ResourceLimitError):
+        trainer.train_model_from_csv(iris_csv, "target", "Decision Tree", reuse=False)
+
+    monkeypatch.setattr(resources, "_manager", ResourceManager())
+    output = trainer.train_model_from_csv(iris_csv, "target", "Decision Tree", reuse=False)
+    assert "queue" in [row["stage"] for row in output["timings"]], "Queue wait not timed"
+
+def test_generator_runs_release_their_budget_between_steps(monkeypatch, iris_csv):
+    monkeypatch.setattr(resources, "_manager", ResourceManager(max_concurrent_jobs=1, threads_per_job=2))
+    steps = trainer.iter_progressive_training(
+        iris_csv, "target", "Decision Tree", fractions=(0.5, 1.0)
+    )
+    for step in steps:
+        assert resources.n_jobs() is None, "Thread budget leaked into the caller"
+        assert resources.get_manager().status()["running"] == 1, "Slot released before the run finished"
+    assert resources.get_manager().status()["running"] == 0
@@ -0,0 +1,45 @@
+# test/test_scalable.py
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.datasets import make_classification
+from src import trainer
+from src.constants import SCALABLE_MODEL_MIN_ROWS
+from src.scalable import ApproximateKernelSVC, IndexedKNeighborsClassifier, stratified_rows
+
+def _split():
+    X, y = make_classification(n_samples=2000, n_features=10, n_informative=5, n_classes=3, random_state=0)
+    return X[:1500], y[:1500], X[1500:], y[1500:]
+
+def test_scalable_variants_are_selected_by_row_count():
+    assert trainer.resolve_model_class("Support Vector Machine", 1000)[1] == "exact", "Small table used a variant"
+    model_class, engine = trainer.resolve_model_class("Support Vector Machine", SCALABLE_MODEL_MIN_ROWS)
+    assert (model_class, engine) == (ApproximateKernelSVC, "scalable"), "Large table used the exact SVC"
+    assert trainer.resolve_model_class("Decision Tree", 10 ** 7, "scalable")[1] == "exact", \
+        "Model without a variant was replaced"
+
+def test_scalable_variants_stay_close_to_exact_models():
+    X_train, y_train, X_test, y_test = _split()
+    for name in trainer.SCALABLE_MODELS:
+        exact = trainer.fit_and_evaluate(name, X_train, y_train, X_test, y_test, engine="exact")
+        scalable = trainer.fit_and_evaluate(name, X_train, y_train, X_test, y_test, engine="scalable")
+        assert scalable["engine"] == "scalable", f"{name}: variant not used"
+        assert scalable["metrics"]["accuracy"] >= exact["metrics"]["accuracy"] - 0.1, f"{name}: accuracy dropped"
+
+def test_scalable_variants_accept_sparse_input():
+    X_train, y_train, X_test, y_test = _split()
+    for model in (ApproximateKernelSVC(), IndexedKNeighborsClassifier()):
+        dense = model.fit(X_train, y_train).predict(X_test)
+        sparse = model.fit(sp.csr_matrix(X_train), y_train).predict(sp.csr_matrix(X_test))
+        assert (dense == sparse).mean() > 0.95, f"{type(model).__name__}: sparse predictions differ"
+
+def test_knn_reference_set_is_stratified_and_bounded():
+    X_train, y_train, X_test, _ = _split()
+    model = IndexedKNeighborsClassifier(max_reference_rows=300).fit(X_train, y_train)
+
+    reference = model.index_._y
+    assert len(reference) <= 303, "Reference set not bounded"
+    assert np.allclose(np.bincount(reference) / len(reference), np.bincount(y_train) / len(y_train), atol=0.02), \
+        "Class shares not kept"
+    assert model.index_._fit_method == "kd_tree", "Low-dimensional data should use a KD-tree index"
+    assert len(stratified_rows(np.array([0] * 99 + [1]), 10)) == 11, "Rare class dropped"
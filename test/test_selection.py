@@ -0,0 +1,91 @@
+# test/test_selection.py
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from src import tester, trainer, utils
+from src.pipeline import PreprocessingPipeline
+from src.selection import FeatureSelector
+
+@pytest.fixture
+def wide_csv(tmp_path, iris_df):
+    """Iris with an ID, a constant, a near-duplicate and a noise column"""
+    rng = np.random.default_rng(0)
+    df = iris_df.copy()
+    df.insert(0, "id", np.arange(5000, 5000 + len(df)))
+    df["constant"] = 1.0
+    df["petal length x2"] = df["petal length (cm)"] * 2 + rng.normal(scale=0.001, size=len(df))
+    df["noise"] = rng.normal(size=len(df))
+    path = str(tmp_path / "wide.csv")
+    df.to_csv(path, index=False)
+    return path
+
+def test_filters_drop_ids_constants_duplicates_and_noise():
+    X = np.column_stack([np.arange(200.0), np.ones(200), np.r_[np.zeros(199), 1.0],
+                         np.linspace(0, 1, 200), np.linspace(0, 2, 200)])
+    y = np.repeat([0, 1], 100)
+    names = ["id", "constant", "rare", "signal", "signal x2"]
+
+    selector = FeatureSelector(["variance", "identifiers", "correlation"]).fit(X, y, names)
+    assert selector.output_columns == ["signal"]
+    assert selector.report["dropped"] == {
+        "variance": ["constant", "rare"], "identifiers": ["id"], "correlation": ["signal x2"],
+    }
+    assert np.array_equal(selector.transform(X), X[:, [3]])
+
+    # Sparse input keeps its format; filters that need dense columns are skipped
+    sparse = FeatureSelector(["variance", "identifiers"]).fit(sp.csr_matrix(X), y, names)
+    assert sparse.report["skipped"] == ["identifiers"]
+    assert sp.issparse(sparse.transform(sp.csr_matrix(X)))
+
+    # No filter removes every column
+    assert FeatureSelector(["variance"]).fit(X[:, [1]], y, ["constant"]).output_columns == ["constant"]
+    with pytest.raises(ValueError, match="Unsupported feature selection"):
+        FeatureSelector(["lasso"])
+
+def test_selection_is_saved_with_the_model(wide_csv):
+    output = trainer.train_model_from_csv(
+        wide_csv, "target", "Logistic Regression",
+        feature_selection=["variance", "identifiers", "correlation", "mutual_info"], reuse=False,
+    )
+
+    report = output["selection"]
+    assert report["n_features_in"] == 8 and report["n_features_out"] < 5
+    assert report["dropped"]["variance"] == ["constant"] and report["dropped"]["identifiers"] == ["id"]
+    assert "noise" in report["dropped"]["mutual_info"], "Noise column kept"
+    assert utils.read_artifact_header(output["model_path"])["feature_selection"] == report
+
+    # Inference uses the saved selector, in full and in chunks
+    pipeline = utils.load_artifact(output["model_path"])["pipeline"]
+    assert pipeline.output_columns == output["pipeline"].output_columns
+    full = tester.test_model_on_csv(wide_csv, output["model_path"])
+    chunked = tester.test_model_on_csv(wide_csv, output["model_path"], chunk_size=40)
+    assert full["metrics"]["accuracy"] == chunked["metrics"]["accuracy"] > 0.9
+
+    # A reused run reports the same selection
+    assert trainer.train_model_from_csv(
+        wide_csv, "target", "Logistic Regression",
+        feature_selection=["variance", "identifiers", "correlation", "mutual_info"],
+    )["selection"] == report
+
+def test_projections_and_comparison(iris_df, wide_csv):
+    train_df = iris_df.sample(frac=0.8, random_state=0)
+
+    pca = PreprocessingPipeline("target", projection="pca").fit(train_df)
+    X = pca.transform(train_df.drop(columns="target"))
+    assert list(X.columns) == pca.output_columns and pca.output_columns[0] == "pca_1"
+    assert pca.selector.report["explained_variance"] >= 0.95
+
+    svd = PreprocessingPipeline("target", sparse=True, projection="svd").fit(train_df)
+    assert svd.transform(train_df.drop(columns="target")).shape == (len(train_df), 3)
+    with pytest.raises(ValueError, match="PCA needs dense features"):
+        PreprocessingPipeline("target", sparse=True, projection="pca").fit(train_df)
+
+    result = trainer.compare_feature_selection(
+        wide_csv, "target", "Decision Tree", ["variance", "identifiers", "importance"], reuse=False,
+    )
+    comparison = result["comparison"]
+    assert comparison["n_features_before"] == 8 and comparison["n_features_after"] < 8
+    assert {"fit_speedup", "predict_speedup", "accuracy_change", "f1_change"} <= comparison.keys()
+    assert result["baseline"]["selection"] is None and result["selected"]["selection"] is not None
+    assert "fit_selector" in [row["stage"] for row in result["timings"]]
@@ -0,0 +1,99 @@
+# test/test_server.py
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+from src import utils
+from src.pipeline import PreprocessingPipeline
+from src.server import BatcherClosed, MicroBatcher, ModelRegistry, create_server
+
+MODEL_DIR = tempfile.mkdtemp()
+
+def setup_module(module):
+    df = load_iris(as_frame=True).frame
+    pipeline = PreprocessingPipeline("target")
+    X, y = pipeline.fit_transform(df)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    for name in ("iris_a.pkl", "iris_b.pkl"):
+        utils.save_artifact(model, pipeline, name, folder=MODEL_DIR)
+    module.records = df.drop(columns=["target"]).to_dict(orient="records")
+    module.expected = model.predict(X).tolist()
+
+def teardown_module(module):
+    shutil.rmtree(MODEL_DIR, ignore_errors=True)
+
+def test_registry_keeps_recent_models_warm():
+    registry = ModelRegistry(MODEL_DIR, max_models=1)
+    registry.get("iris_a.pkl")
+    registry.get("iris_b.pkl")
+
+    assert registry.warm_models() == ["iris_b.pkl"], "Least recently used model was not evicted"
+    assert registry.list_models() == ["iris_a.pkl", "iris_b.pkl"]
+
+def test_micro_batcher_returns_each_request_its_own_predictions():
+    batcher = ModelRegistry(MODEL_DIR).get("iris_a.pkl")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(batcher.predict, pd.DataFrame([record])) for record in records]
+        results = [future.result()[0] for future in futures]
+
+    assert results == expected, "Batched predictions were routed to the wrong requests"
+
+def test_bad_request_fails_alone_and_evicted_models_reload():
+    batcher = MicroBatcher(utils.load_artifact(f"{MODEL_DIR}/iris_a.pkl"), max_wait_ms=200)
+    # Rejected before batching, where its missing columns would be filled with NaN
+    with pytest.raises(ValueError, match="missing feature columns"):
+        batcher.submit(pd.DataFrame([{"unknown": 1.0}]))
+    good = batcher.submit(pd.DataFrame(records[:2]))
+    bad = batcher.submit(pd.DataFrame([{**records[0], "sepal length (cm)": "long"}]))
+    assert good.result(5).tolist() == expected[:2], "A bad request failed its whole batch"
+    with pytest.raises(ValueError):
+        bad.result(5)
+
+    batcher.close()
+    with pytest.raises(BatcherClosed):
+        batcher.submit(pd.DataFrame(records[:1]))
+
+    registry = ModelRegistry(MODEL_DIR, max_models=1)
+    evicted = registry.get("iris_a.pkl")
+    registry.get("iris_b.pkl")
+    with pytest.raises(BatcherClosed):
+        evicted.predict(pd.DataFrame(records[:1]))
+    assert registry.predict("iris_a.pkl", pd.DataFrame(records[:1])).tolist() == expected[:1]
+
+def test_http_endpoint_scores_single_record_and_batch():
+    server = create_server("127.0.0.1", 0, ModelRegistry(MODEL_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/predict/iris_a.pkl"
+
+    def post(payload, path=url):
+        request = urllib.request.Request(path, data=json.dumps(payload).encode(), method="POST")
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def status_of(path):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post(records[0], url.rsplit("/", 1)[0] + path)
+        return error.value.code
+
+    with open(os.path.join(MODEL_DIR, "broken.pkl"), "wb") as f:
+        f.write(b"not an artifact")
+    try:
+        assert post(records[0])["predictions"] == expected[:1]
+        assert post({"records": records[:5]})["predictions"] == expected[:5]
+        assert status_of("/..") == status_of("/") == 400, "Directories were loaded as models"
+        assert status_of("/broken.pkl") == 500
+        assert status_of("/missing.pkl") == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        os.remove(os.path.join(MODEL_DIR, "broken.pkl"))
@@ -0,0 +1,18 @@
+# test/test_streaming.py
+
+import pandas as pd
+from src import trainer, tester
+
+def test_streaming_matches_in_memory_testing(iris_csv):
+    output = trainer.train_model_from_csv(iris_csv, "target", "Logistic Regression")
+
+    full = tester.test_model_on_csv(iris_csv, output["model_path"])
+    streamed = tester.test_model_on_csv(iris_csv, output["model_path"], chunk_size=7)
+
+    assert streamed["metrics"] == full["metrics"], "Chunked metrics differ from full-file metrics"
+
+    full_preds = pd.read_csv(full["predictions_path"])
+    streamed_preds = pd.read_csv(streamed["predictions_path"])
+    assert len(streamed_preds) == len(full_preds), "Chunked output lost rows"
+    assert (streamed_preds["Prediction"] == full_preds["Prediction"]).all(), \
+        "Chunked predictions differ from full-file predictions"
@@ -1,41 +1,39 @@
 # test/test_tester.py
 
 import os
-import pandas as pd
-import joblib
+import shutil
+import tempfile
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
 from src import trainer, tester
 
+temp_dir = tempfile.mkdtemp()
+train_csv = os.path.join(temp_dir, "train_data.csv")
+test_csv = os.path.join(temp_dir, "test_data.csv")
+model_path = None
+
 def setup_module(module):
     """Train and save a model for testing."""
+    global model_path
     iris = load_iris(as_frame=True)
     df = iris.frame
     train_df, test_df = train_test_split(df, test_size=0.2, random_state=42)
+    train_df.to_csv(train_csv, index=False)
 
     # Train and save model
-    model, _ = trainer.train_model(train_df, "target")
-    joblib.dump(model, "outputs/test_model.joblib")
+    model_path = trainer.train_model_from_csv(train_csv, "target", model_name="Logistic Regression")["model_path"]
 
     # Save test file
-    test_df.to_csv("outputs/test_data.csv", index=False)
+    test_df.to_csv(test_csv, index=False)
 
 def teardown_module(module):
     """Clean up after tests"""
-    if os.path.exists("outputs/test_model.joblib"):
-        os.remove("outputs/test_model.joblib")
-    if os.path.exists("outputs/test_data.csv"):
-        os.remove("outputs/test_data.csv")
+    shutil.rmtree(temp_dir, ignore_errors=True)
 
 def test_test_model_returns_expected_metrics():
-    model_path = "outputs/test_model.joblib"
-    test_csv = "outputs/test_data.csv"
-
-    # Load test data
-    df = pd.read_csv(test_csv)
-
     # Run test_model function
-    metrics = tester.test_model(model_path, df, "target")
+    result = tester.test_model_on_csv(test_csv, model_path, "target")
+    metrics = result["metrics"]
 
     # Check that metrics are returned and valid
     expected_keys = {"accuracy", "precision", "recall", "f1_score"}
@@ -47,6 +45,7 @@ def test_test_model_returns_expected_metrics():
         assert isinstance(metrics[key], float), f"{key} should be a float"
 
     # Check all values are between 0 and 1
-    for value in metrics.values():
-        assert 0.0 <= value <= 1.0, f"Metric {value} out of range [0,1]"
+    for key in expected_keys:
+        assert 0.0 <= metrics[key] <= 1.0, f"Metric {metrics[key]} out of range [0,1]"
 
+    assert os.path.exists(result["predictions_path"]), "Predictions were not saved"
@@ -1,32 +1,29 @@
 # test/test_trainer.py
 
 import os
-import shutil
+import subprocess
+import sys
+import numpy as np
 import pandas as pd
+from benchmarks import import_time
 from src import trainer
-from sklearn.datasets import load_iris
+from src.constants import CLASSIFICATION_MODELS
+from sklearn.datasets import load_iris, make_classification
 
-def setup_module(module):
-    """Create test_outputs directory before tests run"""
-    if not os.path.exists("outputs"):
-        os.mkdir("outputs")
-
-def teardown_module(module):
-    """Clean up after tests"""
-    if os.path.exists("outputs"):
-        shutil.rmtree("outputs")
-
-def test_train_model_returns_expected_outputs():
+def test_train_model_returns_expected_outputs(tmp_path):
     # Load a sample dataset
     iris = load_iris(as_frame=True)
     df = iris.frame
     target_col = 'target'
+    csv_path = str(tmp_path / "iris_train.csv")
+    df.to_csv(csv_path, index=False)
 
     # Run training
-    model, metrics = trainer.train_model(df, target_col)
+    output = trainer.train_model_from_csv(csv_path, target_col)
+    metrics = output["metrics"]
 
     # Assert model and metrics exist
-    assert model is not None, "Model is None"
+    assert output["pipeline"] is not None, "Pipeline is None"
     assert isinstance(metrics, dict), "Metrics should be a dictionary"
     
     # Check keys in metrics
@@ -34,10 +31,87 @@ def test_train_model_returns_expected_outputs():
     assert expected_keys.issubset(metrics.keys()), f"Missing keys in metrics: {metrics.keys()}"
 
     # Check if model was saved
-    saved_model_path = os.path.join("outputs", "trained_model.joblib")
+    saved_model_path = output["model_path"]
     assert os.path.exists(saved_model_path), "Trained model file not saved"
 
     # Check metrics values are floats
     for key in expected_keys:
         assert isinstance(metrics[key], float), f"{key} should be a float"
 
+
+def test_train_all_models_returns_leaderboard(tmp_path):
+    csv_path = str(tmp_path / "iris_leaderboard.csv")
+    load_iris(as_frame=True).frame.to_csv(csv_path, index=False)
+
+    output = trainer.train_all_models(csv_path, "target", n_workers=2)
+    leaderboard = output["leaderboard"]
+
+    # Every supported model is ranked
+    assert set(leaderboard["model"]) == set(trainer.SUPPORTED_MODELS), "Not every model was trained"
+    expected_columns = {"accuracy", "f1_score", "fit_time_s", "predict_time_s"}
+    assert expected_columns.issubset(leaderboard.columns), "Missing leaderboard columns"
+    assert leaderboard["f1_score"].is_monotonic_decreasing, "Leaderboard is not ranked"
+
+    # Every model artifact was saved
+    for path in output["model_paths"].values():
+        assert os.path.exists(path), "Model artifact not saved"
+
+
+def test_train_model_with_tuning_uses_best_params(tmp_path):
+    csv_path = str(tmp_path / "iris_tuning.csv")
+    load_iris(as_frame=True).frame.to_csv(csv_path, index=False)
+
+    output = trainer.train_model_from_csv(
+        csv_path, "target", model_name="Decision Tree", tune=True, time_budget=3
+    )
+
+    assert output["tuning"]["best_score"] is not None, "No configuration was evaluated"
+    assert "history" not in output["tuning"], "Search history should not be returned"
+    assert os.path.exists(output["model_path"]), "Model artifact not saved"
+
+
+def test_train_incremental_streams_chunks(tmp_path):
+    csv_path = str(tmp_path / "iris_incremental.csv")
+    load_iris(as_frame=True).frame.to_csv(csv_path, index=False)
+
+    output = trainer.train_incremental_from_csv(
+        csv_path, "target", model_name="SGD Classifier", chunk_size=40, n_epochs=3
+    )
+
+    assert output["metrics"]["accuracy"] > 0.5, "Incremental model did not learn"
+    assert os.path.exists(output["model_path"]), "Model artifact not saved"
+    assert output["pipeline"].encoder.n_rows < 150, "Holdout rows leaked into the pipeline statistics"
+
+
+def test_progressive_training_grows_nested_stratified_samples(tmp_path):
+    X, y = make_classification(n_samples=5000, n_features=8, n_informative=4, n_classes=3, random_state=0)
+    csv_path = str(tmp_path / "progressive.csv")
+    pd.DataFrame(X).add_prefix("f").assign(target=y).to_csv(csv_path, index=False)
+
+    samples = trainer.progressive_sample_rows(y, [0.01, 0.1, 1.0])
+    assert [len(rows) for _, rows in samples] == [200, 500, 5000], "Unexpected sample sizes"
+    assert set(samples[0][1]) <= set(samples[1][1]), "Samples are not nested"
+    assert np.allclose(np.bincount(y[samples[1][1]]) / 500, np.bincount(y) / 5000, atol=0.01), "Not stratified"
+
+    steps = list(trainer.iter_progressive_training(csv_path, "target", "Decision Tree"))
+    assert [step["n_rows"] for step in steps] == [200, 400, 4000], "Steps should cover 1%, 10% and all rows"
+    assert steps[0]["gain"] is None and steps[1]["gain"] is not None, "Gain not tracked"
+    assert "output" in steps[-1] and "output" not in steps[0], "Only the full step should be saved"
+    assert os.path.exists(steps[-1]["output"]["model_path"]), "Model artifact not saved"
+    assert trainer.curve_flattened([{"gain": 0.001}]) and not trainer.curve_flattened([{"gain": None}])
+
+
+def test_supported_models_resolve_lazily():
+    from sklearn.svm import SVC
+
+    assert list(trainer.SUPPORTED_MODELS) == list(CLASSIFICATION_MODELS), "Model names out of sync"
+    assert trainer.SUPPORTED_MODELS["Support Vector Machine"] is SVC
+    assert trainer.INCREMENTAL_MODELS["SGD Classifier"](**trainer.INCREMENTAL_MODEL_PARAMS["SGD Classifier"]).loss == "log_loss"
+
+
+def test_app_modules_do_not_import_heavy_libraries():
+    # A fresh interpreter, since this test process has already imported sklearn
+    modules = ", ".join(import_time.APP_MODULES)
+    check = f"import sys, {modules}; print(','.join(m for m in {import_time.DEFERRED_LIBRARIES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "", f"Imported at startup: {result.stdout.strip()}"
@@ -0,0 +1,80 @@
+# test/test_tuning.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from src import tuning
+
+def make_data(n_rows=600):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'a': rng.normal(size=n_rows), 'b': rng.normal(size=n_rows)})
+    y = pd.Series((X['a'] + X['b'] > 0).astype(int))
+    return X, y
+
+def test_tune_model_returns_best_params_within_budget():
+    X, y = make_data()
+    result = tuning.tune_model("Decision Tree", DecisionTreeClassifier, X, y, time_budget=5, n_jobs=1)
+
+    assert result["best_score"] > 0.7, "Tuned model should learn the signal"
+    assert set(result["best_params"]) <= set(DecisionTreeClassifier().get_params())
+    assert result["elapsed_s"] < 30, "Search ignored its time budget"
+    DecisionTreeClassifier(**result["best_params"]).fit(X, y)
+
+def test_successive_halving_shrinks_candidates_per_rung():
+    X, y = make_data(2000)
+    folds = tuning.make_folds(y.to_numpy(), 3)
+    history = tuning.successive_halving(
+        "Decision Tree", DecisionTreeClassifier, X.to_numpy(), y.to_numpy(), folds,
+        deadline=float("inf"), n_jobs=1
+    )
+
+    rungs = pd.DataFrame(history).groupby("rung")
+    counts = rungs.size().tolist()
+    resources = rungs["resource"].first().tolist()
+    assert counts == sorted(counts, reverse=True) and counts[-1] < counts[0], "Candidates were not eliminated"
+    assert resources == sorted(resources) and resources[-1] == len(folds[0][0]), "Last rung must use all rows"
+
+def test_forest_is_refit_with_full_estimator_budget():
+    X, y = make_data()
+    result = tuning.tune_model("Random Forest", RandomForestClassifier, X, y, time_budget=0.01, n_jobs=1)
+
+    assert result["best_params"]["n_estimators"] == tuning.RESOURCE_PARAMS["Random Forest"][2]
+
+def test_knn_tuning_on_small_data_bounds_neighbors_to_the_rows():
+    X, y = make_data(60)
+    result = tuning.tune_model("K-Nearest Neighbors", KNeighborsClassifier, X, y, time_budget=5, n_jobs=1)
+
+    assert result["best_score"] is not None, "Every configuration failed"
+    assert all(row["params"]["n_neighbors"] <= row["resource"] for row in result["history"])
+    KNeighborsClassifier(**result["best_params"]).fit(X, y)
+
+def test_failing_configurations_are_dropped_from_the_search():
+    class FragileTree(DecisionTreeClassifier):
+        def fit(self, X, y, **kwargs):
+            if self.criterion == "entropy":
+                raise ValueError("unsupported")
+            return super().fit(X, y, **kwargs)
+
+    X, y = make_data()
+    result = tuning.tune_model("Decision Tree", FragileTree, X, y, time_budget=2, n_jobs=1)
+    assert result["best_params"].get("criterion") == "gini"
+    assert all(row["params"]["criterion"] == "gini" for row in result["history"])
+
+def test_search_fails_loudly_when_no_configuration_fits():
+    class BrokenTree(DecisionTreeClassifier):
+        def fit(self, X, y, **kwargs):
+            raise ValueError("cannot fit")
+
+    X, y = make_data()
+    with pytest.raises(ValueError, match="no configuration could be fitted.*cannot fit"):
+        tuning.tune_model("Decision Tree", BrokenTree, X, y, time_budget=2, n_jobs=1)
+
+    class MisspelledTree(DecisionTreeClassifier):
+        def fit(self, X, y, **kwargs):
+            raise AttributeError("max_dpeth")
+
+    with pytest.raises(AttributeError):
+        tuning.tune_model("Decision Tree", MisspelledTree, X, y, time_budget=2, n_jobs=1)
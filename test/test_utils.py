@@ -2,19 +2,29 @@
 
 import pandas as pd
 import numpy as np
-from src.utils import preprocess_data
+from src.utils import (
+    handle_missing_values, encode_categorical_columns, scale_numeric_columns, split_features_target
+)
 from sklearn.datasets import load_iris
 
+def preprocess(df, target_col):
+    """Clean, encode and scale a DataFrame the way the helpers are chained in practice."""
+    df = handle_missing_values(df)
+    X, y = split_features_target(df, target_col)
+    X, _ = encode_categorical_columns(X)
+    X, _ = scale_numeric_columns(X)
+    return X, y
+
 def test_preprocess_data_output_format():
     # Load sample iris dataset
     iris = load_iris(as_frame=True)
     df = iris.frame.copy()
     target_col = 'target'
 
-    X_scaled, y = preprocess_data(df, target_col)
+    X_scaled, y = preprocess(df, target_col)
 
     # Check outputs are correct type
-    assert isinstance(X_scaled, np.ndarray), "X should be a NumPy array"
+    assert isinstance(X_scaled, pd.DataFrame), "X should be a DataFrame"
     assert isinstance(y, pd.Series), "y should be a pandas Series"
 
     # Shapes match
@@ -31,10 +41,10 @@ def test_preprocess_data_handles_missing_values():
     df = pd.DataFrame(data)
 
     # Preprocess
-    X_scaled, y = preprocess_data(df, 'target')
+    X_scaled, y = preprocess(df, 'target')
 
     # Assert missing values handled (no NaNs)
-    assert not np.isnan(X_scaled).any(), "Preprocessed features contain NaNs"
+    assert not np.isnan(X_scaled.to_numpy()).any(), "Preprocessed features contain NaNs"
     assert not y.isnull().any(), "Target values contain NaNs"
 
 def test_preprocess_data_encodes_categorical_features():
@@ -45,10 +55,12 @@ def test_preprocess_data_encodes_categorical_features():
         'target': [0, 1, 1]
     })
 
-    X_scaled, y = preprocess_data(df, 'target')
+    X_ordinal, _ = preprocess(df, 'target')
+    assert X_ordinal.dtypes.map(pd.api.types.is_numeric_dtype).all(), "Categorical feature not encoded"
 
-    # After one-hot encoding, feature count should be > original 1 numeric + 1 categorical
-    assert X_scaled.shape[1] > 2, "Categorical feature not encoded properly"
+    # One-hot encoding adds one column per category plus one for unseen values
+    X_onehot, _ = encode_categorical_columns(df.drop(columns=['target']), strategy="onehot")
+    assert X_onehot.shape[1] > 2, "Categorical feature not encoded properly"
 
 def test_preprocess_data_invalid_target_column():
     df = pd.DataFrame({
@@ -57,7 +69,7 @@ def test_preprocess_data_invalid_target_column():
     })
 
     try:
-        preprocess_data(df, 'nonexistent')
-        assert False, "Expected KeyError for invalid target column"
-    except KeyError:
+        split_features_target(df, 'nonexistent')
+        assert False, "Expected ValueError for invalid target column"
+    except ValueError:
         pass
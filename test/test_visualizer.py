@@ -0,0 +1,26 @@
+# test/test_visualizer.py
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.visualizer import OTHER_LABEL, plot_confusion_matrix, top_k_confusion_matrix
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def test_top_k_confusion_matrix_aggregates_rare_classes():
+    rng = np.random.default_rng(0)
+    cm = rng.integers(0, 10, size=(50, 50))
+    cm[3, 3] = cm[7, 7] = 1_000
+
+    reduced, labels = top_k_confusion_matrix(cm, list(range(50)), max_classes=5)
+
+    assert reduced.shape == (6, 6) and labels[-1] == OTHER_LABEL
+    assert reduced.sum() == cm.sum(), "Counts were lost in the aggregation"
+    assert 3 in labels and 7 in labels, "The largest classes were not kept"
+    assert labels[:-1] == sorted(labels[:-1]), "Kept classes are out of order"
+
+def test_plot_confusion_matrix_renders_png_concurrently():
+    cm = [[5, 1], [2, 7]]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        images = list(pool.map(lambda _: plot_confusion_matrix(cm, ["a", "b"]), range(8)))
+
+    assert all(image.startswith(PNG_SIGNATURE) for image in images), "Plot is not a PNG"
@@ -0,0 +1,92 @@
+# test/test_writer.py
+
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from src import tester, trainer, writer
+from src.writer import PredictionWriter
+
+@pytest.fixture
+def keyed_csv(tmp_path, iris_df):
+    """Iris with an ID column and two rows that are dropped at test time"""
+    df = iris_df.copy()
+    df.insert(0, "id", np.arange(1000, 1000 + len(df)))
+    df.loc[[3, 60], "sepal length (cm)"] = np.nan
+    path = str(tmp_path / "keyed.csv")
+    df.to_csv(path, index=False)
+    return path
+
+def _read(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".arrow"):
+        return pa.ipc.open_file(path).read_pandas()
+    return pd.read_csv(path)
+
+def test_writer_leaves_input_unchanged_in_every_format(tmp_path):
+    df = pd.DataFrame({"id": [7, 8, 9], "color": pd.Categorical(["red", "blue", "red"]), "x": [0.5, 1.5, 2.5]})
+    before = df.copy()
+    proba = np.array([[0.9, 0.1], [0.2, 0.8], [0.6, 0.4]])
+
+    for output_format in ("csv", "parquet", "arrow"):
+        path = str(tmp_path / writer.prediction_filename(output_format))
+        with PredictionWriter(path, output_format) as w:
+            w.write(df.iloc[:2], np.array(["a", "b"]), proba[:2], classes=np.array(["a", "b"]))
+            w.write(df.iloc[2:], np.array(["a"]), proba[2:], classes=np.array(["a", "b"]))
+
+        out = _read(path)
+        assert list(out.columns) == ["id", "color", "x", "Prediction", "proba_a", "proba_b"], output_format
+        assert list(out["Prediction"]) == ["a", "b", "a"], f"Predictions lost in {output_format}"
+        assert np.allclose(out[["proba_a", "proba_b"]].to_numpy(), proba), f"Probabilities lost in {output_format}"
+        assert list(out["color"].astype(str)) == ["red", "blue", "red"], f"Categories lost in {output_format}"
+
+    pd.testing.assert_frame_equal(df, before)
+    assert "Prediction" not in df.columns, "Input frame was modified"
+    assert writer.mime_type("p.parquet") == "application/vnd.apache.parquet"
+
+def test_key_only_output_keeps_input_row_numbers(keyed_csv):
+    output = trainer.train_model_from_csv(keyed_csv, "target", "Logistic Regression")
+
+    full = tester.test_model_on_csv(keyed_csv, output["model_path"])
+    keyed = tester.test_model_on_csv(keyed_csv, output["model_path"], output_format="parquet",
+                                     output_columns="key", probabilities=True)
+    streamed = tester.test_model_on_csv(keyed_csv, output["model_path"], chunk_size=40, output_format="arrow",
+                                        output_columns="key", key_column="id", probabilities=True)
+
+    full_preds = _read(full["predictions_path"])
+    keyed_preds = _read(keyed["predictions_path"])
+    streamed_preds = _read(streamed["predictions_path"])
+
+    assert keyed["predictions_path"].endswith(".parquet") and streamed["predictions_path"].endswith(".arrow")
+    assert list(keyed_preds.columns) == ["row", "Prediction", "proba_0", "proba_1", "proba_2"]
+    assert 3 not in set(keyed_preds["row"]) and 60 not in set(keyed_preds["row"]), "Dropped rows kept a key"
+    assert list(keyed_preds["row"]) == [i for i in range(150) if i not in (3, 60)], "Row numbers are off"
+    assert list(streamed_preds.columns)[:2] == ["id", "Prediction"]
+    assert list(streamed_preds["id"]) == list(full_preds["id"]), "Chunked keys differ from full-file keys"
+    assert (streamed_preds["Prediction"] == full_preds["Prediction"]).all()
+    assert np.allclose(keyed_preds.filter(like="proba_").sum(axis=1), 1.0)
+    assert "roc_auc" in keyed["metrics"] and "roc_auc" not in full["metrics"], "Probabilities were not scored"
+
+def test_later_chunks_widen_the_schema_and_failures_leave_no_file(tmp_path):
+    chunks = [
+        pd.DataFrame({"a": [1, 2], "b": [None, None]}),
+        pd.DataFrame({"a": [1.5, np.nan], "b": ["x", "y"]}),
+    ]
+    for output_format in ("parquet", "arrow"):
+        path = str(tmp_path / writer.prediction_filename(output_format))
+        with PredictionWriter(path, output_format) as w:
+            for chunk in chunks:
+                w.write(chunk, np.array([0, 1]))
+
+        out = _read(path)
+        assert out["a"].tolist()[:3] == [1.0, 2.0, 1.5] and np.isnan(out["a"].iloc[3]), output_format
+        assert out["b"].tolist() == [None, None, "x", "y"], f"Strings after nulls lost in {output_format}"
+
+        path = str(tmp_path / writer.prediction_filename(output_format))
+        with pytest.raises(ValueError, match="Column types changed"):
+            with PredictionWriter(path, output_format) as w:
+                w.write(pd.DataFrame({"a": [1, 2]}), np.array([0, 1]))
+                w.write(pd.DataFrame({"a": ["x", "y"]}), np.array([0, 1]))
+        assert not os.path.exists(path) and not os.path.exists(path + ".partial"), "Partial file left behind"